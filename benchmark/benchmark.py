@@ -1,75 +1,170 @@
-"""
-Benchmarking script for the Sudoku solver.
-
-Measures average, minimum, and maximum solve times for puzzles
-stored in a JSON file. Supports limiting the number of puzzles
-processed for quick testing.
-
-JSON format expected:
-{
-    "puzzles": ["003020600...", "060500400...", ...]
-}
-"""
-import json
-from typing import Any, Generator
-import pathlib
-
-from src import sudoku_solver
-from time import perf_counter
-
-def get_puzzle(filename: str) -> Generator[list[int], None, None]:
-    """Yields Sudoku puzzles from a JSON file as lists of integers."""
-    with open(filename, "r") as f:
-        json_data = json.load(f)
-        for puzzle_string in json_data["puzzles"]:
-            yield [int(cell) for cell in puzzle_string]
-
-def benchmark(filename: str,*, limit: int = float("inf")) -> None:
-    """
-    Benchmarks the backtrack_iterative_solver on a set of puzzles.
-
-    Args:
-        filename (str): Path to the JSON file containing puzzles.
-        limit (int, optional): Maximum number of puzzles to solve. Defaults to infinity.
-
-    Prints:
-        - Number of puzzles solved
-        - Average solve time
-        - Minimum solve time
-        - Maximum solve time
-    """
-    total_time = 0
-    min_solve = float("inf")
-    min_index = -1
-    max_solve = 0
-    max_index = -1
-    count = 0
-    for puzzle in get_puzzle(filename):
-        count += 1
-        start_solve = perf_counter()
-        sol =  sudoku_solver.backtrack_iterative_solver(puzzle)
-        solve_time = perf_counter() - start_solve
-        total_time += solve_time
-        if len(sol) > 1:
-            print(f"Puzzle {count-1} is not unique.")
-        # print(f"Solving puzzle #{count}")
-        # print(f"there is {len(sol)} solutions")
-        # print()
-        if solve_time < min_solve:
-            min_solve = solve_time
-            min_index = count-1
-        if max_solve < solve_time:
-            max_solve = solve_time
-            max_index = count-1
-        if count >= limit:
-            break
-    print(f"{count} puzzles were solved.")
-    print(f"The average solve time is: {total_time/count:.3f} seconds.")
-    print(f'The maximum solve time is: {max_solve: 0.3f} seconds for puzzle #{max_index}')
-    print(f'The minimum solve time is: {min_solve: 0.3f} seconds for puzzle #{min_index}')
-
-PUZZLE_FILE_17= pathlib.Path(__file__).parent.parent/"data"/ "17_clue_puzzles.json"
-if __name__ == '__main__':
-    # 500 puzzle benchmark from the Gordon Royle 17-clue puzzle list
-    benchmark(PUZZLE_FILE_17, limit=500)
-
+"""
+Benchmarking script for the Sudoku solver.
+
+Measures average, minimum, and maximum solve times for puzzles
+stored in a JSON file (or any format read by src.puzzle_io).
+Supports limiting the number of puzzles processed for quick testing.
+
+JSON format expected:
+{
+    "puzzles": ["003020600...", "060500400...", ...]
+}
+"""
+import multiprocessing
+from typing import Any, Callable, Generator
+import pathlib
+
+from src import sudoku_solver
+from src.stats import SearchStats
+from src.bitboardMap import BitboardMap
+from src import batch
+from src import puzzle_io
+from time import perf_counter
+
+def get_puzzle(filename: str) -> Generator[list[int], None, None]:
+    """Yields Sudoku puzzles from a JSON or line-per-puzzle file as lists of integers."""
+    yield from puzzle_io.read_puzzles(filename)
+
+def benchmark(filename: str,*, limit: int = float("inf"),
+              solver: Callable[[list], list[list]] = sudoku_solver.backtrack_iterative_solver,
+              collect_stats: bool = False, **options) -> None:
+    """
+    Benchmarks a solver on a set of puzzles.
+
+    Args:
+        filename (str): Path to the JSON file containing puzzles.
+        limit (int, optional): Maximum number of puzzles to solve. Defaults to infinity.
+        solver (Callable, optional): Solver taking a puzzle and returning its solutions.
+            Defaults to backtrack_iterative_solver.
+        collect_stats (bool, optional): Pass a SearchStats to the solver and report
+            the search counters. The solver must accept `stats`. Defaults to False.
+        **options: Keyword arguments passed on to the solver.
+
+    Prints:
+        - Number of puzzles solved
+        - Average solve time
+        - Minimum solve time
+        - Maximum solve time
+        - With collect_stats, the total search counters and those of the slowest puzzle
+    """
+    total_time = 0
+    min_solve = float("inf")
+    min_index = -1
+    max_solve = 0
+    max_index = -1
+    count = 0
+    total_stats = SearchStats()
+    slowest_stats = None
+    for puzzle in get_puzzle(filename):
+        count += 1
+        if collect_stats:
+            options["stats"] = SearchStats()
+        start_solve = perf_counter()
+        sol =  solver(puzzle, **options)
+        solve_time = perf_counter() - start_solve
+        total_time += solve_time
+        if len(sol) > 1:
+            print(f"Puzzle {count-1} is not unique.")
+        # print(f"Solving puzzle #{count}")
+        # print(f"there is {len(sol)} solutions")
+        # print()
+        if solve_time < min_solve:
+            min_solve = solve_time
+            min_index = count-1
+        if max_solve < solve_time:
+            max_solve = solve_time
+            max_index = count-1
+            slowest_stats = options.get("stats")
+        if collect_stats:
+            total_stats.merge(options["stats"])
+        if count >= limit:
+            break
+    print(f"{count} puzzles were solved by {solver.__name__}.")
+    print(f"The average solve time is: {total_time/count:.3f} seconds.")
+    print(f'The maximum solve time is: {max_solve: 0.3f} seconds for puzzle #{max_index}')
+    print(f'The minimum solve time is: {min_solve: 0.3f} seconds for puzzle #{min_index}')
+    if collect_stats:
+        print_stats("All puzzles", total_stats, count)
+        print_stats(f"Puzzle #{max_index}", slowest_stats)
+
+def print_stats(title: str, stats: SearchStats, count: int = 1) -> None:
+    """Prints search counters, averaged over 'count' puzzles."""
+    print(f"{title}: {stats.nodes/count:.1f} nodes, {stats.backtracks/count:.1f} backtracks, "
+          f"{stats.neighbor_updates/count:.1f} neighbor updates, {stats.mrv_scans/count:.1f} MRV scans "
+          f"per puzzle; max depth {stats.max_depth}, branching factor {stats.branching_factor:.2f}.")
+    if stats.nogood_probes:
+        print(f"{title}: nogood memo hit rate {stats.nogood_hit_rate:.1%} ({stats.nogood_hits} of "
+              f"{stats.nogood_probes} lookups), {stats.nogood_stores} dead ends stored.")
+
+def benchmark_batch(filename: str, *, limit: int = float("inf"), workers: int = None,
+                    chunksize: int = 16, **options) -> None:
+    """
+    Benchmarks batch solving with solve_many on a set of puzzles.
+
+    Args:
+        filename (str): Path to the JSON file containing puzzles.
+        limit (int, optional): Maximum number of puzzles to solve. Defaults to infinity.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        chunksize (int, optional): Number of puzzles sent to a worker at once. Defaults to 16.
+        **options: Keyword arguments passed on to solve_many, which solves each puzzle with
+                   sudoku_solver.bounded_solver: engine (SolverCore included), propagate, strong,
+                   timeout, max_nodes and count_only.
+
+    Prints:
+        - Number of puzzles solved and failed
+        - Total time and throughput in puzzles per second
+    """
+    workers = workers or multiprocessing.cpu_count()
+    puzzles = (puzzle for count, puzzle in enumerate(get_puzzle(filename)) if count < limit)
+    start = perf_counter()
+    count = 0
+    failed = 0
+    for result in batch.solve_many(puzzles, workers=workers, chunksize=chunksize, ordered=False, **options):
+        count += 1
+        if result.error is not None:
+            failed += 1
+    total_time = perf_counter() - start
+    print(f"{count} puzzles were solved by {workers} workers ({failed} failed).")
+    print(f"The total time is: {total_time:.3f} seconds ({count/total_time:.1f} puzzles per second).")
+
+def benchmark_vectorized(filename: str, *, limit: int = float("inf"), **options) -> None:
+    """
+    Compares the vectorized batch solver with solving the same puzzles one at a time.
+
+    Args:
+        filename (str): Path to the JSON file containing puzzles.
+        limit (int, optional): Maximum number of puzzles to solve. Defaults to infinity.
+        **options: Keyword arguments passed on to backtrack_iterative_solver.
+
+    Prints:
+        - Number of puzzles finished by propagation alone
+        - Throughput of both approaches in puzzles per second
+    """
+    from src import vectorized
+
+    puzzles = [puzzle for count, puzzle in enumerate(get_puzzle(filename)) if count < limit]
+    start = perf_counter()
+    for puzzle in puzzles:
+        sudoku_solver.backtrack_iterative_solver(list(puzzle), **options)
+    loop_time = perf_counter() - start
+    start = perf_counter()
+    propagated = vectorized.VectorizedBatch(puzzles).propagate()
+    propagate_time = perf_counter() - start
+    start = perf_counter()
+    for _ in vectorized.solve_batch(puzzles, **options):
+        pass
+    batch_time = perf_counter() - start
+    count = len(puzzles)
+    solved = int((propagated == vectorized.SOLVED).sum())
+    print(f"{solved} of {count} puzzles were solved by vectorized propagation alone "
+          f"({count/propagate_time:.1f} puzzles per second).")
+    print(f"Per-puzzle loop: {loop_time:.3f} seconds ({count/loop_time:.1f} puzzles per second).")
+    print(f"Vectorized batch: {batch_time:.3f} seconds ({count/batch_time:.1f} puzzles per second).")
+
+PUZZLE_FILE_17= pathlib.Path(__file__).parent.parent/"data"/ "17_clue_puzzles.json"
+if __name__ == '__main__':
+    # 500 puzzle benchmark from the Gordon Royle 17-clue puzzle list
+    benchmark(PUZZLE_FILE_17, limit=500, collect_stats=True)
+    benchmark(PUZZLE_FILE_17, limit=500, solver=sudoku_solver.dlx_solver)
+    benchmark_vectorized(PUZZLE_FILE_17, engine=BitboardMap, propagate=True)
+
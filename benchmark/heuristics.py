@@ -0,0 +1,141 @@
+"""
+Benchmark of the branching heuristics of src.heuristics.
+
+Every combination of cell rule and value rule (and the restart solver, alone
+and sharing a nogood memo between its restarts) is run
+over the corpora of benchmark.suite. For each one the search nodes and solve
+times per puzzle are reported as mean, p95 and max, so the effect of a
+heuristic on the tail is visible next to its effect on the average. Searches
+are capped at a node budget, shared by all the runs of the restart solver;
+puzzles hitting it are counted as "capped" and rank the heuristic last. The best heuristic of each corpus (fewest capped
+puzzles, then lowest p95 time) is printed at the end.
+
+Usage:
+    python -m benchmark.heuristics [--corpus NAME ...] [--heuristic CELL+VALUE ...] [--size N]
+                                   [--limit N] [--max-nodes N] [--no-propagate] [--output results.json]
+"""
+import argparse
+import json
+import sys
+from time import perf_counter
+
+from benchmark.suite import load_corpora, percentile
+from src import sudoku_solver
+from src.bitboardMap import BitboardMap
+from src.budget import Budget, COMPLETE
+from src.heuristics import CELL_RULES, VALUE_RULES, Heuristic
+from src.nogood import NogoodTable
+from src.stats import SearchStats
+
+# Names of the restart solver among the heuristics, without and with a nogood memo.
+RESTART = "restart"
+RESTART_NOGOODS = "restart+nogoods"
+
+HEURISTICS = [f"{cell}+{value}" for cell in CELL_RULES for value in VALUE_RULES] + [RESTART, RESTART_NOGOODS]
+
+
+def run_heuristic(name: str, puzzles: list[list[int]], *, limit: int = 2, max_nodes: int = 200_000,
+                  seed: int = 0, **options) -> dict:
+    """
+    Solve a corpus with one heuristic.
+
+    Args:
+        name (str): "cell+value", RESTART or RESTART_NOGOODS.
+        puzzles (list[list[int]]): The corpus.
+        limit (int, optional): Maximum number of solutions per puzzle. Defaults to 2.
+        max_nodes (int, optional): Node budget of each puzzle, over all its restarts for the
+                       restart solver. Defaults to 200,000.
+        seed (int, optional): Seed of the random rules. Defaults to 0.
+        **options: engine, propagate and strong, passed on to the solvers.
+    Returns:
+        dict: Mean, p95 and max of the nodes and times per puzzle, and the
+        number of puzzles stopped by the node budget.
+    """
+    nodes, times, capped = [], [], 0
+    for puzzle in puzzles:
+        stats = SearchStats()
+        start = perf_counter()
+        if name in (RESTART, RESTART_NOGOODS):
+            nogoods = NogoodTable() if name == RESTART_NOGOODS else None
+            budget = Budget(max_nodes=max_nodes)
+            sudoku_solver.restart_solver(puzzle, limit, seed=seed, budget=budget, stats=stats, nogoods=nogoods,
+                                         **options)
+            complete = budget.status == COMPLETE
+        else:
+            cell, value = name.split("+")
+            result = sudoku_solver.bounded_solver(puzzle, limit, max_nodes=max_nodes, stats=stats,
+                                                  heuristic=Heuristic(cell, value, seed=seed), **options)
+            complete = result.status == COMPLETE
+        times.append(perf_counter() - start)
+        nodes.append(stats.nodes)
+        capped += not complete
+    nodes.sort()
+    times.sort()
+    return {
+        "count": len(puzzles),
+        "capped": capped,
+        "nodes_mean": sum(nodes) / len(nodes),
+        "nodes_p95": percentile(nodes, 95),
+        "nodes_max": nodes[-1],
+        "mean": sum(times) / len(times),
+        "p95": percentile(times, 95),
+        "max": times[-1],
+    }
+
+
+def best_heuristics(results: dict) -> dict[str, str]:
+    """Return the best heuristic of each corpus: fewest capped puzzles, then lowest p95 time."""
+    return {corpus: min(by_name, key=lambda name: (by_name[name]["capped"], by_name[name]["p95"]))
+            for corpus, by_name in results.items()}
+
+
+def format_result(corpus: str, name: str, result: dict) -> str:
+    """Return a one-line summary of a result, times in milliseconds."""
+    line = (f"{corpus:>8} {name:>17}: nodes mean {result['nodes_mean']:9.1f}  p95 {result['nodes_p95']:9.1f}"
+            f"  max {result['nodes_max']:8d} | time mean {1000*result['mean']:8.2f}  p95 {1000*result['p95']:8.2f}"
+            f"  max {1000*result['max']:8.2f} ms")
+    if result["capped"]:
+        line += f"  ({result['capped']} capped)"
+    return line
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", action="append", help="Corpus to run (repeatable). Defaults to all valid ones.")
+    parser.add_argument("--heuristic", action="append", choices=HEURISTICS, metavar="CELL+VALUE",
+                        help=f"Heuristic to run (repeatable): {', '.join(HEURISTICS)}. Defaults to all.")
+    parser.add_argument("--size", type=int, default=20, help="Puzzles per corpus (default 20).")
+    parser.add_argument("--limit", type=int, default=2, help="Solutions searched per puzzle (default 2).")
+    parser.add_argument("--max-nodes", type=int, default=200_000, help="Node budget per puzzle (default 200000).")
+    parser.add_argument("--no-propagate", dest="propagate", action="store_false",
+                        help="Search without naked and hidden singles.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpora and the random rules.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    corpora = load_corpora(args.size, args.seed)
+    del corpora["invalid"]
+    if args.corpus:
+        unknown = set(args.corpus) - set(corpora)
+        if unknown:
+            parser.error(f"unknown corpus {', '.join(sorted(unknown))}")
+        corpora = {name: corpora[name] for name in args.corpus}
+    results = {}
+    for corpus, puzzles in corpora.items():
+        results[corpus] = {}
+        for name in args.heuristic or HEURISTICS:
+            result = run_heuristic(name, puzzles, limit=args.limit, max_nodes=args.max_nodes, seed=args.seed,
+                                   engine=BitboardMap, propagate=args.propagate)
+            results[corpus][name] = result
+            print(format_result(corpus, name, result), flush=True)
+    best = best_heuristics(results)
+    for corpus, name in best.items():
+        print(f"best for {corpus}: {name}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "best": best}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Benchmark suite running every solver backend over several puzzle corpora.
+
+Corpora (built deterministically from the files in data/):
+    easy     solved grids of 17-clue puzzles with 36 givens kept
+    hard     well-known hard puzzles plus the 17-clue puzzles needing the most search nodes
+    17-clue  puzzles from the Gordon Royle 17-clue list
+    invalid  17-clue puzzles with a given copied into a peer cell
+    multi    17-clue puzzles with one given removed (several solutions)
+
+Every backend gets warm-up runs, then each corpus is timed 'repeat' times.
+Per-puzzle times are the median over the repeats and are reported as mean,
+p50/p95/p99 and max, together with puzzles per second.
+
+Usage:
+    python -m benchmark.suite [--corpus NAME ...] [--backend NAME ...] [--size N]
+                              [--repeat N] [--warmup N] [--output results.json]
+    python -m benchmark.suite --compare baseline.json [--current results.json] [--threshold 0.1]
+
+In compare mode the exit status is 1 when a shared result is slower than the
+baseline by more than the threshold.
+"""
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import random
+import statistics
+import sys
+from time import perf_counter
+from typing import Callable
+
+from src import sudoku_solver
+from src import parallel
+from src import puzzle_io
+from src.bitboardMap import BitboardMap
+from src.constants import *
+from src.errors import *
+from src.solverCore import SolverCore
+from src.stats import SearchStats
+
+DATA_DIR = pathlib.Path(__file__).parent.parent / "data"
+PUZZLE_FILE_17 = DATA_DIR / "17_clue_puzzles.json"
+HARD_PUZZLE_FILE = DATA_DIR / "hard_puzzles.txt"
+
+# Solvers timed one puzzle at a time, called as solver(puzzle, limit).
+BACKENDS: dict[str, Callable[[list, int], list]] = {
+    "recursive": sudoku_solver.backtrack_recursive_solver,
+    "iterative": sudoku_solver.backtrack_iterative_solver,
+    "bitboard": lambda puzzle, limit: sudoku_solver.backtrack_iterative_solver(puzzle, limit, engine=BitboardMap),
+    "propagate": lambda puzzle, limit: sudoku_solver.backtrack_iterative_solver(
+        puzzle, limit, engine=BitboardMap, propagate=True),
+    "strong": lambda puzzle, limit: sudoku_solver.backtrack_iterative_solver(
+        puzzle, limit, engine=BitboardMap, strong=True),
+    "core": lambda puzzle, limit: sudoku_solver.bounded_solver(puzzle, limit, engine=SolverCore).solutions,
+    "parallel": lambda puzzle, limit: parallel.parallel_solver(puzzle, limit, engine=BitboardMap, propagate=True),
+    "dlx": sudoku_solver.dlx_solver,
+    "sat": sudoku_solver.sat_solver,
+}
+
+# Solvers timed over a whole corpus at once, called as solver(puzzles, limit).
+BATCH_BACKENDS: dict[str, Callable[[list, int], None]] = {}
+try:
+    from src import vectorized
+except ImportError:
+    pass
+else:
+    BATCH_BACKENDS["vectorized"] = lambda puzzles, limit: list(vectorized.solve_batch(
+        puzzles, limit, engine=BitboardMap, propagate=True))
+
+METRICS = ("mean", "p50", "p95", "p99")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of sorted values, interpolating linearly."""
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def load_corpora(size: int = 20, seed: int = 0) -> dict[str, list[list[int]]]:
+    """
+    Build the corpora of the suite.
+
+    Args:
+        size (int, optional): Number of puzzles per corpus. Defaults to 20.
+        seed (int, optional): Seed of the random choices. Defaults to 0.
+    Returns:
+        dict[str, list[list[int]]]: Puzzles of each corpus by name.
+    """
+    rng = random.Random(seed)
+    clue17 = list(puzzle_io.read_puzzles(PUZZLE_FILE_17))
+    sample = clue17[:size]
+    easy = []
+    for puzzle in sample:
+        grid = sudoku_solver.dlx_solver(puzzle, 1)[0]
+        for cell in rng.sample(range(SUDOKU_SIZE), SUDOKU_SIZE - 36):
+            grid[cell] = 0
+        easy.append(grid)
+    hard = list(puzzle_io.read_puzzles(HARD_PUZZLE_FILE))[:size]
+    if len(hard) < size:
+        nodes = []
+        for i, puzzle in enumerate(clue17[:15 * size]):
+            stats = SearchStats()
+            sudoku_solver.backtrack_iterative_solver(list(puzzle), engine=BitboardMap, propagate=True, stats=stats)
+            nodes.append((stats.nodes, i))
+        hard += [clue17[i] for _, i in sorted(nodes, reverse=True)[:size - len(hard)]]
+    invalid = []
+    for puzzle in sample:
+        puzzle = list(puzzle)
+        cell = rng.choice([c for c in range(SUDOKU_SIZE) if puzzle[c]])
+        peer = rng.choice([c for c in NEIGHBOR_MAP[cell] if not puzzle[c]])
+        puzzle[peer] = puzzle[cell]
+        invalid.append(puzzle)
+    multi = []
+    for puzzle in sample:
+        puzzle = list(puzzle)
+        puzzle[rng.choice([c for c in range(SUDOKU_SIZE) if puzzle[c]])] = 0
+        multi.append(puzzle)
+    return {"easy": easy, "hard": hard, "17-clue": sample, "invalid": invalid, "multi": multi}
+
+
+def time_backend(solver: Callable, puzzles: list[list[int]], *, limit: int = 2, repeat: int = 3,
+                 warmup: int = 1) -> dict:
+    """
+    Time a per-puzzle solver on a corpus.
+
+    Returns:
+        dict: Mean, p50, p95, p99 and max solve time in seconds, puzzles per
+        second, and the number of puzzles rejected with InvalidSudokuError.
+    """
+    for puzzle in puzzles[:warmup]:
+        _solve(solver, puzzle, limit)
+    runs = [[_solve(solver, puzzle, limit) for puzzle in puzzles] for _ in range(max(1, repeat))]
+    times = sorted(statistics.median(t for t, _ in results) for results in zip(*runs))
+    total = statistics.median(sum(t for t, _ in run) for run in runs)
+    errors = sum(failed for _, failed in runs[0])
+    result = {"count": len(puzzles), "errors": errors, "mean": sum(times) / len(times) if times else 0.0}
+    for q in (50, 95, 99):
+        result[f"p{q}"] = percentile(times, q)
+    result["max"] = times[-1] if times else 0.0
+    result["puzzles_per_second"] = len(puzzles) / total if total else 0.0
+    return result
+
+
+def time_batch_backend(solver: Callable, puzzles: list[list[int]], *, limit: int = 2, repeat: int = 3,
+                       warmup: int = 1) -> dict:
+    """
+    Time a batch solver on a corpus. Only the throughput is measured, as the
+    puzzles are not solved one at a time.
+    """
+    if warmup:
+        solver(puzzles[:warmup], limit)
+    totals = []
+    for _ in range(max(1, repeat)):
+        start = perf_counter()
+        solver(puzzles, limit)
+        totals.append(perf_counter() - start)
+    total = statistics.median(totals)
+    return {"count": len(puzzles), "puzzles_per_second": len(puzzles) / total if total else 0.0}
+
+
+def _solve(solver: Callable, puzzle: list[int], limit: int) -> tuple[float, int]:
+    """Return the time taken by one solve, and 1 if the puzzle was rejected as invalid."""
+    start = perf_counter()
+    try:
+        solver(list(puzzle), limit)
+        failed = 0
+    except InvalidSudokuError:
+        failed = 1
+    return perf_counter() - start, failed
+
+
+def run_suite(corpora: dict[str, list[list[int]]], backends: list[str] = None, *, limit: int = 2,
+              repeat: int = 3, warmup: int = 1, verbose: bool = True) -> dict:
+    """
+    Run the backends over the corpora.
+
+    Args:
+        corpora (dict): Puzzles of each corpus by name, as built by load_corpora.
+        backends (list[str], optional): Names from BACKENDS or BATCH_BACKENDS. Defaults to all.
+        limit (int, optional): Maximum number of solutions per puzzle. Defaults to 2.
+        repeat (int, optional): Number of timed runs of each corpus. Defaults to 3.
+        warmup (int, optional): Number of puzzles solved before timing. Defaults to 1.
+        verbose (bool, optional): Print a line per result. Defaults to True.
+    Returns:
+        dict: {"meta": {...}, "results": {corpus: {backend: {...}}}}, ready to be dumped as JSON.
+    """
+    backends = backends or list(BACKENDS) + list(BATCH_BACKENDS)
+    results = {}
+    for corpus, puzzles in corpora.items():
+        results[corpus] = {}
+        for name in backends:
+            if name in BACKENDS:
+                result = time_backend(BACKENDS[name], puzzles, limit=limit, repeat=repeat, warmup=warmup)
+            elif name in BATCH_BACKENDS:
+                result = time_batch_backend(BATCH_BACKENDS[name], puzzles, limit=limit, repeat=repeat,
+                                            warmup=warmup)
+            else:
+                raise ValueError(f"Unknown backend {name!r}")
+            results[corpus][name] = result
+            if verbose:
+                print(format_result(corpus, name, result), flush=True)
+    meta = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "limit": limit,
+        "repeat": repeat,
+        "warmup": warmup,
+    }
+    return {"meta": meta, "results": results}
+
+
+def format_result(corpus: str, backend: str, result: dict) -> str:
+    """Return a one-line summary of a result, times in milliseconds."""
+    line = f"{corpus:>8} {backend:>10}: {result['puzzles_per_second']:10.1f} puzzles/s"
+    if "p50" in result:
+        line += (f"  mean {1000*result['mean']:8.2f}  p50 {1000*result['p50']:8.2f}"
+                 f"  p95 {1000*result['p95']:8.2f}  p99 {1000*result['p99']:8.2f}  max {1000*result['max']:8.2f} ms")
+    if result.get("errors"):
+        line += f"  ({result['errors']} invalid)"
+    return line
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[str]:
+    """
+    Compare two suite results.
+
+    A result regresses when one of its times (mean, p50, p95, p99) grows, or
+    its throughput drops, by more than 'threshold' (a fraction) relative to the
+    baseline. Only corpora and backends present in both are compared.
+
+    Returns:
+        list[str]: One message per regression, empty if there is none.
+    """
+    regressions = []
+    for corpus, backends in current["results"].items():
+        for backend, result in backends.items():
+            base = baseline["results"].get(corpus, {}).get(backend)
+            if base is None:
+                continue
+            for metric in METRICS:
+                if metric in result and base.get(metric) and result[metric] > base[metric] * (1 + threshold):
+                    regressions.append(f"{corpus}/{backend} {metric}: {1000*base[metric]:.2f} ms -> "
+                                       f"{1000*result[metric]:.2f} ms (+{result[metric]/base[metric] - 1:.0%})")
+            before, after = base.get("puzzles_per_second"), result.get("puzzles_per_second")
+            if before and after is not None and after < before / (1 + threshold):
+                regressions.append(f"{corpus}/{backend} throughput: {before:.1f} -> {after:.1f} puzzles/s "
+                                   f"({after/before - 1:.0%})")
+    return regressions
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", action="append", help="Corpus to run (repeatable). Defaults to all.")
+    parser.add_argument("--backend", action="append",
+                        help=f"Backend to run (repeatable): {', '.join(list(BACKENDS) + list(BATCH_BACKENDS))}.")
+    parser.add_argument("--size", type=int, default=20, help="Puzzles per corpus (default 20).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per corpus (default 3).")
+    parser.add_argument("--warmup", type=int, default=1, help="Warm-up puzzles per backend (default 1).")
+    parser.add_argument("--limit", type=int, default=2, help="Solutions searched per puzzle (default 2).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed used to build the corpora.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a baseline JSON file.")
+    parser.add_argument("--current", help="With --compare, use these results instead of running the suite.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed slowdown as a fraction of the baseline (default 0.1).")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        corpora = load_corpora(args.size, args.seed)
+        if args.corpus:
+            unknown = set(args.corpus) - set(corpora)
+            if unknown:
+                parser.error(f"unknown corpus {', '.join(sorted(unknown))}")
+            corpora = {name: corpora[name] for name in args.corpus}
+        try:
+            report = run_suite(corpora, args.backend, limit=args.limit, repeat=args.repeat, warmup=args.warmup)
+        except ValueError as error:
+            parser.error(str(error))
+        report["meta"].update(size=args.size, seed=args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"No regression beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Command-line batch solver for shell pipelines.
+
+Puzzles are streamed from standard input or files, in the JSON or line
+formats of `src.puzzle_io`, and solved across worker processes by
+`src.batch.solve_many`. Each result is written to standard output as soon as
+it is available: in input order by default, in completion order with
+--unordered. Only a bounded number of puzzles are read ahead of the output,
+so memory stays constant however long the input is.
+
+Output, one line per puzzle:
+    lines  tab-separated index, status, number of solutions found, then the
+           solutions (81-character strings, comma-separated digits on larger
+           boards). The status is "complete", "timeout" or "node_limit", or
+           "invalid" / "error" for puzzles that could not be solved.
+    json   one JSON object per line with "index", "status", "count" and
+           "solutions" (or "error").
+
+With --count-only the workers only count the solutions, which are left out
+of the output. A summary with the throughput is printed to standard error at
+the end. The exit status is 1 if a puzzle could not be solved or the input is
+malformed; it is 0 if the reader of the output goes away early (e.g. `| head`).
+
+Usage:
+    python -m src [FILE ...] [--format {json,lines}] [--output-format {lines,json}] [--workers N]
+                  [--chunksize N] [--max-in-flight N] [--unordered] [--limit N] [--count-only]
+                  [--timeout SECONDS] [--max-nodes N] [--engine {bitboard,constraint,core}]
+                  [--no-propagate] [--strong]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from typing import Iterator
+
+from src import batch
+from src import puzzle_io
+from src.batch import BatchResult
+from src.constants import SUDOKU_SIZE
+from src.errors import *
+from src.server import ENGINES
+
+
+def read_inputs(paths: list[str], fmt: str = None) -> Iterator[list[int]]:
+    """Lazily read the puzzles of every input in turn ("-" for standard input)."""
+    for path in paths:
+        yield from puzzle_io.read_puzzles(path, fmt)
+
+
+def _grid_text(grid: list[int]) -> str:
+    if len(grid) == SUDOKU_SIZE:
+        return puzzle_io.format_puzzle(grid)
+    return ",".join(map(str, grid))
+
+
+def status_of(result: BatchResult) -> str:
+    """Return the status printed for a result: its search status, or "invalid" / "error"."""
+    if result.error is None:
+        return result.status
+    return "invalid" if isinstance(result.error, InvalidSudokuError) else "error"
+
+
+def format_result(result: BatchResult, fmt: str = "lines", *, count_only: bool = False) -> str:
+    """
+    Return the output line of a result, without the newline.
+
+    Args:
+        result (BatchResult): The result of one puzzle.
+        fmt (str, optional): "lines" (tab-separated) or "json". Defaults to "lines".
+        count_only (bool, optional): Leave the solutions out. Defaults to False.
+    """
+    status = status_of(result)
+    solutions = result.solutions or []
+    count = len(solutions) if result.count is None else result.count
+    if fmt == "json":
+        item = {"index": result.index, "status": status, "count": count}
+        if result.error is not None:
+            item["error"] = str(result.error) or type(result.error).__name__
+        elif not count_only:
+            item["solutions"] = [_grid_text(s) if len(s) == SUDOKU_SIZE else s for s in solutions]
+        return json.dumps(item)
+    fields = [str(result.index), status, str(count)]
+    if not count_only:
+        fields += map(_grid_text, solutions)
+    return "\t".join(fields)
+
+
+def format_summary(statuses: Counter, elapsed: float, workers: int) -> str:
+    """Return the final summary: puzzle count, throughput and the count of each status."""
+    total = sum(statuses.values())
+    rate = total / elapsed if elapsed else 0.0
+    counts = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+    return (f"{total} puzzles in {elapsed:.2f} s ({rate:.1f} puzzles/s, {workers} workers)"
+            + (f": {counts}" if counts else ""))
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src", description=__doc__.split("\n\n")[0])
+    parser.add_argument("inputs", nargs="*", default=["-"], metavar="FILE",
+                        help="Puzzle files, .gz and .xz included ('-' or none: standard input).")
+    parser.add_argument("--format", choices=("json", "lines"),
+                        help="Input format (default: detected from the file name or its first character).")
+    parser.add_argument("--output-format", choices=("lines", "json"), default="lines",
+                        help="Output format (default lines).")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument("--chunksize", type=int, default=16, help="Puzzles sent to a worker at once (default 16).")
+    parser.add_argument("--max-in-flight", type=int,
+                        help="Puzzles read but not yet written (default: 4 chunks per worker).")
+    parser.add_argument("--unordered", dest="ordered", action="store_false",
+                        help="Write results as they finish instead of in input order.")
+    parser.add_argument("--limit", type=int, default=2,
+                        help="Solutions searched per puzzle, 0 for all (default 2: proves uniqueness).")
+    parser.add_argument("--count-only", action="store_true", help="Print the number of solutions, not the solutions.")
+    parser.add_argument("--timeout", type=float, help="Time budget per puzzle in seconds (default: none).")
+    parser.add_argument("--max-nodes", type=int, help="Node budget per puzzle (default: none).")
+    parser.add_argument("--engine", choices=ENGINES, default="bitboard", help="Constraint engine (default bitboard).")
+    parser.add_argument("--no-propagate", dest="propagate", action="store_false",
+                        help="Do not apply naked and hidden singles.")
+    parser.add_argument("--strong", action="store_true", help="Also apply locked candidates and naked pairs.")
+    args = parser.parse_args(argv)
+    if args.limit < 0 or args.chunksize < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--limit must be at least 0, --chunksize and --workers at least 1")
+    if args.engine == "core" and (not args.propagate or args.strong):
+        parser.error("--no-propagate and --strong cannot be used with --engine core")
+
+    workers = args.workers or multiprocessing.cpu_count()
+    options = {"engine": ENGINES[args.engine], "propagate": args.propagate, "strong": args.strong,
+               "timeout": args.timeout, "max_nodes": args.max_nodes, "count_only": args.count_only}
+    results = batch.solve_many(read_inputs(args.inputs, args.format), args.limit or None, workers=workers,
+                               chunksize=args.chunksize, ordered=args.ordered, max_in_flight=args.max_in_flight,
+                               **options)
+    statuses = Counter()
+    start = time.perf_counter()
+    out = sys.stdout
+    code = 0
+    try:
+        for result in results:
+            out.write(format_result(result, args.output_format, count_only=args.count_only) + "\n")
+            status = status_of(result)
+            statuses[status] += 1
+            if result.error is not None:
+                code = 1
+                detail = f": {result.error}" if str(result.error) else ""
+                print(f"puzzle {result.index}: {status}{detail}", file=sys.stderr)
+        out.flush()
+    except (OSError, ValueError) as error:
+        if isinstance(error, BrokenPipeError):
+            # the reader went away (e.g. `| head`): stop quietly, as a success
+            os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+            batch.close_pool()
+            return 0
+        print(f"{parser.prog}: error: {error}", file=sys.stderr)
+        code = 1
+    finally:
+        results.close()
+    print(format_summary(statuses, time.perf_counter() - start, workers), file=sys.stderr)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
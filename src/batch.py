@@ -0,0 +1,174 @@
+"""
+Batch solving of many puzzles across a pool of worker processes.
+
+The pool is created on first use and reused by later calls with the same
+number of workers. Every puzzle is solved independently, so an invalid
+puzzle only fails its own result. A worker process that dies (killed, out of
+memory) breaks the pool: the puzzles it lost fail with `BrokenProcessPool`
+and a new pool takes over the rest of the input. Puzzles are pulled from the
+input only as results are consumed, so a streamed input is never loaded all
+at once.
+"""
+
+import atexit
+import concurrent.futures
+import itertools
+import multiprocessing
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple
+
+from src import sudoku_solver
+from src.budget import COMPLETE
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one puzzle of a batch.
+
+    Attributes:
+        index (int): Position of the puzzle in the input.
+        solutions (list[list[int]] | None): Solutions found, None if solving failed.
+        error (Exception | None): The exception raised while solving, if any.
+        status (str | None): Search status from `src.budget` (e.g. "timeout" when the
+            puzzle's time budget ran out), None if solving failed.
+        count (int | None): Number of solutions found, None if solving failed or
+            the producer did not record it. With `count_only` 'solutions' is empty
+            and only this is set.
+    """
+    index: int
+    solutions: list[list[int]] | None
+    error: Exception | None
+    status: str | None = COMPLETE
+    count: int | None = None
+
+
+_pool = None
+_pool_workers = None
+
+
+def _solve_one(index: int, puzzle: list[int], limit: int, options: dict) -> BatchResult:
+    """Solve one puzzle inside a worker, turning exceptions into a result."""
+    try:
+        result = sudoku_solver.bounded_solver(puzzle, limit, **options)
+    except Exception as error:
+        return BatchResult(index, None, error, None)
+    return BatchResult(index, result.solutions, None, result.status, result.count)
+
+
+def _solve_chunk(chunk: list[tuple[int, list[int]]], limit: int, options: dict) -> list[BatchResult]:
+    """Solve a chunk of (index, puzzle) pairs inside a worker."""
+    return [_solve_one(index, puzzle, limit, options) for index, puzzle in chunk]
+
+
+def get_pool(workers: int = None) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Return the shared worker pool, creating it if needed.
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: A pool with 'workers' processes. The
+        previous pool is shut down if it had a different size.
+    """
+    global _pool, _pool_workers
+    workers = workers or multiprocessing.cpu_count()
+    if _pool is None or _pool_workers != workers:
+        close_pool()
+        _pool = concurrent.futures.ProcessPoolExecutor(workers)
+        _pool_workers = workers
+    return _pool
+
+
+def close_pool():
+    """Shut down the shared worker pool, if any, dropping the chunks not started yet."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = None
+
+
+def _submit(chunk: list[tuple[int, list[int]]], limit: int, options: dict, workers: int):
+    """Send a chunk to the shared pool, replacing the pool first if a worker died."""
+    pool = get_pool(workers)
+    try:
+        future = pool.submit(_solve_chunk, chunk, limit, options)
+    except concurrent.futures.BrokenExecutor:
+        _replace_pool(pool)
+        pool = get_pool(workers)
+        future = pool.submit(_solve_chunk, chunk, limit, options)
+    return future, chunk, pool
+
+
+def _replace_pool(pool: concurrent.futures.ProcessPoolExecutor):
+    """Drop a broken pool; the next `get_pool` call starts a new one."""
+    if pool is _pool:
+        close_pool()
+
+
+def _collect(future: concurrent.futures.Future, chunk: list[tuple[int, list[int]]],
+             pool: concurrent.futures.ProcessPoolExecutor) -> list[BatchResult]:
+    """Return the results of a submitted chunk, failing each of its puzzles if a worker died."""
+    try:
+        return future.result()
+    except concurrent.futures.BrokenExecutor as error:
+        _replace_pool(pool)
+        return [BatchResult(index, None, error, None) for index, _ in chunk]
+
+
+atexit.register(close_pool)
+
+
+def solve_many(puzzles: Iterable[list[int]], limit: int = 2, *, workers: int = None, chunksize: int = 1,
+               ordered: bool = True, max_in_flight: int = None, **options) -> Iterator[BatchResult]:
+    """
+    Solve many puzzles with the iterative backtracking solver across worker processes.
+
+    Args:
+        puzzles (Iterable[list[int]]): Puzzles as flat lists of 81 integers.
+        limit (int, optional): Maximum number of solutions per puzzle. Defaults to 2.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        chunksize (int, optional): Number of puzzles sent to a worker at once. Defaults to 1.
+        ordered (bool, optional): If True, results come in input order; otherwise
+            as they complete. Defaults to True.
+        max_in_flight (int, optional): Maximum number of puzzles submitted but not
+            yet yielded. Defaults to 4 chunks per worker.
+        **options: Keyword arguments passed on to `sudoku_solver.bounded_solver`
+            (engine, propagate, strong, and timeout and max_nodes applied to each puzzle).
+            With `count_only=True` the workers only count the solutions and send
+            back their number, not the grids.
+
+    Yields:
+        BatchResult: One result per puzzle. Puzzles that raised (e.g. InvalidSudokuError)
+        have `solutions` set to None and the exception in `error`; so do the puzzles
+        lost with a worker process that died, with a `BrokenProcessPool` error. Puzzles
+        stopped by a limit keep the solutions found so far and the limit's status.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    max_chunks = max(1, (max_in_flight or 4 * workers * chunksize) // chunksize)
+    numbered = ((index, list(puzzle)) for index, puzzle in enumerate(puzzles))
+    chunks = iter(lambda: list(itertools.islice(numbered, chunksize)), [])
+    if ordered:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(_submit(chunk, limit, options, workers))
+            if len(pending) >= max_chunks:
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
+    else:
+        pending = {}
+        for chunk in chunks:
+            future, chunk, pool = _submit(chunk, limit, options, workers)
+            pending[future] = chunk, pool
+            if len(pending) >= max_chunks:
+                yield from _take(pending)
+        while pending:
+            yield from _take(pending)
+
+
+def _take(pending: dict) -> Iterator[BatchResult]:
+    """Wait for the next finished chunks and yield their results."""
+    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+    for future in done:
+        yield from _collect(future, *pending.pop(future))
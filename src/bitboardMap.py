@@ -0,0 +1,179 @@
+from src.errors import *
+from src.constants import *
+from src.board import get_board, board_of
+
+
+class BitboardMap:
+    """
+    Represents Sudoku cell constraints using row, column and box bitboards.
+
+    Each unit keeps a 9-bit (N²-bit) mask of the digits already placed in it
+    (bit d-1 is set when digit d is used). The constraints of a cell are the
+    OR of the masks of its row, column and box, so placing or removing a digit
+    only touches three integers.
+
+    Attributes:
+        _board (Board): Tables of the board size, taken from the puzzle.
+        _rows (list[int]): Used-digit mask for each row.
+        _cols (list[int]): Used-digit mask for each column.
+        _boxes (list[int]): Used-digit mask for each box.
+        _empty_cells (set[int]): Indices of the empty cells.
+        _empty_mask (int): Bitmask of the empty cells, scanned in ascending order.
+    """
+
+    def __init__(self, puzzle: list[int] = None):
+        """
+        Initialize solver state with a puzzle.
+
+        Sets up the unit masks, `_empty_cells` and `_empty_mask`.
+        Populates constraints if a puzzle is provided; the board size
+        follows the length of the puzzle (9×9 without one).
+        """
+        self._set_board(get_board())
+        self._rows = [0] * SUDOKU_LENGTH
+        self._cols = [0] * SUDOKU_LENGTH
+        self._boxes = [0] * SUDOKU_LENGTH
+        self._empty_cells = set()
+        self._empty_mask = 0
+        if puzzle:
+            self.update_constraint_map(puzzle)
+
+    def _set_board(self, board):
+        self._board = board
+        self._row_of, self._col_of, self._box_of = board.row_of, board.col_of, board.box_of
+        self._digits_mask = board.digits_mask
+        self._mask_digits = board.mask_digits
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Get the bitmask of the digits constraining a cell.
+        Args:
+            index (int): Index of the cell.
+        Returns:
+            int: Mask of the digits used by the cell's neighbors.
+        """
+        return self._rows[self._row_of[index]] | self._cols[self._col_of[index]] | self._boxes[self._box_of[index]]
+
+    def candidates(self, index: int) -> int:
+        """
+        Return the mask of the digits still available for a cell (bit d-1 for digit d).
+        """
+        return ~(self._rows[self._row_of[index]] | self._cols[self._col_of[index]]
+                 | self._boxes[self._box_of[index]]) & self._digits_mask
+
+    def gen_digits(self, index: int):
+        """
+        Yield the digits still available for a cell, in ascending order.
+        """
+        return iter(self._mask_digits[self.candidates(index)])
+
+    def _get_index_most_constrained(self) -> int:
+        """
+        Find the index of the most constrained empty cell.
+
+        Cells are scanned in ascending order and the first one with at most
+        one candidate left is returned immediately; otherwise the lowest cell
+        with the most constrained digits wins, as in `ConstraintMap`.
+        Returns -1 if no empty cells remain.
+        """
+        rows, cols, boxes = self._rows, self._cols, self._boxes
+        row_of, col_of, box_of = self._row_of, self._col_of, self._box_of
+        almost_full = self._board.sudoku_length - 1
+        max_digits = -1
+        max_index = -1
+        cells = self._empty_mask
+        while cells:
+            low = cells & -cells
+            cells ^= low
+            i = low.bit_length() - 1
+            num_digits = (rows[row_of[i]] | cols[col_of[i]] | boxes[box_of[i]]).bit_count()
+            if num_digits >= almost_full:
+                return i
+            elif num_digits > max_digits:
+                max_digits = num_digits
+                max_index = i
+        return max_index
+
+    def update_empty_cells(self, index: int, *, add: bool = False):
+        """
+        Update the set of empty cells.
+        Arg:
+            index (int): The cell index to add or remove.
+        Kwarg:
+            add (bool, optional): If True, the index is added.
+            If False, the index is removed (unless index == -1).
+            Defaults to False.
+        Raises:
+            IndexError: If `add=True` and index is not a cell of the board.
+        """
+        if add:
+            if self._board.sudoku_size <= index or index < 0:
+                raise IndexError("index out of range")
+            self._empty_cells.add(index)
+            self._empty_mask |= 1 << index
+        elif index != -1:
+            self._empty_cells.discard(index)
+            self._empty_mask &= ~(1 << index)
+
+    def reset_cell(self, index: int, puzzle: list[int]):
+        """
+        Counterpart of `ConstraintMap.reset_cell`. Nothing to do: the candidates
+        of a cell are always derived from the digits placed in its units.
+        """
+
+    def pop_most_constrained_cell(self) -> int:
+        """
+        Return and remove the most constrained empty cell.
+
+        Returns -1 if no valid cell.
+        """
+        max_index = self._get_index_most_constrained()
+        self.update_empty_cells(max_index)
+        return max_index
+
+    def update_neighbors(self, idx: int, val: int, remove: bool = False):
+        """
+        Place or remove digit 'val' at cell 'idx' in the unit masks.
+
+        Args:
+            idx (int): Index of the cell.
+            val (int): Digit placed at or removed from the cell.
+            remove (bool, optional): If True, remove the digit; otherwise add. Defaults to False.
+        """
+        bit = 1 << (val - 1)
+        if remove:
+            bit = ~bit
+            self._rows[self._row_of[idx]] &= bit
+            self._cols[self._col_of[idx]] &= bit
+            self._boxes[self._box_of[idx]] &= bit
+        else:
+            self._rows[self._row_of[idx]] |= bit
+            self._cols[self._col_of[idx]] |= bit
+            self._boxes[self._box_of[idx]] |= bit
+
+    def update_constraint_map(self, puzzle: list):
+        """
+        Initialize or refresh the unit masks from a Sudoku puzzle.
+
+        Args:
+           puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                          (N⁴ integers for an N²×N² board).
+
+        Raises:
+            InvalidSudokuError: If a digit appears twice in the same unit.
+            PuzzleFormatError: If the puzzle length is not N⁴ for a box length N in 2–5.
+        """
+        board = board_of(puzzle)
+        if board is not self._board:
+            self._set_board(board)
+        length = board.sudoku_length
+        self._rows = [0] * length
+        self._cols = [0] * length
+        self._boxes = [0] * length
+        self._empty_cells = {i for i, val in enumerate(puzzle) if not val}
+        self._empty_mask = sum(1 << i for i in self._empty_cells)
+        for idx, val in enumerate(puzzle):
+            if 0 < val <= length:
+                if self[idx] & (1 << (val - 1)):
+                    raise InvalidSudokuError(f"Digit {val} at cell {idx} is already used by a neighbor")
+                self.update_neighbors(idx, val)
@@ -0,0 +1,163 @@
+"""
+Geometry and lookup tables of N²×N² boards (box sizes 2 to 5).
+
+A `Board` holds, for one box size, the tables the engines, the propagator
+and the solvers index by cell, unit and digit mask. Boards are built on
+first use and shared; the 9×9 board reuses the tables of `src.constants`.
+
+Digit masks are N bits wide (bit d-1 stands for digit d). Up to 9×9 the
+digits of every mask are tabulated; wider masks are split into 9-bit chunks
+looked up in the 9×9 table, so no table grows beyond 512 entries.
+"""
+
+from src.constants import *
+from src.errors import *
+
+# Supported box lengths.
+BOX_LENGTHS = range(2, 6)
+
+
+class _ChunkedDigits:
+    """
+    Digits of masks wider than 9 bits, looked up 9 bits at a time.
+
+    `chunked[mask]` returns the digits of 'mask' in ascending order, as `MASK_DIGITS` does.
+    """
+    __slots__ = ("_tables",)
+
+    def __init__(self, length: int):
+        self._tables = tuple(tuple(tuple(d + offset for d in digits) for digits in MASK_DIGITS)
+                             for offset in range(0, length, SUDOKU_LENGTH))
+
+    def __getitem__(self, mask: int) -> tuple[int, ...]:
+        digits = ()
+        for table in self._tables:
+            if mask & DIGITS_MASK:
+                digits += table[mask & DIGITS_MASK]
+            mask >>= SUDOKU_LENGTH
+        return digits
+
+
+class Board:
+    """
+    Tables of an N²×N² board. Attribute names follow `src.constants`.
+
+    Attributes:
+        box_length (int): N, the side of a box.
+        sudoku_length (int): N², the side of the grid and the number of digits.
+        sudoku_size (int): N⁴, the number of cells.
+        digit_shift (int): Bits of the count field of a `ConstraintMap` mask.
+        count_of_digits (int): Bitmask of that count field.
+        digits_mask (int): Mask with one bit per digit.
+        field_bits (int): Low bit of every 2-bit digit field, once the count is shifted out.
+        row_of, col_of, box_of (tuple[int, ...]): Row, column and box index of each cell.
+        units (tuple[tuple[int, ...], ...]): Cells of the rows, then the columns, then the boxes.
+        units_of (tuple[tuple[int, int, int], ...]): Units of each cell, as indices into `units`.
+        neighbors (tuple[tuple[int, ...], ...]): Neighbors of each cell, in ascending order.
+        crossing_units (tuple[tuple[int, ...], ...]): For each cell, the other units
+            holding one of its neighbors (every other row and column, and the boxes
+            of its band and stack).
+        row_segments, col_segments (tuple): Cells of row r inside box column s,
+            and of column c inside box row s.
+        mask_digits: `mask_digits[mask]` is the tuple of digits of a digit mask.
+    """
+
+    def __init__(self, box_length: int):
+        if box_length not in BOX_LENGTHS:
+            raise ValueError(f"Box length must be between {BOX_LENGTHS[0]} and {BOX_LENGTHS[-1]}, got {box_length}")
+        n = box_length
+        length = n * n
+        size = length * length
+        self.box_length = n
+        self.sudoku_length = length
+        self.sudoku_size = size
+        self.digit_shift = length.bit_length()
+        self.count_of_digits = (1 << self.digit_shift) - 1
+        self.digits_mask = (1 << length) - 1
+        self.field_bits = sum(1 << (DIGIT_MASK * d) for d in range(length))
+        if n == BOX_LENGTH:
+            self.row_of, self.col_of, self.box_of = ROW_OF, COL_OF, BOX_OF
+            self.units, self.units_of, self.neighbors = UNITS, UNITS_OF, NEIGHBORS
+        else:
+            self.row_of = tuple(cell // length for cell in range(size))
+            self.col_of = tuple(cell % length for cell in range(size))
+            self.box_of = tuple(n * (cell // (n * length)) + cell % length // n for cell in range(size))
+            self.units = (tuple(tuple(range(r * length, (r + 1) * length)) for r in range(length))
+                          + tuple(tuple(range(c, size, length)) for c in range(length))
+                          + tuple(tuple((b // n * n + k // n) * length + b % n * n + k % n for k in range(length))
+                                  for b in range(length)))
+            self.units_of = tuple((self.row_of[c], length + self.col_of[c], 2 * length + self.box_of[c])
+                                  for c in range(size))
+            self.neighbors = tuple(tuple(sorted(set(self.units[r] + self.units[c] + self.units[b]) - {cell}))
+                                   for cell, (r, c, b) in enumerate(self.units_of))
+        self.crossing_units = tuple(tuple(u for u in range(3 * length) if u not in self.units_of[cell]
+                                          and not neighbors.isdisjoint(self.units[u]))
+                                    for cell, neighbors in enumerate(map(set, self.neighbors)))
+        self.row_segments = tuple(tuple(tuple(r * length + s * n + k for k in range(n)) for s in range(n))
+                                  for r in range(length))
+        self.col_segments = tuple(tuple(tuple((s * n + k) * length + c for k in range(n)) for s in range(n))
+                                  for c in range(length))
+        if n == BOX_LENGTH:
+            self.mask_digits = MASK_DIGITS
+        elif length < SUDOKU_LENGTH:
+            self.mask_digits = MASK_DIGITS[:self.digits_mask + 1]
+        else:
+            self.mask_digits = _ChunkedDigits(length)
+
+    def __repr__(self) -> str:
+        return f"Board({self.box_length})"
+
+    def __reduce__(self):
+        return get_board, (self.box_length,)
+
+    def mask_from_constraints(self, bitmask: int) -> int:
+        """
+        Convert a `ConstraintMap` cell mask of this board into a digit mask.
+
+        Args:
+            bitmask (int): The cell's constraint bitmask.
+        Returns:
+            int: Mask with bit d-1 set when digit d is available.
+        """
+        bitmask >>= self.digit_shift
+        constrained = (bitmask | bitmask >> 1) & self.field_bits
+        mask = 0
+        shift = 0
+        while constrained:
+            mask |= FIELD_DIGITS[constrained & 0x3FF] << shift
+            constrained >>= 10
+            shift += 5
+        return ~mask & self.digits_mask
+
+
+_boards = {}
+
+
+def get_board(box_length: int = BOX_LENGTH) -> Board:
+    """
+    Return the shared board of a box size, building it on first use.
+
+    Raises:
+        ValueError: If the box length is not between 2 and 5.
+    """
+    board = _boards.get(box_length)
+    if board is None:
+        board = _boards[box_length] = Board(box_length)
+    return board
+
+
+def board_of(puzzle: list[int]) -> Board:
+    """
+    Return the board matching the number of cells of a puzzle.
+
+    Raises:
+        PuzzleFormatError: If the number of cells is not N⁴ for a supported box length N.
+    """
+    cells = len(puzzle)
+    if cells == SUDOKU_SIZE:
+        return get_board(BOX_LENGTH)
+    for n in BOX_LENGTHS:
+        if n ** 4 == cells:
+            return get_board(n)
+    raise PuzzleFormatError(f"Expected N⁴ cells for a box length N between "
+                            f"{BOX_LENGTHS[0]} and {BOX_LENGTHS[-1]}, got {len(puzzle)}")
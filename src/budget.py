@@ -0,0 +1,102 @@
+"""
+Time, node and cancellation limits of a search.
+
+A `Budget` is checked by the iterative search loop every few nodes, so a
+search that runs without one pays only for a counter. When a limit is hit
+the search stops where it is and the solutions found so far are returned
+with the status saying why it stopped.
+"""
+
+import time
+from typing import NamedTuple
+
+# Search statuses.
+COMPLETE = "complete"        # the search space was exhausted or 'limit' solutions were found
+TIMEOUT = "timeout"          # the time budget ran out
+NODE_LIMIT = "node_limit"    # the node budget ran out
+CANCELLED = "cancelled"      # the cancellation token was triggered
+
+# Nodes searched between two clock and cancellation checks.
+CHECK_INTERVAL = 32
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag, shared between a search and its caller.
+
+    `cancel()` may be called from another thread; the search notices it at its
+    next check and stops with the `CANCELLED` status.
+    """
+    __slots__ = ("cancelled",)
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """Ask the searches holding this token to stop."""
+        self.cancelled = True
+
+
+class Budget:
+    """
+    Limits of one search.
+
+    Attributes:
+        deadline (float | None): `time.perf_counter()` value after which the search stops.
+        max_nodes (int | None): Number of nodes after which the search stops.
+        cancel (CancelToken | None): Token stopping the search once cancelled.
+        status (str): `COMPLETE` until a limit is hit, then the status of that limit.
+        nodes (int): Nodes searched so far, as last reported by the search.
+    """
+
+    def __init__(self, timeout: float = None, max_nodes: int = None, cancel: CancelToken = None):
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"Timeout must be non-negative, got {timeout}")
+        if max_nodes is not None and max_nodes < 0:
+            raise ValueError(f"Node budget must be non-negative, got {max_nodes}")
+        self.deadline = None if timeout is None else time.perf_counter() + timeout
+        self.max_nodes = max_nodes
+        self.cancel = cancel
+        self.status = COMPLETE
+        self.nodes = 0
+
+    def next_check(self, nodes: int) -> int:
+        """
+        Return the node count at which the search must call `exceeded` next,
+        before trying one more node.
+        """
+        check_at = nodes + CHECK_INTERVAL
+        if self.max_nodes is not None and self.max_nodes < check_at:
+            return self.max_nodes
+        return check_at
+
+    def exceeded(self, nodes: int) -> bool:
+        """
+        Return whether the search must stop after 'nodes' nodes, recording why in `status`.
+        """
+        if self.cancel is not None and self.cancel.cancelled:
+            self.status = CANCELLED
+        elif self.max_nodes is not None and nodes >= self.max_nodes:
+            self.status = NODE_LIMIT
+        elif self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.status = TIMEOUT
+        return self.status != COMPLETE
+
+
+class SolveResult(NamedTuple):
+    """
+    Outcome of a bounded search.
+
+    Attributes:
+        solutions (list[list[int]]): Solutions found before the search stopped.
+        status (str): `COMPLETE`, `TIMEOUT`, `NODE_LIMIT` or `CANCELLED`.
+        nodes (int): Digits tried at branch points.
+        elapsed (float): Wall-clock seconds spent, including the validity check and setup.
+        count (int | None): Number of solutions found; the solutions themselves are
+            left out (empty 'solutions') when the search only counted them.
+    """
+    solutions: list[list[int]]
+    status: str
+    nodes: int
+    elapsed: float
+    count: int | None = None
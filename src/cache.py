@@ -0,0 +1,381 @@
+"""
+Solution cache keyed by the canonical form of a puzzle.
+
+Puzzles that differ only by a Sudoku symmetry (relabeling the digits,
+permuting bands, rows within a band, stacks or columns within a stack, and
+transposing) share one cache entry. The canonical form is the smallest
+81-cell string, blank cells first and digits relabeled in order of first
+appearance, over the whole symmetry group. It is found row by row, keeping
+only the partial transformations that produce the smallest rows so far;
+columns that are still interchangeable are kept together, so the search
+does not enumerate the column permutations.
+
+Solutions are stored in canonical form and mapped back to the orientation
+and digits of each caller. Entries live in an in-memory LRU and, optionally,
+in an SQLite file that survives restarts.
+"""
+
+import itertools
+import json
+from collections import OrderedDict
+from typing import NamedTuple
+
+from src.constants import *
+from src.errors import *
+from src import sudoku_solver
+from src import utils
+
+# Key of a digit not labeled yet: larger than any label.
+_NEW = SUDOKU_LENGTH + 1
+
+
+class Transform(NamedTuple):
+    """
+    A symmetry mapping a puzzle to its canonical form.
+
+    Attributes:
+        cells (tuple[int, ...]): Input cell shown at each canonical cell.
+        labels (tuple[int, ...]): Canonical digit of each input digit (index 0 maps 0 to 0).
+    """
+    cells: tuple[int, ...]
+    labels: tuple[int, ...]
+
+    def apply(self, grid: list[int]) -> list[int]:
+        """Map a grid of the caller to canonical form."""
+        labels = self.labels
+        return [labels[grid[cell]] for cell in self.cells]
+
+    def invert(self, grid: list[int]) -> list[int]:
+        """Map a canonical grid back to the caller's orientation and digits."""
+        digits = [0] * (SUDOKU_LENGTH + 1)
+        for digit, label in enumerate(self.labels):
+            digits[label] = digit
+        result = [0] * SUDOKU_SIZE
+        for i, cell in enumerate(self.cells):
+            result[cell] = digits[grid[i]]
+        return result
+
+
+class _State:
+    """
+    A partial transformation: the input rows placed so far, the order of
+    the stacks and columns as far as it is determined, and the digit labels.
+
+    Attributes:
+        rows (tuple[int, ...]): Input rows of the canonical rows built so far.
+        stacks (list[list[int]]): Ordered blocks of input stacks whose relative order is still free.
+        columns (list[list[list[int]]]): For each input stack, ordered blocks of its
+            input columns whose relative order is still free.
+        labels (list[int]): Label of each digit, 0 if not labeled yet.
+        next_label (int): Next label to hand out.
+    """
+    __slots__ = ("rows", "stacks", "columns", "labels", "next_label")
+
+    def __init__(self, rows, stacks, columns, labels, next_label):
+        self.rows = rows
+        self.stacks = stacks
+        self.columns = columns
+        self.labels = labels
+        self.next_label = next_label
+
+
+def _keys(state: _State, values: list[int]) -> list[int]:
+    """Comparison key of each cell of an input row: 0, its label, or _NEW."""
+    labels = state.labels
+    return [labels[v] or _NEW if v else 0 for v in values]
+
+
+def _row_output(state: _State, keys: list[int]) -> tuple:
+    """Smallest canonical row this state can produce from an input row with these cell keys."""
+    out = []
+    for block in state.stacks:
+        seqs = sorted(_stack_seq(state.columns[s], keys) for s in block)
+        for seq in seqs:
+            out += seq
+    return tuple(out)
+
+
+def _stack_seq(column_blocks: list[list[int]], keys: list[int]) -> list[int]:
+    seq = []
+    for block in column_blocks:
+        seq += sorted(keys[c] for c in block)
+    return seq
+
+
+def _refine(state: _State, row: int, values: list[int], keys: list[int]) -> list[_State]:
+    """
+    Return the states extending 'state' with input row 'row' placed next.
+
+    Ties the row resolves are fixed; ties between new digits are branched
+    over, as the order decides which digit gets which label.
+    """
+    # split every column block by key, ordering cells with new digits in every possible way
+    column_options = []
+    for s, blocks in enumerate(state.columns):
+        options = [[]]
+        for block in blocks:
+            groups = {}
+            for c in block:
+                groups.setdefault(keys[c], []).append(c)
+            parts = []
+            for key in sorted(groups):
+                cells = groups[key]
+                if key == _NEW and len(cells) > 1:
+                    parts.append([[[c] for c in perm] for perm in itertools.permutations(cells)])
+                else:
+                    parts.append([[cells]])
+            options = [prev + sum(choice, []) for prev in options for choice in itertools.product(*parts)]
+        column_options.append(options)
+    results = []
+    for columns in itertools.product(*column_options):
+        columns = list(columns)
+        # split every stack block by the stack's row, ordering stacks with new digits in every way
+        stack_parts = []
+        for block in state.stacks:
+            groups = {}
+            for s in block:
+                groups.setdefault(tuple(_stack_seq(columns[s], keys)), []).append(s)
+            for seq in sorted(groups):
+                stacks = groups[seq]
+                if _NEW in seq and len(stacks) > 1:
+                    stack_parts.append([[[s] for s in perm] for perm in itertools.permutations(stacks)])
+                else:
+                    stack_parts.append([[stacks]])
+        for choice in itertools.product(*stack_parts):
+            stacks = sum(choice, [])
+            labels = list(state.labels)
+            next_label = state.next_label
+            for block in stacks:
+                for s in block:
+                    for column_block in columns[s]:
+                        for c in column_block:
+                            v = values[c]
+                            if v and not labels[v]:
+                                labels[v] = next_label
+                                next_label += 1
+            results.append(_State(state.rows + (row,), stacks, columns, labels, next_label))
+    return results
+
+
+def _candidate_rows(state: _State, matrix: list[list[int]]) -> list[int]:
+    """Input rows that can come next, keeping one of several blank rows of a band."""
+    used = state.rows
+    position = len(used)
+    if position % BOX_LENGTH:
+        band = used[-1] // BOX_LENGTH
+        bands = [band]
+    else:
+        used_bands = {r // BOX_LENGTH for r in used}
+        bands = [b for b in range(BOX_LENGTH) if b not in used_bands]
+    rows = []
+    for band in bands:
+        blank_seen = False
+        for r in range(band * BOX_LENGTH, (band + 1) * BOX_LENGTH):
+            if r in used:
+                continue
+            if not any(matrix[r]):
+                # blank rows of a band are interchangeable
+                if blank_seen:
+                    continue
+                blank_seen = True
+            rows.append(r)
+    return rows
+
+
+def canonical_form(puzzle: list[int]) -> tuple[str, Transform]:
+    """
+    Return the canonical form of a puzzle and the transform leading to it.
+
+    Takes about a millisecond or two for puzzles with blank cells; complete
+    grids, whose rows tie under every column order, take about a second.
+
+    Args:
+        puzzle (list[int]): Flat list of 81 integers, 0 for empty cells.
+    Returns:
+        tuple[str, Transform]: The 81-character canonical string and a transform
+        with `transform.apply(puzzle)` equal to the canonical grid.
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+        PuzzleFormatError: If the puzzle is not a 9×9 grid.
+    """
+    if len(puzzle) != SUDOKU_SIZE:
+        raise PuzzleFormatError(f"Canonical forms are defined for 9×9 grids, got {len(puzzle)} cells")
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    grid = [puzzle[r * SUDOKU_LENGTH:(r + 1) * SUDOKU_LENGTH] for r in range(SUDOKU_LENGTH)]
+    matrices = (grid, [list(column) for column in zip(*grid)])
+    stacks = [list(range(BOX_LENGTH))]
+    columns = [[list(range(s * BOX_LENGTH, (s + 1) * BOX_LENGTH))] for s in range(BOX_LENGTH)]
+    states = [(t, _State((), stacks, columns, [0] * (SUDOKU_LENGTH + 1), 1)) for t in range(2)]
+    for _ in range(SUDOKU_LENGTH):
+        best = None
+        extensions = []
+        for t, state in states:
+            matrix = matrices[t]
+            for r in _candidate_rows(state, matrix):
+                keys = _keys(state, matrix[r])
+                row = _row_output(state, keys)
+                if best is None or row < best:
+                    best = row
+                    extensions = [(t, state, r, keys)]
+                elif row == best:
+                    extensions.append((t, state, r, keys))
+        states = [(t, new) for t, state, r, keys in extensions
+                  for new in _refine(state, r, matrices[t][r], keys)
+                  if tuple(_row_output(new, keys)) == best]
+    t, state = states[0]
+    order = [c for block in state.stacks for s in block for column_block in state.columns[s] for c in column_block]
+    cells = tuple((r * SUDOKU_LENGTH + c) if t == 0 else (c * SUDOKU_LENGTH + r) for r in state.rows for c in order)
+    labels = state.labels
+    next_label = state.next_label
+    for digit in range(1, SUDOKU_LENGTH + 1):
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+    transform = Transform(cells, tuple(labels))
+    return "".join(map(str, transform.apply(puzzle))), transform
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a SolutionCache.
+
+    Attributes:
+        hits (int): Lookups answered from memory or disk.
+        misses (int): Lookups that ran the solver.
+        evictions (int): Entries dropped from memory to respect 'maxsize'.
+        disk_hits (int): Hits answered by the on-disk store (included in 'hits').
+        size (int): Entries currently held in memory.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    disk_hits: int
+    size: int
+
+
+class SolutionCache:
+    """
+    Caches the solutions of puzzles by canonical form.
+
+    An entry holds the solutions found for a canonical puzzle and whether they
+    are all of its solutions. A lookup with a limit is answered from the entry
+    if it holds at least 'limit' solutions or all of them; otherwise the solver
+    runs and the entry is replaced. When a puzzle has more solutions than the
+    limit, the ones returned are valid but may differ from those the solver
+    would find directly.
+
+    Args:
+        maxsize (int, optional): Maximum number of entries kept in memory. Defaults to 1024.
+        path (str, optional): SQLite file storing every entry across restarts. Defaults to None.
+        solver (callable, optional): Called as `solver(puzzle, limit, **options)` on a miss.
+            Defaults to backtrack_iterative_solver.
+        **options: Keyword arguments passed on to the solver.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: str = None, *,
+                 solver=sudoku_solver.backtrack_iterative_solver, **options):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.solver = solver
+        self.options = options
+        self._entries = OrderedDict()
+        self._hits = self._misses = self._evictions = self._disk_hits = 0
+        self._db = None
+        if path is not None:
+            import sqlite3
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                             "(puzzle TEXT PRIMARY KEY, solutions TEXT NOT NULL, complete INTEGER NOT NULL)")
+            self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def solve(self, puzzle: list[int], limit: int = 2) -> list[list[int]]:
+        """
+        Return up to 'limit' solutions of a puzzle, from the cache if possible.
+
+        Args:
+            puzzle (list[int]): Flat list of 81 integers, 0 for empty cells.
+            limit (int, optional): Maximum number of solutions, None for all. Defaults to 2.
+        Returns:
+            list[list[int]]: The solutions, in the caller's orientation and digits.
+        Raises:
+            InvalidSudokuError: If the givens conflict.
+        """
+        if 0 not in puzzle:
+            # a complete grid is its own solution; canonicalizing it would cost more than checking it
+            return self.solver(puzzle, limit, **self.options)
+        canonical, transform = canonical_form(puzzle)
+        entry, on_disk = self._lookup(canonical)
+        if entry is not None and (entry[1] or limit is not None and len(entry[0]) >= limit):
+            self._hits += 1
+            self._disk_hits += on_disk
+            return [transform.invert(_to_grid(s)) for s in entry[0][:limit]]
+        self._misses += 1
+        solutions = self.solver(_to_grid(canonical), limit, **self.options)
+        complete = limit is None or len(solutions) < limit
+        self._store(canonical, tuple(_to_string(s) for s in solutions), complete)
+        return [transform.invert(s) for s in solutions]
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit, miss and eviction counts and the number of entries in memory."""
+        return CacheInfo(self._hits, self._misses, self._evictions, self._disk_hits, len(self._entries))
+
+    def clear(self):
+        """Drop the in-memory entries and reset the statistics; the on-disk store is kept."""
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = self._disk_hits = 0
+
+    def close(self):
+        """Close the on-disk store, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _lookup(self, canonical: str) -> tuple[tuple | None, bool]:
+        """Return the entry of a canonical puzzle (None if unknown) and whether it was read from disk."""
+        entries = self._entries
+        entry = entries.get(canonical)
+        if entry is not None:
+            entries.move_to_end(canonical)
+            return entry, False
+        if self._db is None:
+            return None, False
+        row = self._db.execute("SELECT solutions, complete FROM solutions WHERE puzzle = ?", (canonical,)).fetchone()
+        if row is None:
+            return None, False
+        entry = (tuple(json.loads(row[0])), bool(row[1]))
+        self._remember(canonical, entry)
+        return entry, True
+
+    def _store(self, canonical: str, solutions: tuple[str, ...], complete: bool):
+        self._remember(canonical, (solutions, complete))
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                             (canonical, json.dumps(solutions), int(complete)))
+            self._db.commit()
+
+    def _remember(self, canonical: str, entry: tuple):
+        entries = self._entries
+        entries[canonical] = entry
+        entries.move_to_end(canonical)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self._evictions += 1
+
+
+def _to_string(grid: list[int]) -> str:
+    return "".join(map(str, grid))
+
+
+def _to_grid(string: str) -> list[int]:
+    return [int(c) for c in string]
@@ -1,176 +1,249 @@
-from src.errors import *
-from src.constants import *
-
-
-class ConstraintMap:
-    """
-    Represents Sudoku cell constraints using a bitmask.
-
-    Bitmask layout for each cell:
-        - Lowest 4 bits: total number of constrained digits
-        - Each subsequent 2-bit field: constraint count for digits 1–9
-
-    Attributes:
-        _cmap (list[int]): Bitmask for each cell.
-        neighbors (list[set[int]]): Neighbor indices for each cell (row, column, box).
-    """
-
-    neighbors = None
-
-    def __init__(self, puzzle: list[int]= None):
-        """
-        Initialize solver state with a puzzle.
-
-        Sets up `_cmap`, `_empty_cells`, and neighbor relations.
-        Populates constraints if a puzzle is provided.
-        """
-        self._cmap = [0] * SUDOKU_SIZE  # the internal constraints map
-        self._empty_cells = set()  # the set of empty cells within the puzzle
-        self._neighbors = NEIGHBOR_MAP
-        if puzzle:
-            self.update_constraint_map(puzzle)
-
-    def __getitem__(self, index: int) -> int:
-        """
-        Get the bitmask of the constraints for a cell.
-        Args:
-            index (int): Index of the cell.
-        Returns:
-            int: Bitmask representing the constraints for the cell.
-        """
-        return self._cmap[index]
-
-    def _get_index_most_constrained(self) -> int:
-        """
-        Find the index of the most constrained empty cell.
-
-        Returns the index of a cell with 8 constrained digits immediately
-        (only one candidate left). Returns -1 if no empty cells remain.
-        """
-        max_digits = 0
-        max_index = -1
-        for i in self._empty_cells:
-            num_digits = self._cmap[i] & COUNT_OF_DIGITS
-            if num_digits == SUDOKU_LENGTH - 1:
-                return i
-            elif num_digits > max_digits:
-                max_digits = num_digits
-                max_index = i
-        return max_index
-
-    def update_empty_cells(self, index: int, *, add: bool = False):
-        """
-        Update the set of empty cells.
-        Arg:
-            index (int): The cell index to add or remove.
-        Kwarg:
-            add (bool, optional): If True, the index is added.
-            If False, the index is removed (unless index == -1).
-            Defaults to False.
-        Raises:
-            IndexError: If `add=True` and index is not in [0, 80].
-        """
-        if add:
-            if 80 < index or index < 0:
-                raise IndexError("index out of range")
-            self._empty_cells.add(index)
-        elif index != -1:
-            self._empty_cells.discard(index)
-
-    def pop_most_constrained_cell(self) -> int:
-        """
-        Return and remove the most constrained empty cell.
-
-        Uses `_get_index_most_constrained` to select the cell and then
-        removes it from `self._empty_cells`. Returns -1 if no valid cell.
-        """
-        max_index = self._get_index_most_constrained()
-        self.update_empty_cells(max_index)
-        return max_index
-
-    def _add_constraint_neighbor(self, idx: int, val: int):
-        """
-        Increment the constraint count for digit 'val' in neighbor cell 'idx'.
-
-        If 'val' was not previously constrained, the total number of constrained
-        digits in the cell is incremented.
-
-        Args:
-            idx (int): Index of the neighbor cell.
-            val (int): Digit to add to constraints.
-
-        Raises:
-            InvalidSudokuError: If the digit would exceed the maximum allowed constraints.
-        """
-        mask = self._cmap[idx]
-        dig_mask = (mask >> (DIGIT_MASK * (val - 1) + DIGIT_SHIFT)) & 0b11
-        if dig_mask < 3:
-            dig_mask += 1
-        else:
-            raise InvalidSudokuError(f"Cell {idx} exceeded number of constraints for digit {val}")
-        mask += 1 << (DIGIT_MASK * (val - 1) + DIGIT_SHIFT)
-        if dig_mask == 1:
-            mask += 1
-        self._cmap[idx] = mask
-
-    def _remove_constraint_neighbor(self, idx: int, val: int):
-        """
-        Decrement the constraint count for digit 'val' in neighbor cell 'idx'.
-
-        If 'val' had only one constraint, the total number of constrained digits
-        in the cell is decremented.
-
-        Args:
-            idx (int): Index of the neighbor cell.
-            val (int): Digit to remove from constraints.
-
-        Raises:
-            InvalidSudokuError: If the digit has no existing constraints.
-        """
-        mask = self._cmap[idx]
-        dig_mask = (mask >> (DIGIT_MASK * (val - 1) + DIGIT_SHIFT)) & 0b11
-        if dig_mask > 0:
-            dig_mask -= 1
-        else:
-            #print(bin(self._cmap[idx]))
-            raise InvalidSudokuError(f"Cell {idx} has no constraints for digit {val}")
-        mask -= 1 << (DIGIT_MASK * (val - 1) + DIGIT_SHIFT)
-        if dig_mask == 0:
-            mask -= 1
-        self._cmap[idx] = mask
-
-    def update_neighbors(self, idx: int, val: int, remove: bool = False):
-        """
-        Update constraints for all empty neighbors of a cell.
-        Skips neighbors that are not in _empty_cells.
-
-        Args:
-            idx (int): Index of the cell whose neighbors will be updated.
-            val (int): Digit to add or remove from neighbor constraints.
-            remove (bool, optional): If True, remove the constraint; otherwise add. Defaults to False.
-        """
-        for i in self._neighbors[idx]:
-            if i not in self._empty_cells:
-                continue
-            if remove:
-                self._remove_constraint_neighbor(i, val)
-            else:
-                self._add_constraint_neighbor(i, val)
-
-    def update_constraint_map(self, puzzle: list):
-        """
-        Initialize or refresh the constraint map from a Sudoku puzzle.
-        For each non-empty cell, adds its value as a constraint to all empty neighbors.
-
-        Args:
-           puzzle (list): Flat list of 81 integers representing the Sudoku grid.
-        """
-        self._empty_cells = {i for i in range(SUDOKU_SIZE)}
-        for idx, val in enumerate(puzzle):
-            if not val:
-                continue
-            self._empty_cells.remove(idx)
-            if 0 < val <= SUDOKU_LENGTH:
-                for i in self._neighbors[idx]:
-                    if not puzzle[i]:
-                        self._add_constraint_neighbor(i, val)
+from src.errors import *
+from src.constants import *
+from src.board import get_board, board_of
+
+
+class ConstraintMap:
+    """
+    Represents Sudoku cell constraints using a bitmask.
+
+    Bitmask layout for each cell:
+        - Lowest 4 bits: total number of constrained digits
+          (`board.digit_shift` bits, 5 for 16×16 and 25×25)
+        - Each subsequent 2-bit field: constraint count for digits 1–9 (1–N²)
+
+    Empty cells are also indexed by their number of constrained digits:
+    `_buckets[k]` is a bitmask with bit i set when empty cell i has k
+    constrained digits, so the most constrained cell is found without
+    scanning `_empty_cells`.
+
+    Attributes:
+        _board (Board): Tables of the board size, taken from the puzzle.
+        _cmap (list[int]): Bitmask for each cell.
+        _empty_cells (set[int]): Indices of the empty cells.
+        _buckets (list[int]): Bitmask of empty cells for each constraint count.
+    """
+
+    def __init__(self, puzzle: list[int]= None):
+        """
+        Initialize solver state with a puzzle.
+
+        Sets up `_cmap`, `_empty_cells` and `_buckets`.
+        Populates constraints if a puzzle is provided; the board size
+        follows the length of the puzzle (9×9 without one).
+        """
+        self._set_board(get_board())
+        self._cmap = [0] * SUDOKU_SIZE  # the internal constraints map
+        self._empty_cells = set()  # the set of empty cells within the puzzle
+        self._buckets = [0] * (SUDOKU_LENGTH + 1)  # empty cells grouped by constraint count
+        if puzzle:
+            self.update_constraint_map(puzzle)
+
+    def _set_board(self, board):
+        self._board = board
+        self._length = board.sudoku_length
+        self._digit_shift = board.digit_shift
+        self._count_of_digits = board.count_of_digits
+        self._neighbors = board.neighbors
+        self._mask_digits = board.mask_digits
+        self._mask_from_constraints = board.mask_from_constraints
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Get the bitmask of the constraints for a cell.
+        Args:
+            index (int): Index of the cell.
+        Returns:
+            int: Bitmask representing the constraints for the cell.
+        """
+        return self._cmap[index]
+
+    def candidates(self, index: int) -> int:
+        """
+        Return the mask of the digits still available for a cell (bit d-1 for digit d).
+        """
+        return self._mask_from_constraints(self._cmap[index])
+
+    def gen_digits(self, index: int):
+        """
+        Yield the digits still available for a cell, in ascending order.
+        """
+        return iter(self._mask_digits[self._mask_from_constraints(self._cmap[index])])
+
+    def _get_index_most_constrained(self) -> int:
+        """
+        Find the index of the most constrained empty cell.
+
+        Cells with at most one candidate left (N²-1 or N² constrained digits)
+        come first, then cells with the most constrained digits. Ties go to the
+        lowest index. Returns -1 if no empty cells remain.
+        """
+        buckets = self._buckets
+        length = self._length
+        cells = buckets[length] | buckets[length - 1]
+        k = length - 2
+        while not cells:
+            if k < 0:
+                return -1
+            cells = buckets[k]
+            k -= 1
+        return (cells & -cells).bit_length() - 1
+
+    def update_empty_cells(self, index: int, *, add: bool = False):
+        """
+        Update the set of empty cells.
+        Arg:
+            index (int): The cell index to add or remove.
+        Kwarg:
+            add (bool, optional): If True, the index is added.
+            If False, the index is removed (unless index == -1).
+            Defaults to False.
+        Raises:
+            IndexError: If `add=True` and index is not a cell of the board.
+        """
+        if add:
+            if len(self._cmap) <= index or index < 0:
+                raise IndexError("index out of range")
+            if index not in self._empty_cells:
+                self._empty_cells.add(index)
+                self._buckets[self._cmap[index] & self._count_of_digits] |= 1 << index
+        elif index in self._empty_cells:
+            self._empty_cells.remove(index)
+            self._buckets[self._cmap[index] & self._count_of_digits] &= ~(1 << index)
+
+    def reset_cell(self, index: int, puzzle: list[int]):
+        """
+        Recompute the constraints of a cell from its filled neighbors in 'puzzle'.
+
+        Only empty cells are kept up to date, which is enough for a search that
+        empties cells in the reverse order it fills them. A cell emptied out of
+        that order (e.g. a given removed by the generator) must be reset before
+        `update_empty_cells(index, add=True)`.
+
+        Args:
+            index (int): Index of a cell that is not in `_empty_cells`.
+            puzzle (list[int]): The grid the constraints follow.
+        """
+        shift0 = self._digit_shift
+        mask = 0
+        for i in self._neighbors[index]:
+            val = puzzle[i]
+            if val:
+                shift = DIGIT_MASK * (val - 1) + shift0
+                if not (mask >> shift) & 0b11:
+                    mask += 1
+                mask += 1 << shift
+        self._cmap[index] = mask
+
+    def pop_most_constrained_cell(self) -> int:
+        """
+        Return and remove the most constrained empty cell.
+
+        Uses `_get_index_most_constrained` to select the cell and then
+        removes it from `self._empty_cells`. Returns -1 if no valid cell.
+        """
+        max_index = self._get_index_most_constrained()
+        self.update_empty_cells(max_index)
+        return max_index
+
+    def _add_constraint_neighbor(self, idx: int, val: int):
+        """
+        Increment the constraint count for digit 'val' in neighbor cell 'idx'.
+
+        If 'val' was not previously constrained, the total number of constrained
+        digits in the cell is incremented and the cell moves to the next bucket.
+        'idx' must be an empty cell.
+
+        Args:
+            idx (int): Index of the neighbor cell.
+            val (int): Digit to add to constraints.
+
+        Raises:
+            InvalidSudokuError: If the digit would exceed the maximum allowed constraints.
+        """
+        mask = self._cmap[idx]
+        shift = DIGIT_MASK * (val - 1) + self._digit_shift
+        dig_mask = (mask >> shift) & 0b11
+        if dig_mask < 3:
+            dig_mask += 1
+        else:
+            raise InvalidSudokuError(f"Cell {idx} exceeded number of constraints for digit {val}")
+        mask += 1 << shift
+        if dig_mask == 1:
+            count = mask & self._count_of_digits
+            mask += 1
+            bit = 1 << idx
+            self._buckets[count] ^= bit
+            self._buckets[count + 1] |= bit
+        self._cmap[idx] = mask
+
+    def _remove_constraint_neighbor(self, idx: int, val: int):
+        """
+        Decrement the constraint count for digit 'val' in neighbor cell 'idx'.
+
+        If 'val' had only one constraint, the total number of constrained digits
+        in the cell is decremented and the cell moves to the previous bucket.
+        'idx' must be an empty cell.
+
+        Args:
+            idx (int): Index of the neighbor cell.
+            val (int): Digit to remove from constraints.
+
+        Raises:
+            InvalidSudokuError: If the digit has no existing constraints.
+        """
+        mask = self._cmap[idx]
+        shift = DIGIT_MASK * (val - 1) + self._digit_shift
+        dig_mask = (mask >> shift) & 0b11
+        if dig_mask > 0:
+            dig_mask -= 1
+        else:
+            #print(bin(self._cmap[idx]))
+            raise InvalidSudokuError(f"Cell {idx} has no constraints for digit {val}")
+        mask -= 1 << shift
+        if dig_mask == 0:
+            count = mask & self._count_of_digits
+            mask -= 1
+            bit = 1 << idx
+            self._buckets[count] ^= bit
+            self._buckets[count - 1] |= bit
+        self._cmap[idx] = mask
+
+    def update_neighbors(self, idx: int, val: int, remove: bool = False):
+        """
+        Update constraints for all empty neighbors of a cell.
+        Skips neighbors that are not in _empty_cells.
+
+        Args:
+            idx (int): Index of the cell whose neighbors will be updated.
+            val (int): Digit to add or remove from neighbor constraints.
+            remove (bool, optional): If True, remove the constraint; otherwise add. Defaults to False.
+        """
+        update = self._remove_constraint_neighbor if remove else self._add_constraint_neighbor
+        empty_cells = self._empty_cells
+        for i in self._neighbors[idx]:
+            if i in empty_cells:
+                update(i, val)
+
+    def update_constraint_map(self, puzzle: list):
+        """
+        Initialize or refresh the constraint map from a Sudoku puzzle.
+        For each non-empty cell, adds its value as a constraint to all empty neighbors.
+
+        Args:
+           puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                          (N⁴ integers for an N²×N² board).
+
+        Raises:
+            PuzzleFormatError: If the puzzle length is not N⁴ for a box length N in 2–5.
+        """
+        board = board_of(puzzle)
+        if board is not self._board:
+            self._set_board(board)
+        self._cmap = [0] * board.sudoku_size
+        self._empty_cells = {i for i, val in enumerate(puzzle) if not val}
+        self._buckets = [0] * (board.sudoku_length + 1)
+        self._buckets[0] = sum(1 << i for i in self._empty_cells)
+        for idx, val in enumerate(puzzle):
+            if 0 < val <= board.sudoku_length:
+                self.update_neighbors(idx, val)
@@ -0,0 +1,300 @@
+"""
+Compact binary puzzle corpus with memory-mapped random access.
+
+File layout (little endian):
+    header      32 bytes: magic b"SDKC", version (u16), box length (u8),
+                flags (u8), puzzle count (u64), record size (u32),
+                metadata length (u32), zero padding.
+    puzzles     count fixed-size records, 4 bits per cell (two cells per byte,
+                high nibble first, the last nibble is padding).
+    solutions   count records in the same encoding, if FLAG_SOLUTIONS is set.
+    metadata    UTF-8 JSON object of 'metadata length' bytes.
+
+Records are read straight from the mapped file, so worker processes can
+share one corpus without parsing it, and any subset is available by index.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import Iterable, Iterator
+
+from src.constants import *
+from src.errors import *
+from src import puzzle_io
+
+MAGIC = b"SDKC"
+VERSION = 1
+FLAG_SOLUTIONS = 1
+HEADER = struct.Struct("<4sHBBQII")
+HEADER_SIZE = 32
+RECORD_SIZE = (SUDOKU_SIZE + 1) // 2
+
+# Translation tables extracting the high and low nibble of every byte.
+_HIGH = bytes(b >> 4 for b in range(256))
+_LOW = bytes(b & 0xF for b in range(256))
+
+
+def pack_grid(grid: list[int]) -> bytes:
+    """
+    Pack a grid into a record of 4 bits per cell.
+
+    Raises:
+        PuzzleFormatError: If the grid does not have 81 cells with values 0-9.
+    """
+    if len(grid) != SUDOKU_SIZE or not all(0 <= v <= SUDOKU_LENGTH for v in grid):
+        raise PuzzleFormatError(f"Cannot pack grid {grid!r}")
+    cells = bytes(grid) + b"\0"
+    return bytes(hi << 4 | lo for hi, lo in zip(cells[0::2], cells[1::2]))
+
+
+def unpack_grid(record) -> list[int]:
+    """Unpack a record (bytes or memoryview) into a flat list of 81 integers."""
+    record = bytes(record)
+    cells = bytearray(2 * len(record))
+    cells[0::2] = record.translate(_HIGH)
+    cells[1::2] = record.translate(_LOW)
+    return list(cells[:SUDOKU_SIZE])
+
+
+class CorpusWriter:
+    """
+    Streaming writer for a binary corpus.
+
+    Puzzles are written as they come; solutions are spooled to a temporary
+    file and appended as their own column when the writer is closed.
+    Use as a context manager: if the block raises, the header is never
+    written and the partial file is deleted.
+    """
+
+    def __init__(self, path, *, with_solutions: bool = False, metadata: dict = None):
+        """
+        Args:
+            path: Destination file.
+            with_solutions (bool, optional): Whether every puzzle comes with a solution.
+            metadata (dict, optional): JSON-serializable metadata stored in the file.
+        """
+        self._path = path
+        self._f = open(path, "wb")
+        self._f.write(bytes(HEADER_SIZE))
+        self._solutions = tempfile.TemporaryFile() if with_solutions else None
+        self._metadata = json.dumps(metadata or {}).encode("utf-8")
+        self._count = 0
+
+    def write(self, puzzle: list[int], solution: list[int] = None):
+        """
+        Append a puzzle and, for corpora with solutions, its solution.
+
+        Raises:
+            ValueError: If a solution is missing or not expected.
+        """
+        if (solution is None) != (self._solutions is None):
+            raise ValueError("A solution must be given exactly when the corpus has solutions")
+        self._f.write(pack_grid(puzzle))
+        if solution is not None:
+            self._solutions.write(pack_grid(solution))
+        self._count += 1
+
+    @property
+    def count(self) -> int:
+        """Number of puzzles written so far."""
+        return self._count
+
+    def close(self):
+        """Append the solution column and the metadata, then write the header."""
+        if self._f is None:
+            return
+        flags = 0
+        if self._solutions is not None:
+            flags |= FLAG_SOLUTIONS
+            self._solutions.seek(0)
+            shutil.copyfileobj(self._solutions, self._f)
+            self._solutions.close()
+        self._f.write(self._metadata)
+        self._f.seek(0)
+        self._f.write(HEADER.pack(MAGIC, VERSION, BOX_LENGTH, flags, self._count, RECORD_SIZE,
+                                  len(self._metadata)))
+        self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def discard(self):
+        """Close the writer and delete the unfinished file."""
+        if self._f is None:
+            return
+        if self._solutions is not None:
+            self._solutions.close()
+        self._f.close()
+        self._f = None
+        os.remove(self._path)
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class _Mapping:
+    """A mapped corpus file and its header, shared by the views over it."""
+
+    def __init__(self, data: mmap.mmap, count: int, flags: int, metadata: dict):
+        self.data = data
+        self.count = count
+        self.flags = flags
+        self.metadata = metadata
+        self.views = 0
+
+    def release(self):
+        """Drop one view, closing the mapping with the last one."""
+        self.views -= 1
+        if not self.views:
+            try:
+                self.data.close()
+            except BufferError:
+                # a record still held by the caller keeps the mapping alive until it is freed
+                pass
+
+
+class Corpus:
+    """
+    Read-only, memory-mapped view of a binary corpus.
+
+    Indexing returns a puzzle as a list of integers; slicing and `take` return
+    new views over the same mapping without copying any record. Pickling a
+    corpus reopens the file by path, so it can be passed to worker processes.
+
+    Attributes:
+        path (str): Path of the corpus file.
+        metadata (dict): Metadata stored in the file.
+        has_solutions (bool): Whether the file has a solution column.
+    """
+
+    def __init__(self, path, _index=None, _shared=None):
+        self.path = str(path)
+        if _shared is None:
+            with open(self.path, "rb") as f:
+                # checked before mapping, since an empty file cannot be mapped at all
+                if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                    raise PuzzleFormatError(f"{self.path} is too short to be a corpus")
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                _shared = _Mapping(data, *self._read_header(data))
+            except PuzzleFormatError:
+                data.close()
+                raise
+        self._shared = _shared
+        _shared.views += 1
+        self.metadata = _shared.metadata
+        self.has_solutions = bool(_shared.flags & FLAG_SOLUTIONS)
+        self._view = memoryview(_shared.data)
+        self._solutions_offset = HEADER_SIZE + _shared.count * RECORD_SIZE
+        self._index = range(_shared.count) if _index is None else _index
+
+    def _read_header(self, data) -> tuple[int, int, dict]:
+        magic, version, box_length, flags, count, record_size, meta_len = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise PuzzleFormatError(f"{self.path} is not a version {VERSION} corpus")
+        if box_length != BOX_LENGTH or record_size != RECORD_SIZE:
+            raise PuzzleFormatError(f"{self.path} holds {box_length**2}x{box_length**2} grids")
+        meta_offset = HEADER_SIZE + count * RECORD_SIZE * (2 if flags & FLAG_SOLUTIONS else 1)
+        metadata = json.loads(bytes(data[meta_offset:meta_offset + meta_len]) or b"{}")
+        return count, flags, metadata
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _view_of(self, index) -> "Corpus":
+        return Corpus(self.path, index, self._shared)
+
+    def __getitem__(self, key):
+        """Return puzzle 'key' as a list of integers, or a view for a slice."""
+        if isinstance(key, slice):
+            return self._view_of(self._index[key])
+        return unpack_grid(self.record(key))
+
+    def __iter__(self) -> Iterator[list[int]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, indices: Iterable[int]) -> "Corpus":
+        """Return a view holding the puzzles at 'indices', in that order."""
+        return self._view_of([self._index[i] for i in indices])
+
+    def record(self, i: int) -> memoryview:
+        """Return the packed record of puzzle 'i' without copying it."""
+        start = HEADER_SIZE + self._index[i] * RECORD_SIZE
+        return self._view[start:start + RECORD_SIZE]
+
+    def solution(self, i: int) -> list[int]:
+        """
+        Return the stored solution of puzzle 'i'.
+
+        Raises:
+            LookupError: If the corpus has no solution column.
+        """
+        if not self.has_solutions:
+            raise LookupError(f"{self.path} has no solutions")
+        start = self._solutions_offset + self._index[i] * RECORD_SIZE
+        return unpack_grid(self._view[start:start + RECORD_SIZE])
+
+    def __reduce__(self):
+        index = None if self._index == range(self._shared.count) else self._index
+        return Corpus, (self.path, index)
+
+    def close(self):
+        """Release this view; the mapping is closed once no view uses it."""
+        if self._view is None:
+            return
+        self._view.release()
+        self._view = None
+        self._shared.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert(source, dest, fmt: str = None, *, solver=None, metadata: dict = None, skipped: list = None) -> int:
+    """
+    Convert a JSON or line-per-puzzle file into a binary corpus.
+
+    With a solver, puzzles that cannot go in the solution column, because
+    their givens conflict or they have no solution, are left out of the corpus
+    rather than stored with a made-up solution or ending the conversion. The
+    puzzles after them then move up one index.
+
+    Args:
+        source: Input file, read with puzzle_io.read_puzzles.
+        dest: Output corpus file.
+        fmt (str, optional): Input format, detected when omitted.
+        solver (Callable, optional): If given, e.g. sudoku_solver.dlx_solver, the
+            first solution it returns is stored in the solution column.
+        metadata (dict, optional): Metadata stored in the corpus.
+        skipped (list, optional): If given, the input index of every puzzle left
+            out is appended to it.
+
+    Returns:
+        int: The number of puzzles written.
+    """
+    with CorpusWriter(dest, with_solutions=solver is not None, metadata=metadata) as writer:
+        for index, puzzle in enumerate(puzzle_io.read_puzzles(source, fmt)):
+            if solver is None:
+                writer.write(puzzle)
+                continue
+            try:
+                solutions = solver(list(puzzle), 1)
+            except InvalidSudokuError:
+                solutions = None
+            if solutions:
+                writer.write(puzzle, solutions[0])
+            elif skipped is not None:
+                skipped.append(index)
+        return writer.count
@@ -0,0 +1,208 @@
+"""
+Dancing Links (Knuth's Algorithm X) exact-cover solver for Sudoku.
+
+A Sudoku is an exact-cover problem with 729 rows (a digit in a cell) and
+324 columns: every cell holds one digit, and every row, column and box holds
+each digit once. The links of the cover matrix are stored in flat integer
+lists indexed by node number; node 0 is the root, nodes 1-324 are the column
+headers and every matrix row adds 4 nodes. An N²×N² board has N⁶ rows and
+4·N⁴ columns, laid out the same way.
+
+The matrix of each board size is built once and copied for each puzzle.
+"""
+
+from src.errors import *
+from src.board import board_of
+
+# Cover matrices built so far, by box length.
+_templates = {}
+
+
+def _build_template(board) -> tuple[list[int], ...]:
+    """
+    Build the links of the full Sudoku cover matrix of a board.
+
+    Returns:
+        tuple[list[int], ...]: The left, right, up, down, column and row
+        arrays of every node, and the size of every column.
+    """
+    length, cells = board.sudoku_length, board.sudoku_size
+    # offsets of the four constraint groups among the columns
+    _cell, _row, _col, _box = (k * cells for k in range(4))
+    num_columns = 4 * cells
+    num_nodes = 1 + num_columns + 4 * length * cells
+    left = [0] * num_nodes
+    right = [0] * num_nodes
+    up = list(range(num_nodes))
+    down = list(range(num_nodes))
+    column = [0] * num_nodes
+    row_of = [-1] * num_nodes
+    size = [0] * (num_columns + 1)
+    for c in range(num_columns + 1):
+        left[c] = c - 1
+        right[c] = c + 1
+    left[0] = num_columns
+    right[num_columns] = 0
+    node = num_columns + 1
+    for cell in range(cells):
+        for digit in range(length):
+            row_id = cell * length + digit
+            columns = (1 + _cell + cell,
+                       1 + _row + board.row_of[cell] * length + digit,
+                       1 + _col + board.col_of[cell] * length + digit,
+                       1 + _box + board.box_of[cell] * length + digit)
+            first = node
+            for c in columns:
+                column[node] = c
+                row_of[node] = row_id
+                # append the node at the bottom of its column
+                up[node] = up[c]
+                down[node] = c
+                down[up[c]] = node
+                up[c] = node
+                size[c] += 1
+                left[node] = node - 1
+                right[node] = node + 1
+                node += 1
+            left[first] = node - 1
+            right[node - 1] = first
+    return left, right, up, down, column, row_of, size
+
+
+def _get_template(board) -> tuple[list[int], ...]:
+    template = _templates.get(board.box_length)
+    if template is None:
+        template = _templates[board.box_length] = _build_template(board)
+    return template
+
+
+class DancingLinks:
+    """
+    Exact-cover search over a private copy of the Sudoku cover matrix.
+
+    Attributes:
+        _left, _right, _up, _down (list[int]): Links of every node.
+        _column (list[int]): Column header of every node.
+        _row_of (list[int]): Matrix row (cell * N² + digit - 1) of every node.
+        _size (list[int]): Number of nodes left in every column.
+        _grid (list[int]): The puzzle the search started from.
+        _length (int): Number of digits of the board.
+    """
+
+    def __init__(self, puzzle: list[int]):
+        """
+        Copy the cover matrix and remove the rows and columns used by the givens.
+
+        Raises:
+            InvalidSudokuError: If two givens need the same column.
+            PuzzleFormatError: If the puzzle length is not N⁴ for a box length N in 2–5.
+        """
+        board = board_of(puzzle)
+        template = _get_template(board)
+        length = self._length = board.sudoku_length
+        num_columns = 4 * board.sudoku_size
+        self._left, self._right, self._up, self._down = (list(a) for a in template[:4])
+        self._column, self._row_of = template[4], template[5]
+        self._size = list(template[6])
+        self._grid = list(puzzle)
+        right = self._right
+        covered = set()
+        for cell, val in enumerate(puzzle):
+            if not val:
+                continue
+            # the first node of row (cell, val) sits right after the headers
+            node = num_columns + 1 + 4 * (cell * length + val - 1)
+            j = node
+            while True:
+                c = self._column[j]
+                if c in covered:
+                    raise InvalidSudokuError(f"Digit {val} at cell {cell} conflicts with another given")
+                covered.add(c)
+                self._cover(c)
+                j = right[j]
+                if j == node:
+                    break
+
+    def _cover(self, c: int):
+        left, right, up, down, column, size = (self._left, self._right, self._up, self._down,
+                                               self._column, self._size)
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, c: int):
+        left, right, up, down, column, size = (self._left, self._right, self._up, self._down,
+                                               self._column, self._size)
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def solve(self, limit: int = 2) -> list[list[int]]:
+        """
+        Find up to 'limit' solutions.
+
+        Returns:
+            list[list[int]]: A list of solutions (each solution is a list of 81 integers).
+        """
+        left, right, down, column, row_of, size = (self._left, self._right, self._down, self._column,
+                                                   self._row_of, self._size)
+        cover, uncover = self._cover, self._uncover
+        length = self._length
+        solutions = []
+        chosen = []
+
+        def _search() -> bool:
+            if right[0] == 0:
+                grid = list(self._grid)
+                for r in chosen:
+                    grid[r // length] = r % length + 1
+                solutions.append(grid)
+                return len(solutions) == limit
+            # choose the column with the fewest rows left
+            c = right[0]
+            best = c
+            best_size = size[c]
+            while c and best_size > 1:
+                if size[c] < best_size:
+                    best = c
+                    best_size = size[c]
+                c = right[c]
+            if not best_size:
+                return False
+            cover(best)
+            r = down[best]
+            done = False
+            while r != best and not done:
+                chosen.append(row_of[r])
+                j = right[r]
+                while j != r:
+                    cover(column[j])
+                    j = right[j]
+                done = _search()
+                j = left[r]
+                while j != r:
+                    uncover(column[j])
+                    j = left[j]
+                chosen.pop()
+                r = down[r]
+            uncover(best)
+            return done
+
+        _search()
+        return solutions
@@ -1,11 +1,19 @@
-"""
-Custom exceptions for the Sudoku solver.
-
-"""
-# Raised when a Sudoku rule is violated.
-class InvalidSudokuError(Exception):
-    pass
-
-# Raised when a cell exceeds the maximum number of constraints.
-class ExceededNumConstraintsError(Exception):
-    pass
\ No newline at end of file
+"""
+Custom exceptions for the Sudoku solver.
+
+"""
+# Raised when a Sudoku rule is violated.
+class InvalidSudokuError(Exception):
+    pass
+
+# Raised when a cell exceeds the maximum number of constraints.
+class ExceededNumConstraintsError(Exception):
+    pass
+
+# Raised when a puzzle cannot be parsed from its text or JSON form.
+class PuzzleFormatError(ValueError):
+    pass
+
+# Raised when no puzzle meeting the requested clue count could be generated.
+class GenerationError(Exception):
+    pass
@@ -0,0 +1,249 @@
+"""
+Puzzle generation by clue removal.
+
+A random complete grid is built, then its clues are removed in random order,
+one symmetry orbit at a time, as long as the puzzle keeps a unique solution.
+
+Uniqueness is checked incrementally. One constraint engine (and propagator)
+follows the puzzle for the whole reduction: removing or restoring a clue only
+updates the engine. Since the puzzle was unique before a removal, any second
+solution must put another digit in one of the cells just emptied, so each
+candidate digit of those cells is placed in turn and the search stops at the
+first solution found, instead of counting solutions of the whole puzzle.
+
+Usage:
+    python -m src.generator [--count N] [--clues N] [--symmetry NAME] [--box-length N]
+                            [--seed N] [--attempts N] [--output FILE]
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Iterator
+
+from src.bitboardMap import BitboardMap
+from src.board import get_board, board_of
+from src.constants import *
+from src.errors import *
+from src.propagation import Propagator
+from src import puzzle_io
+from src import sudoku_solver
+
+# Symmetries of the clue pattern.
+SYMMETRIES = ("none", "rotational", "mirror", "diagonal", "dihedral")
+
+
+def random_grid(rng: random.Random, box_length: int = BOX_LENGTH) -> list[int]:
+    """
+    Build a random complete grid.
+
+    The first row is a random permutation, the rest is completed by the solver,
+    then bands, rows within bands, stacks and columns within stacks are shuffled
+    and the grid is transposed half of the time. Grids are varied but not drawn
+    uniformly from all grids.
+
+    Args:
+        rng (random.Random): Source of randomness.
+        box_length (int, optional): N for an N²×N² grid. Defaults to 3.
+    Returns:
+        list[int]: Flat list of the N⁴ digits of the grid.
+    """
+    n = box_length
+    length = get_board(n).sudoku_length
+    puzzle = [0] * (length * length)
+    puzzle[:length] = rng.sample(range(1, length + 1), length)
+    grid = sudoku_solver.backtrack_iterative_solver(puzzle, limit=1, engine=BitboardMap, propagate=True)[0]
+    rows = [band * n + r for band in rng.sample(range(n), n) for r in rng.sample(range(n), n)]
+    cols = [stack * n + c for stack in rng.sample(range(n), n) for c in rng.sample(range(n), n)]
+    if rng.random() < 0.5:
+        rows, cols = cols, rows
+        return [grid[cols[c] * length + rows[r]] for r in range(length) for c in range(length)]
+    return [grid[rows[r] * length + cols[c]] for r in range(length) for c in range(length)]
+
+
+def orbits(symmetry: str, box_length: int = BOX_LENGTH) -> list[tuple[int, ...]]:
+    """
+    Split the cells into the groups a symmetric clue pattern keeps or removes together.
+
+    Args:
+        symmetry (str): One of `SYMMETRIES`: "none", "rotational" (half turn),
+            "mirror" (left-right), "diagonal" (main diagonal) or "dihedral"
+            (every rotation and reflection of the square).
+        box_length (int, optional): N for an N²×N² grid. Defaults to 3.
+    Returns:
+        list[tuple[int, ...]]: The orbits, each a sorted tuple of cells.
+    Raises:
+        ValueError: If the symmetry is unknown.
+    """
+    if symmetry not in SYMMETRIES:
+        raise ValueError(f"Unknown symmetry {symmetry!r}, expected one of {', '.join(SYMMETRIES)}")
+    length = get_board(box_length).sudoku_length
+    last = length - 1
+    seen = set()
+    result = []
+    for cell in range(length * length):
+        if cell in seen:
+            continue
+        r, c = divmod(cell, length)
+        if symmetry == "none":
+            images = [(r, c)]
+        elif symmetry == "rotational":
+            images = [(r, c), (last - r, last - c)]
+        elif symmetry == "mirror":
+            images = [(r, c), (r, last - c)]
+        elif symmetry == "diagonal":
+            images = [(r, c), (c, r)]
+        else:
+            images = [(y, x) for a, b in ((r, c), (c, r))
+                      for y, x in ((a, b), (last - a, b), (a, last - b), (last - a, last - b))]
+        orbit = tuple(sorted({y * length + x for y, x in images}))
+        seen.update(orbit)
+        result.append(orbit)
+    return result
+
+
+def _remove(puzzle: list[int], cm, cells: tuple[int, ...]):
+    for cell in cells:
+        cm.update_neighbors(cell, puzzle[cell], remove=True)
+        puzzle[cell] = 0
+        # givens are emptied in any order, not in the search's last-in first-out order
+        cm.reset_cell(cell, puzzle)
+        cm.update_empty_cells(cell, add=True)
+
+
+def _restore(puzzle: list[int], cm, grid: list[int], cells: tuple[int, ...]):
+    for cell in cells:
+        puzzle[cell] = grid[cell]
+        cm.update_empty_cells(cell)
+        cm.update_neighbors(cell, grid[cell])
+
+
+def _still_unique(puzzle: list[int], cm, prop, grid: list[int], cells: tuple[int, ...], mask_digits) -> bool:
+    """
+    Return whether a puzzle that was unique before 'cells' were emptied still is,
+    i.e. no solution puts another digit than the grid's in one of them.
+    """
+    for cell in cells:
+        others = cm.candidates(cell) & ~(1 << (grid[cell] - 1))
+        for digit in mask_digits[others]:
+            puzzle[cell] = digit
+            cm.update_empty_cells(cell)
+            cm.update_neighbors(cell, digit)
+            found = sudoku_solver.has_solution(puzzle, cm, prop)
+            cm.update_neighbors(cell, digit, remove=True)
+            puzzle[cell] = 0
+            cm.update_empty_cells(cell, add=True)
+            if found:
+                return False
+    return True
+
+
+def reduce_grid(grid: list[int], rng: random.Random, *, clues: int = None, symmetry: str = "none",
+                engine: type = BitboardMap, propagate: bool = True) -> list[int]:
+    """
+    Remove clues from a complete grid while its solution stays unique.
+
+    Orbits of cells (see `orbits`) are tried once each, in random order. Without
+    'clues' the result is minimal for its symmetry: emptying any further orbit
+    would allow a second solution.
+
+    Args:
+        grid (list[int]): A complete, valid grid.
+        rng (random.Random): Source of randomness.
+        clues (int, optional): Stop once the puzzle has at most this many clues.
+            Defaults to None (remove as many as possible).
+        symmetry (str, optional): Symmetry of the clue pattern. Defaults to "none".
+        engine (type, optional): Constraint engine of the uniqueness checks. Defaults to `BitboardMap`.
+        propagate (bool, optional): Apply naked and hidden singles during the checks. Defaults to True.
+    Returns:
+        list[int]: A puzzle whose only solution is 'grid'.
+    """
+    board = board_of(grid)
+    puzzle = list(grid)
+    cm = engine(puzzle)
+    prop = Propagator(puzzle, cm) if propagate else None
+    remaining = len(puzzle)
+    groups = orbits(symmetry, board.box_length)
+    rng.shuffle(groups)
+    for group in groups:
+        if clues is not None and remaining <= clues:
+            break
+        _remove(puzzle, cm, group)
+        if _still_unique(puzzle, cm, prop, grid, group, board.mask_digits):
+            remaining -= len(group)
+        else:
+            _restore(puzzle, cm, grid, group)
+    return puzzle
+
+
+def generate(clues: int = None, *, symmetry: str = "none", box_length: int = BOX_LENGTH,
+             rng: random.Random = None, attempts: int = 100, **options) -> list[int]:
+    """
+    Generate a puzzle with a unique solution.
+
+    Args:
+        clues (int, optional): Target number of clues: the puzzle has at most this
+            many (a symmetric orbit may take it a few cells below). A new grid is
+            tried when a grid cannot be reduced that far. Defaults to None
+            (a minimal puzzle with however many clues it needs).
+        symmetry (str, optional): One of `SYMMETRIES`. Defaults to "none".
+        box_length (int, optional): N for an N²×N² puzzle. Defaults to 3.
+        rng (random.Random, optional): Source of randomness. Defaults to a new unseeded one.
+        attempts (int, optional): Number of grids tried to reach 'clues'. Defaults to 100.
+        **options: engine and propagate, as for `reduce_grid`.
+    Returns:
+        list[int]: The puzzle, 0 for empty cells.
+    Raises:
+        GenerationError: If no grid could be reduced to 'clues' clues in 'attempts' tries.
+        ValueError: If the symmetry or the box length is not supported.
+    """
+    rng = rng or random.Random()
+    orbits(symmetry, box_length)
+    for _ in range(attempts):
+        puzzle = reduce_grid(random_grid(rng, box_length), rng, clues=clues, symmetry=symmetry, **options)
+        if clues is None or sum(1 for v in puzzle if v) <= clues:
+            return puzzle
+    raise GenerationError(f"No puzzle with at most {clues} clues found in {attempts} attempts")
+
+
+def generate_many(count: int, *, seed: int = None, **options) -> Iterator[list[int]]:
+    """
+    Generate 'count' puzzles, reproducibly when 'seed' is given.
+
+    Keyword arguments are passed on to `generate`.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield generate(rng=rng, **options)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=10, help="Puzzles to generate (default 10).")
+    parser.add_argument("--clues", type=int, help="Target number of clues (default: minimal puzzles).")
+    parser.add_argument("--symmetry", choices=SYMMETRIES, default="none", help="Symmetry of the clues.")
+    parser.add_argument("--box-length", type=int, default=BOX_LENGTH, help="N for N²×N² puzzles (default 3).")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible output.")
+    parser.add_argument("--attempts", type=int, default=100, help="Grids tried per puzzle to reach --clues.")
+    parser.add_argument("--output", default="-", help="Output file, .json or lines (default: standard output).")
+    args = parser.parse_args(argv)
+    fmt = None if args.box_length == BOX_LENGTH else "json"
+    start = time.perf_counter()
+    clue_total = 0
+    try:
+        with puzzle_io.PuzzleWriter(args.output, fmt, key="puzzles") as writer:
+            for puzzle in generate_many(args.count, seed=args.seed, clues=args.clues, symmetry=args.symmetry,
+                                        box_length=args.box_length, attempts=args.attempts):
+                writer.write(puzzle)
+                clue_total += sum(1 for v in puzzle if v)
+    except (GenerationError, ValueError) as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+    print(f"{args.count} puzzles in {elapsed:.2f} s ({args.count / elapsed:.1f} puzzles/s on one core), "
+          f"{clue_total / max(args.count, 1):.1f} clues on average", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
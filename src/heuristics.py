@@ -0,0 +1,175 @@
+"""
+Pluggable branching heuristics for the backtracking solvers.
+
+A `Heuristic` decides which empty cell the search branches on and in which
+order its digits are tried. Like the counters of `src.stats`, it works by
+wrapping the constraint engine and the digit source of a search, so the
+search loop is unchanged and solvers called without a heuristic run exactly
+as before (MRV on the engine, digits in ascending order).
+
+Cell rules:
+    mrv      the engine's own choice: fewest candidates, lowest cell on ties
+    degree   fewest candidates, ties going to the cell with the most empty neighbors
+    places   also looks for a digit with the fewest places left in a unit; when
+             it has fewer places than the best cell has candidates, the search
+             branches on the most constrained of those places and tries the
+             digit there first
+
+Value rules:
+    ascending  digits in ascending order
+    lcv        least-constraining value: digits removing the fewest candidates
+               from empty neighbors first
+    random     a random order drawn from a seeded generator;
+               `sudoku_solver.restart_solver` combines it with node budgets
+               that grow between restarts
+"""
+
+import random
+
+from src.board import board_of
+
+CELL_RULES = ("mrv", "degree", "places")
+VALUE_RULES = ("ascending", "lcv", "random")
+
+
+class Heuristic:
+    """
+    A cell rule and a value rule, passed to the solvers as `heuristic=`.
+
+    Attributes:
+        cell (str): One of `CELL_RULES`.
+        value (str): One of `VALUE_RULES`.
+        seed (int | None): Seed of the "random" value rule. Every search bound
+            to the heuristic starts from this seed, so results are reproducible.
+    """
+
+    def __init__(self, cell: str = "mrv", value: str = "ascending", *, seed: int = None):
+        """
+        Raises:
+            ValueError: If a rule is unknown.
+        """
+        if cell not in CELL_RULES:
+            raise ValueError(f"Unknown cell rule {cell!r}, expected one of {', '.join(CELL_RULES)}")
+        if value not in VALUE_RULES:
+            raise ValueError(f"Unknown value rule {value!r}, expected one of {', '.join(VALUE_RULES)}")
+        self.cell = cell
+        self.value = value
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return f"Heuristic({self.cell!r}, {self.value!r}, seed={self.seed})"
+
+    @property
+    def name(self) -> str:
+        """Short name, e.g. "degree+lcv"."""
+        return f"{self.cell}+{self.value}"
+
+    def bind(self, puzzle: list[int], cm, source) -> "Brancher":
+        """
+        Return the wrapper a search uses as its engine and digit source.
+
+        Args:
+            puzzle (list[int]): The grid being searched.
+            cm: The constraint engine of the search.
+            source: The digit source of the search (the engine or a `Propagator`).
+        """
+        return Brancher(self, puzzle, cm, source)
+
+
+class Brancher:
+    """
+    Wraps the engine and the digit source of one search to apply a `Heuristic`.
+
+    `pop_most_constrained_cell` and `gen_digits` follow the heuristic's rules;
+    candidates come from the wrapped digit source and every other attribute is
+    delegated to the wrapped engine.
+    """
+
+    def __init__(self, heuristic: Heuristic, puzzle: list[int], cm, source):
+        board = board_of(puzzle)
+        self._heuristic = heuristic
+        self._puzzle = puzzle
+        self._cm = cm
+        self._source = source
+        self._neighbors = board.neighbors
+        self._units = board.units
+        self._mask_digits = board.mask_digits
+        self._rng = random.Random(heuristic.seed) if heuristic.value == "random" else None
+        # digit tried first in the cell chosen by the "places" rule
+        self._first_cell = -1
+        self._first_digit = 0
+        self._only_place = False
+
+    def __getattr__(self, name):
+        return getattr(self._cm, name)
+
+    def candidates(self, index: int) -> int:
+        return self._source.candidates(index)
+
+    def pop_most_constrained_cell(self) -> int:
+        rule = self._heuristic.cell
+        # a cell popped but never branched on (e.g. pruned by a nogood) keeps no forced digit
+        self._first_cell = -1
+        if rule == "mrv":
+            return self._cm.pop_most_constrained_cell()
+        empty = self._cm._empty_cells
+        if not empty:
+            return -1
+        candidates = self._source.candidates
+        if rule == "degree":
+            puzzle, neighbors = self._puzzle, self._neighbors
+            best = min(empty, key=lambda i: (candidates(i).bit_count(),
+                                             -sum(1 for n in neighbors[i] if not puzzle[n]), i))
+        else:
+            best = self._fewest_places(empty, candidates)
+        self._cm.update_empty_cells(best)
+        return best
+
+    def _fewest_places(self, empty, candidates) -> int:
+        best = min(empty, key=lambda i: (candidates(i).bit_count(), i))
+        best_count = candidates(best).bit_count()
+        if best_count <= 1:
+            return best
+        puzzle = self._puzzle
+        for unit in self._units:
+            cells = [(i, candidates(i)) for i in unit if not puzzle[i]]
+            if len(cells) < 2:
+                continue
+            union = 0
+            for _, mask in cells:
+                union |= mask
+            for digit in self._mask_digits[union]:
+                bit = 1 << (digit - 1)
+                places = [i for i, mask in cells if mask & bit]
+                if len(places) < best_count:
+                    best_count = len(places)
+                    best = min(places, key=lambda i: (candidates(i).bit_count(), i))
+                    self._first_cell, self._first_digit = best, digit
+                    if best_count <= 1:
+                        break
+            if best_count <= 1:
+                break
+        self._only_place = best_count == 1 and best == self._first_cell
+        return best
+
+    def gen_digits(self, index: int):
+        rule = self._heuristic.value
+        if rule == "ascending" and index != self._first_cell:
+            return self._source.gen_digits(index)
+        digits = list(self._mask_digits[self._source.candidates(index)])
+        if rule == "lcv":
+            puzzle, candidates = self._puzzle, self._source.candidates
+            masks = [candidates(n) for n in self._neighbors[index] if not puzzle[n]]
+            digits.sort(key=lambda d: (sum(1 for m in masks if m >> (d - 1) & 1), d))
+        elif rule == "random":
+            self._rng.shuffle(digits)
+        if index == self._first_cell:
+            self._first_cell = -1
+            if self._first_digit in digits:
+                digits.remove(self._first_digit)
+                digits.insert(0, self._first_digit)
+                if self._only_place:
+                    # the digit's only place in a unit: no solution puts another digit here
+                    del digits[1:]
+        return iter(digits)
+
@@ -0,0 +1,149 @@
+"""
+Memo of the dead ends of the backtracking search, keyed by Zobrist hashes.
+
+Whether a grid can be completed depends only on the digits it holds, not on
+the order they were placed in or on the puzzle the search started from. So
+when the search exhausts a branch point without finding a solution, the grid
+it held on entering that branch point is a nogood: a later search reaching
+the same grid, through another path or from a puzzle with other givens,
+can skip it at once. This pays off when many searches run on related
+puzzles, e.g. the repeated uniqueness checks of `src.generator` or the
+restarts of `sudoku_solver.restart_solver`.
+
+Grids are identified by their Zobrist hash: the XOR of a random 64-bit key
+per (cell, digit) placed. `ZobristEngine` keeps it up to date incrementally
+in `update_neighbors`, through which the search, the propagator and the
+generator place and remove every digit. Two different grids share a hash
+with a probability of about 2⁻⁶⁴ per pair, which is accepted as in any
+transposition table.
+
+`NogoodTable` holds the hashes, at most 'maxsize' of them, evicting the
+least recently used.
+"""
+
+import random
+from collections import OrderedDict
+from typing import NamedTuple
+
+from src.board import Board, board_of
+
+# Zobrist keys of each board size, built on first use.
+_keys = {}
+
+
+def zobrist_keys(board: Board) -> tuple[tuple[int, ...], ...]:
+    """
+    Return the keys of a board: `keys[cell][digit]` is a random 64-bit integer, 0 for digit 0.
+
+    Keys are drawn from a fixed seed, so hashes are the same in every process.
+    """
+    keys = _keys.get(board.sudoku_size)
+    if keys is None:
+        rng = random.Random(board.sudoku_size)
+        keys = _keys[board.sudoku_size] = tuple(
+            (0,) + tuple(rng.getrandbits(64) for _ in range(board.sudoku_length))
+            for _ in range(board.sudoku_size))
+    return keys
+
+
+def grid_key(puzzle: list[int]) -> int:
+    """Return the Zobrist hash of a grid, computed from scratch."""
+    keys = zobrist_keys(board_of(puzzle))
+    key = 0
+    for cell, digit in enumerate(puzzle):
+        key ^= keys[cell][digit]
+    return key
+
+
+class ZobristEngine:
+    """
+    Wraps a constraint engine to keep the Zobrist hash of the grid in `key`.
+
+    Every digit placed or removed through `update_neighbors` toggles its key,
+    so `key` follows the grid as long as all changes go through the wrapper:
+    a `Propagator` must be built on the wrapper, not on the wrapped engine.
+    Every other attribute is delegated to the wrapped engine.
+
+    Attributes:
+        key (int): Zobrist hash of the grid.
+    """
+
+    def __init__(self, cm, puzzle: list[int]):
+        self._cm = cm
+        self._keys = zobrist_keys(board_of(puzzle))
+        self.key = grid_key(puzzle)
+
+    def __getattr__(self, name):
+        return getattr(self._cm, name)
+
+    def update_neighbors(self, idx: int, val: int, remove: bool = False):
+        self.key ^= self._keys[idx][val]
+        self._cm.update_neighbors(idx, val, remove)
+
+
+class NogoodInfo(NamedTuple):
+    """
+    Statistics of a NogoodTable.
+
+    Attributes:
+        probes (int): Lookups made by searches.
+        hits (int): Lookups that found a nogood, each pruning a branch.
+        stores (int): Nogoods added.
+        evictions (int): Nogoods dropped to respect 'maxsize'.
+        size (int): Nogoods currently held.
+    """
+    probes: int
+    hits: int
+    stores: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the probes that were hits (0 without probes)."""
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class NogoodTable:
+    """
+    Bounded set of the hashes of grids known to have no completion.
+
+    Args:
+        maxsize (int, optional): Maximum number of nogoods held. Defaults to 65536
+            (a few MB). The least recently stored or hit nogood is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._probes = self._hits = self._stores = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: int) -> bool:
+        self._probes += 1
+        if key in self._keys:
+            self._hits += 1
+            self._keys.move_to_end(key)
+            return True
+        return False
+
+    def add(self, key: int):
+        """Record the hash of a grid without completion, evicting the least recently used if full."""
+        self._stores += 1
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        if len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Drop every nogood. The counters are kept."""
+        self._keys.clear()
+
+    def info(self) -> NogoodInfo:
+        """Return the probe, hit, store and eviction counts and the number of nogoods held."""
+        return NogoodInfo(self._probes, self._hits, self._stores, self._evictions, len(self._keys))
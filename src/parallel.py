@@ -0,0 +1,203 @@
+"""
+Parallel search of a single puzzle by splitting its search tree.
+
+The top levels of the MRV search tree are expanded in the calling process
+until there are enough independent subproblems (partial grids); these are
+searched by a pool of worker processes and their solutions merged. The
+workers share a solution counter: a worker claims each solution it finds,
+and every worker stops at its next budget check once 'limit' solutions
+exist globally.
+"""
+
+import atexit
+import multiprocessing
+import multiprocessing.pool
+import threading
+from collections import deque
+from functools import partial
+
+from src.constraintMap import ConstraintMap
+from src.propagation import Propagator
+from src.budget import Budget
+from src.stats import SearchStats
+from src import sudoku_solver
+from src import utils
+from src.errors import *
+
+# Subproblems created per worker when splitting, so that uneven subtrees balance out.
+TASKS_PER_WORKER = 8
+
+_pool = None
+_pool_workers = None
+_found = None
+# One parallel search at a time owns the pool and its shared counter.
+_search_lock = threading.Lock()
+
+
+class _LimitReached:
+    """
+    Cancellation token of a worker search, cancelled once 'limit' solutions
+    have been claimed by all workers together.
+    """
+    __slots__ = ("_found", "_limit")
+
+    def __init__(self, found, limit: int):
+        self._found = found
+        self._limit = limit
+
+    @property
+    def cancelled(self) -> bool:
+        return self._found.value >= self._limit
+
+
+def _init_worker(found):
+    global _found
+    _found = found
+
+
+def _solve_subproblem(grid: list[int], limit: int, options: dict, with_stats: bool) -> tuple:
+    """
+    Search one subproblem inside a worker.
+
+    Returns:
+        tuple: The solutions claimed by this worker, and its `SearchStats` (or None).
+    """
+    stats = SearchStats() if with_stats else None
+    solutions = []
+    if limit is None:
+        budget = None
+    elif _found.value >= limit:
+        return solutions, stats
+    else:
+        budget = Budget(cancel=_LimitReached(_found, limit))
+    for solution in sudoku_solver.iter_solutions(grid, stats=stats, budget=budget, **options):
+        if limit is not None:
+            with _found.get_lock():
+                if _found.value >= limit:
+                    break
+                _found.value += 1
+        solutions.append(solution)
+    return solutions, stats
+
+
+def _get_pool(workers: int) -> multiprocessing.pool.Pool:
+    """Return the shared pool of search workers, creating it if needed."""
+    global _pool, _pool_workers, _found
+    if _pool is None or _pool_workers != workers:
+        close_pool()
+        _found = multiprocessing.Value("q", 0)
+        _pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(_found,))
+        _pool_workers = workers
+    return _pool
+
+
+def close_pool():
+    """Shut down the pool of search workers, if any."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+        _pool_workers = None
+
+
+atexit.register(close_pool)
+
+
+def split_search(puzzle: list[int], tasks: int, *, engine: type = ConstraintMap, propagate: bool = False,
+                 strong: bool = False) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Expand the top of the MRV search tree into independent subproblems.
+
+    Nodes are expanded breadth-first: the most constrained cell of a partial
+    grid is branched on, one child grid per candidate digit, until there are
+    at least 'tasks' grids left to search or nothing left to expand. Children
+    are propagated first when 'propagate' or 'strong' is set; dead ends are dropped.
+
+    Args:
+        puzzle (list[int]): A valid puzzle; it is not modified.
+        tasks (int): Number of subproblems wanted.
+        engine, propagate, strong: As for `sudoku_solver.backtrack_iterative_solver`.
+
+    Returns:
+        tuple: The subproblems (partial grids, which together hold every solution
+        exactly once) and the solutions reached while expanding.
+    """
+    frontier = deque([list(puzzle)])
+    solutions = []
+    while frontier and len(frontier) < tasks:
+        grid = frontier.popleft()
+        cm = engine(grid)
+        if propagate or strong:
+            prop = Propagator(grid, cm, strong=strong)
+            if not prop.propagate():
+                continue
+            candidates = prop.candidates
+        else:
+            candidates = cm.candidates
+        idx = cm.pop_most_constrained_cell()
+        if idx == -1:
+            solutions.append(grid)
+            continue
+        mask = candidates(idx)
+        for digit in range(1, mask.bit_length() + 1):
+            if mask >> (digit - 1) & 1:
+                child = list(grid)
+                child[idx] = digit
+                frontier.append(child)
+    return list(frontier), solutions
+
+
+def parallel_solver(puzzle: list, limit: int = 2, *, workers: int = None, tasks: int = None,
+                    engine: type = ConstraintMap, propagate: bool = False, strong: bool = False,
+                    stats: SearchStats = None) -> list[list]:
+    """
+    Solve one Sudoku puzzle with several worker processes.
+
+    The search tree is split into subproblems (see `split_search`) that are
+    searched in parallel. At most 'limit' solutions are returned in total:
+    every worker stops soon after that many have been found globally. When
+    the limit stops the search, which solutions are returned may differ from
+    `backtrack_iterative_solver`; without it, they come in subproblem order.
+
+    Parallel searches from several threads are run one after the other.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+                       Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find, None for all. Defaults to 2.
+        workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        tasks (int, optional): Number of subproblems to split the search into.
+                       Defaults to `TASKS_PER_WORKER` per worker.
+        engine, propagate, strong: As for `sudoku_solver.backtrack_iterative_solver`.
+        stats (SearchStats, optional): If given, the counters of the worker searches
+                       are added to it (depths are counted from the subproblems).
+
+    Returns:
+        list[list]: A list of solutions (each solution is a list of 81 integers).
+
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+    """
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    workers = workers or multiprocessing.cpu_count()
+    options = {"engine": engine, "propagate": propagate, "strong": strong}
+    subproblems, solutions = split_search(puzzle, tasks or TASKS_PER_WORKER * workers, **options)
+    if limit is not None:
+        del solutions[limit:]
+        if len(solutions) == limit:
+            return solutions
+    if not subproblems:
+        return solutions
+    with _search_lock:
+        pool = _get_pool(workers)
+        _found.value = len(solutions)
+        search = partial(_solve_subproblem, limit=limit, options=options, with_stats=stats is not None)
+        # every result is waited for, so no stale search outlives this call
+        for found, worker_stats in pool.imap(search, subproblems):
+            solutions.extend(found)
+            if stats is not None:
+                stats.merge(worker_stats)
+    return solutions
@@ -0,0 +1,325 @@
+"""
+Constraint propagation on top of a constraint engine.
+
+Applies logical deductions to a puzzle until nothing changes:
+- Naked singles: a cell with a single candidate left gets that digit.
+- Hidden singles: a digit with a single place left in a unit goes there.
+- Locked candidates and naked pairs (optional): remove candidates without
+  placing digits.
+
+Every placement and elimination is recorded on a trail so the work done
+after a `mark()` can be undone on backtrack. After a placement by the search,
+only the neighbors of the cell and the units they share are re-examined, so
+the work per placement grows with the number of units, not of cells.
+"""
+
+from src.board import board_of
+
+
+class Propagator:
+    """
+    Applies naked and hidden singles, and optionally locked candidates and
+    naked pairs, to a puzzle and its constraint engine.
+
+    Placements go through the engine exactly as the solvers do them, so the
+    engine stays consistent. Eliminations from the stronger rules are kept
+    in `_eliminated` and are honored by `candidates` and `gen_digits`.
+
+    Attributes:
+        _board (Board): Tables of the board size, taken from the puzzle.
+        _puzzle (list[int]): The grid being solved, updated in place.
+        _cm: The constraint engine (`ConstraintMap` or `BitboardMap`).
+        _strong (bool): Whether locked candidates and naked pairs are applied.
+        _eliminated (list[int]): Digit mask removed from each cell by the stronger rules.
+        _trail (list): Placed cells (int) and eliminations ((cell, previous mask)).
+    """
+
+    def __init__(self, puzzle: list[int], cm, *, strong: bool = False):
+        self._board = board_of(puzzle)
+        self._puzzle = puzzle
+        self._cm = cm
+        self._strong = strong
+        self._eliminated = [0] * self._board.sudoku_size
+        self._trail = []
+        if not strong:
+            # nothing is ever eliminated: skip the wrapper on the hottest call
+            self.candidates = cm.candidates
+
+    def candidates(self, index: int) -> int:
+        """
+        Return the mask of the digits still available for a cell (bit d-1 for digit d).
+        """
+        return self._cm.candidates(index) & ~self._eliminated[index]
+
+    def gen_digits(self, index: int):
+        """
+        Yield the digits still available for a cell, in ascending order.
+        """
+        return iter(self._board.mask_digits[self.candidates(index)])
+
+    def mark(self) -> int:
+        """
+        Return the current position of the trail, to be passed to `undo`.
+        """
+        return len(self._trail)
+
+    def undo(self, mark: int):
+        """
+        Undo every placement and elimination recorded after 'mark'.
+        """
+        trail = self._trail
+        puzzle = self._puzzle
+        cm = self._cm
+        while len(trail) > mark:
+            entry = trail.pop()
+            if type(entry) is int:
+                cm.update_neighbors(entry, puzzle[entry], remove=True)
+                puzzle[entry] = 0
+                cm.update_empty_cells(entry, add=True)
+            else:
+                self._eliminated[entry[0]] = entry[1]
+
+    def _place(self, idx: int, digit: int):
+        self._puzzle[idx] = digit
+        self._cm.update_empty_cells(idx)
+        self._cm.update_neighbors(idx, digit)
+        self._trail.append(idx)
+
+    def _eliminate(self, idx: int, mask: int) -> bool:
+        """
+        Remove the digits of 'mask' from the candidates of an empty cell.
+        Returns True if a candidate was actually removed.
+        """
+        if self._puzzle[idx] or not self.candidates(idx) & mask:
+            return False
+        self._trail.append((idx, self._eliminated[idx]))
+        self._eliminated[idx] |= mask
+        return True
+
+    def propagate(self, cell: int = -1) -> bool:
+        """
+        Apply the deduction rules until a fixpoint is reached.
+
+        Args:
+            cell (int, optional): The cell the caller just filled, the grid being
+                at a fixpoint before that placement. Only the cells and units the
+                placement affects are then examined for singles. Defaults to -1
+                (examine the whole grid).
+
+        Returns:
+            bool: False if a contradiction was found (a cell without
+            candidates or a digit without a place in a unit), True otherwise.
+        """
+        if cell >= 0:
+            if not self._propagate_from(cell):
+                return False
+            if not self._strong or not (self._locked_candidates() | self._naked_pairs()):
+                return True
+        while True:
+            changed = self._naked_singles()
+            if changed is None:
+                return False
+            hidden = self._hidden_singles()
+            if hidden is None:
+                return False
+            if changed or hidden:
+                continue
+            if not self._strong or not (self._locked_candidates() | self._naked_pairs()):
+                return True
+
+    def _naked_singles(self):
+        """
+        Place every cell with a single candidate.
+        Returns None on contradiction, otherwise whether something changed.
+        """
+        puzzle = self._puzzle
+        changed = False
+        for i in range(len(puzzle)):
+            if puzzle[i]:
+                continue
+            cand = self.candidates(i)
+            if not cand:
+                return None
+            if not cand & (cand - 1):
+                self._place(i, cand.bit_length())
+                changed = True
+        return changed
+
+    def _hidden_singles(self):
+        """
+        Place every digit that has a single possible cell in a unit.
+        Returns None on contradiction, otherwise whether something changed.
+        """
+        changed = False
+        for unit in self._board.units:
+            unit_changed = self._unit_singles(unit)
+            if unit_changed is None:
+                return None
+            changed |= unit_changed
+        return changed
+
+    def _unit_singles(self, unit: tuple[int, ...], pending: list = None):
+        """
+        Place every digit that has a single possible cell in 'unit', queueing
+        the placements on 'pending' (see `_place_tracked`) if given.
+        Returns None on contradiction, otherwise whether something changed.
+        """
+        puzzle = self._puzzle
+        changed = False
+        once = twice = placed = 0
+        for c in unit:
+            if puzzle[c]:
+                placed |= 1 << (puzzle[c] - 1)
+            else:
+                cand = self.candidates(c)
+                twice |= once & cand
+                once |= cand
+        if once | placed != self._board.digits_mask:
+            return None
+        hidden = once & ~twice
+        while hidden:
+            bit = hidden & -hidden
+            hidden ^= bit
+            for c in unit:
+                if not puzzle[c] and self.candidates(c) & bit:
+                    if pending is None:
+                        self._place(c, bit.bit_length())
+                    else:
+                        self._place_tracked(c, bit.bit_length(), pending)
+                    changed = True
+                    break
+        return changed
+
+    def _place_tracked(self, idx: int, digit: int, pending: list):
+        """
+        Place 'digit' at 'idx' and queue the cell with the empty neighbors that
+        lose the digit, so `_propagate_from` only revisits what changed.
+        """
+        puzzle = self._puzzle
+        candidates = self.candidates
+        bit = 1 << (digit - 1)
+        lost = [x for x in self._board.neighbors[idx] if not puzzle[x] and candidates(x) & bit]
+        self._place(idx, digit)
+        pending.append((idx, lost))
+
+    def _propagate_from(self, cell: int) -> bool:
+        """
+        Apply naked and hidden singles where the placement at 'cell', and the
+        placements it forces, can have created them: at the neighbors that lost
+        the placed digit, for every digit in the units of the cell, and for the
+        placed digit in the other units of those neighbors.
+        Returns False on contradiction.
+        """
+        board = self._board
+        puzzle = self._puzzle
+        candidates = self.candidates
+        units, units_of = board.units, board.units_of
+        # which neighbors of the caller's cell had its digit is no longer known
+        pending = [(cell, None)]
+        while pending:
+            c, lost = pending.pop()
+            own_units = units_of[c]
+            if lost is None:
+                lost = board.neighbors[c]
+                crossing = board.crossing_units[c]
+            else:
+                crossing = {u for x in lost for u in units_of[x] if u not in own_units}
+            for x in lost:
+                if not puzzle[x]:
+                    cand = candidates(x)
+                    if not cand:
+                        return False
+                    if not cand & (cand - 1):
+                        self._place_tracked(x, cand.bit_length(), pending)
+            for u in own_units:
+                if self._unit_singles(units[u], pending) is None:
+                    return False
+            digit = puzzle[c]
+            bit = 1 << (digit - 1)
+            for u in crossing:
+                place = -1
+                for x in units[u]:
+                    v = puzzle[x]
+                    if v:
+                        if v == digit:
+                            break
+                    elif candidates(x) & bit:
+                        if place >= 0:
+                            break
+                        place = x
+                else:
+                    if place < 0:
+                        return False
+                    self._place_tracked(place, digit, pending)
+        return True
+
+    def _locked_candidates(self) -> bool:
+        """
+        Apply pointing and claiming eliminations between boxes and lines.
+        Returns whether a candidate was removed.
+        """
+        board = self._board
+        n = board.box_length
+        changed = False
+        for segments in (board.row_segments, board.col_segments):
+            seg_masks = [[self._segment_mask(seg) for seg in line] for line in segments]
+            for line in range(board.sudoku_length):
+                band = line - line % n
+                for s in range(n):
+                    mask = seg_masks[line][s]
+                    if not mask:
+                        continue
+                    # claiming: the digit is confined to this box within the line
+                    others = 0
+                    for t in range(n):
+                        if t != s:
+                            others |= seg_masks[line][t]
+                    claimed = mask & ~others
+                    # pointing: the digit is confined to this line within the box
+                    others = 0
+                    for other in range(band, band + n):
+                        if other != line:
+                            others |= seg_masks[other][s]
+                    pointing = mask & ~others
+                    if claimed:
+                        for other in range(band, band + n):
+                            if other != line:
+                                for c in segments[other][s]:
+                                    changed |= self._eliminate(c, claimed)
+                    if pointing:
+                        for t in range(n):
+                            if t != s:
+                                for c in segments[line][t]:
+                                    changed |= self._eliminate(c, pointing)
+        return changed
+
+    def _segment_mask(self, segment: tuple[int, ...]) -> int:
+        mask = 0
+        for c in segment:
+            if not self._puzzle[c]:
+                mask |= self.candidates(c)
+        return mask
+
+    def _naked_pairs(self) -> bool:
+        """
+        Remove the digits of two cells sharing the same two candidates from
+        the rest of their unit. Returns whether a candidate was removed.
+        """
+        puzzle = self._puzzle
+        changed = False
+        for unit in self._board.units:
+            pairs = {}
+            for c in unit:
+                if puzzle[c]:
+                    continue
+                cand = self.candidates(c)
+                if cand.bit_count() != 2:
+                    continue
+                if cand in pairs:
+                    first = pairs[cand]
+                    for other in unit:
+                        if other != first and other != c:
+                            changed |= self._eliminate(other, cand)
+                else:
+                    pairs[cand] = c
+        return changed
@@ -0,0 +1,346 @@
+"""
+Streaming readers and writers for puzzle files.
+
+Supported formats:
+- "json": an object with a "puzzles" array, as in data/17_clue_puzzles.json
+  (readers can ask for another key, e.g. "solutions"; every other member is
+  skipped), or a bare top-level array. Items are 81-character strings or lists of 81 integers
+  (lists of N⁴ integers for N²×N² boards, which are also written as lists).
+- "lines": one 81-character puzzle per line, with "0" or "." for empty cells (9×9 only).
+
+Files ending in ".gz" or ".xz" are (de)compressed on the fly. Puzzles are read
+and written one at a time, so memory does not grow with the size of the file.
+"""
+
+import gzip
+import json
+import lzma
+import sys
+from typing import Iterable, Iterator, TextIO
+
+from src.constants import *
+from src.errors import *
+from src.board import board_of
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+
+
+def parse_puzzle(text: str) -> list[int]:
+    """
+    Parse an 81-character puzzle string.
+
+    Args:
+        text (str): Digits 1-9, with "0" or "." for empty cells.
+    Returns:
+        list[int]: Flat list of 81 integers, 0 for empty cells.
+    Raises:
+        PuzzleFormatError: If the string has the wrong length or characters.
+    """
+    if len(text) != SUDOKU_SIZE:
+        raise PuzzleFormatError(f"Expected {SUDOKU_SIZE} cells, got {len(text)}")
+    cells = text.replace(".", "0")
+    if not (cells.isascii() and cells.isdigit()):
+        raise PuzzleFormatError(f"Invalid puzzle string {text!r}")
+    return [c - 48 for c in cells.encode()]
+
+
+def parse_item(item) -> list[int]:
+    """
+    Parse a puzzle decoded from JSON.
+
+    Args:
+        item: An 81-character string, or a list of N⁴ integers (0 for empty
+            cells, digits 1 to N²) for an N²×N² board.
+    Returns:
+        list[int]: Flat list of integers, 0 for empty cells.
+    Raises:
+        PuzzleFormatError: If the item is neither, has the wrong size or holds
+            values out of range.
+    """
+    if isinstance(item, str):
+        return parse_puzzle(item)
+    if not isinstance(item, list):
+        raise PuzzleFormatError(f"Invalid puzzle item {item!r}")
+    length = board_of(item).sudoku_length
+    try:
+        puzzle = [int(v) for v in item]
+    except (TypeError, ValueError):
+        raise PuzzleFormatError(f"Invalid puzzle item {item!r}") from None
+    if not all(0 <= v <= length for v in puzzle):
+        raise PuzzleFormatError(f"Cell values must be between 0 and {length}")
+    return puzzle
+
+
+def format_puzzle(puzzle: list[int]) -> str:
+    """
+    Return the 81-character string of a puzzle, with "0" for empty cells.
+
+    Raises:
+        PuzzleFormatError: If the puzzle is not a 9×9 grid.
+    """
+    if len(puzzle) != SUDOKU_SIZE:
+        raise PuzzleFormatError(f"Only 9×9 grids have a string form, got {len(puzzle)} cells")
+    return "".join(map(str, puzzle))
+
+
+def _compression(name: str) -> str:
+    if name.endswith(".gz"):
+        return "gz"
+    if name.endswith(".xz"):
+        return "xz"
+    return ""
+
+
+def _detect_format(name: str) -> str:
+    for suffix in (".gz", ".xz"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return "json" if name.endswith(".json") else "lines"
+
+
+def open_text(path, mode: str = "r") -> TextIO:
+    """
+    Open a puzzle file for reading ("r") or writing ("w") in text mode.
+
+    "-" stands for standard input or output. Files ending in ".gz" or ".xz"
+    are (de)compressed on the fly.
+    """
+    name = str(path)
+    if name == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    compression = _compression(name)
+    if compression == "gz":
+        return gzip.open(name, mode + "t", encoding="utf-8")
+    if compression == "xz":
+        return lzma.open(name, mode + "t", encoding="utf-8")
+    return open(name, mode, encoding="utf-8")
+
+
+def read_puzzles(source, fmt: str = None, *, key: str = "puzzles") -> Iterator[list[int]]:
+    """
+    Lazily read puzzles from a file.
+
+    Args:
+        source: A path, "-" for standard input, or an open text file.
+        fmt (str, optional): "json" or "lines". Detected from the file name when
+            omitted, or from the first character for open files.
+        key (str, optional): Name of the array read from a JSON object; the other
+            members are skipped. Defaults to "puzzles".
+    Yields:
+        list[int]: Each puzzle as a flat list of 81 integers.
+    Raises:
+        PuzzleFormatError: If the file is malformed.
+    """
+    if hasattr(source, "read"):
+        yield from _read_stream(source, fmt, key)
+        return
+    if fmt is None and str(source) != "-":
+        fmt = _detect_format(str(source))
+    f = open_text(source)
+    try:
+        yield from _read_stream(f, fmt, key)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _read_stream(f: TextIO, fmt: str = None, key: str = "puzzles") -> Iterator[list[int]]:
+    if fmt is None:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        fmt = "json" if first and first in "{[" else "lines"
+        head = first
+    else:
+        head = ""
+    if fmt == "json":
+        yield from _JsonPuzzleStream(f, head, key)
+    elif fmt == "lines":
+        yield from _read_lines(f, head)
+    else:
+        raise ValueError(f"Unknown puzzle format {fmt!r}")
+
+
+def _read_lines(f: TextIO, head: str = "") -> Iterator[list[int]]:
+    first = True
+    for line in f:
+        if first:
+            line = head + line
+            first = False
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        yield parse_puzzle(line.split(None, 1)[0].split(",", 1)[0])
+    if first and head.strip():
+        yield parse_puzzle(head.strip())
+
+
+class _JsonPuzzleStream:
+    """
+    Incremental reader for one grid array of a JSON document.
+
+    Only the current array item is decoded at a time; the buffer holds at most
+    one read chunk plus the item being decoded.
+    """
+
+    def __init__(self, f: TextIO, head: str = "", key: str = "puzzles"):
+        self._f = f
+        self._key = key
+        self._buf = head
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end of the file)."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        c = self._peek()
+        if not c or c not in chars:
+            raise PuzzleFormatError(f"Expected one of {chars!r}, got {c!r}")
+        self._pos += 1
+        return c
+
+    def _value(self):
+        """Decode the next JSON value, reading more of the file as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+                # a number at the end of the buffer may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise PuzzleFormatError(f"Malformed JSON: {error}") from None
+            self._fill()
+
+    def __iter__(self) -> Iterator[list[int]]:
+        c = self._expect("{[")
+        if c == "{":
+            if self._peek() == "}":
+                return
+            while True:
+                key = self._value()
+                self._expect(":")
+                if key == self._key:
+                    self._expect("[")
+                    yield from self._array()
+                else:
+                    self._value()
+                if self._expect(",}") == "}":
+                    return
+        yield from self._array()
+
+    def _array(self) -> Iterator[list[int]]:
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield parse_item(self._value())
+            if self._expect(",]") == "]":
+                return
+
+
+class PuzzleWriter:
+    """
+    Streaming writer for grids (puzzles or solutions).
+
+    Grids are written one at a time as 81-character strings, either one per
+    line or as the items of a JSON array under 'key'; larger boards can only be
+    written to JSON, as arrays of integers. Use as a context manager so the
+    JSON document is closed properly.
+    """
+
+    def __init__(self, dest, fmt: str = None, *, key: str = "solutions"):
+        """
+        Args:
+            dest: A path, "-" for standard output, or an open text file.
+            fmt (str, optional): "json" or "lines". Detected from the file name
+                when omitted, "lines" for open files and standard output.
+            key (str, optional): Name of the JSON array. Defaults to "solutions".
+        """
+        if hasattr(dest, "write"):
+            self._f = dest
+            self._owned = False
+            fmt = fmt or "lines"
+        else:
+            fmt = fmt or ("lines" if str(dest) == "-" else _detect_format(str(dest)))
+            self._f = open_text(dest, "w")
+            self._owned = self._f is not sys.stdout
+        if fmt not in ("json", "lines"):
+            raise ValueError(f"Unknown puzzle format {fmt!r}")
+        self._fmt = fmt
+        self._count = 0
+        if fmt == "json":
+            self._f.write(f'{{\n  "{key}": [')
+
+    def write(self, grid: list[int]):
+        """Write one grid."""
+        if self._fmt == "json":
+            item = f'"{format_puzzle(grid)}"' if len(grid) == SUDOKU_SIZE else json.dumps(list(grid))
+            self._f.write(f'{"," if self._count else ""}\n    {item}')
+        else:
+            self._f.write(format_puzzle(grid) + "\n")
+        self._count += 1
+
+    def write_all(self, grids: Iterable[list[int]]):
+        """Write every grid of an iterable."""
+        for grid in grids:
+            self.write(grid)
+
+    def close(self):
+        """Terminate the document and close the file if it was opened here."""
+        if self._f is None:
+            return
+        if self._fmt == "json":
+            self._f.write("\n  ]\n}\n")
+        if self._owned:
+            self._f.close()
+        else:
+            self._f.flush()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_puzzles(dest, grids: Iterable[list[int]], fmt: str = None, *, key: str = "solutions") -> int:
+    """
+    Write grids to a file as they are produced.
+
+    Returns:
+        int: The number of grids written.
+    """
+    count = 0
+    with PuzzleWriter(dest, fmt, key=key) as writer:
+        for grid in grids:
+            writer.write(grid)
+            count += 1
+    return count
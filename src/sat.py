@@ -0,0 +1,529 @@
+"""
+SAT encoding of Sudoku, DIMACS export, and a small CDCL solver.
+
+Variable `cell * N² + digit` (1-based, as in DIMACS) is true when 'digit' is
+in 'cell'. The encoding is the extended one: every cell holds at least one
+and at most one digit, and every unit holds each digit at least once and at
+most once. With 'reduce' (the default) the givens are applied beforehand:
+given cells and digits ruled out by a given peer get no variable, and the
+clauses they would satisfy are dropped. Both forms have the same solutions,
+and `decode` reads a model of either.
+
+`CDCL` is a conflict-driven clause-learning solver: two watched literals per
+clause (binary clauses, most of the encoding, get their own implication
+lists), first-UIP learning with clause minimization, VSIDS branching with
+phase saving, Luby restarts and LBD-based deletion of learned clauses.
+Unlike chronological backtracking it jumps back over the decisions a
+conflict does not depend on, and never repeats a learned conflict, which is
+what keeps large boards and pathological puzzles tractable. `solve` lists
+solutions with blocking clauses: each solution found is excluded by a clause
+before the next call.
+
+Usage:
+    python -m src.sat PUZZLE_FILE [--index N] [--full] [--output FILE]
+"""
+
+import heapq
+import sys
+
+from src.errors import *
+from src.board import Board, board_of
+from src import utils
+
+
+def variable(cell: int, digit: int, board: Board) -> int:
+    """Return the DIMACS variable of 'digit' (1-based) in 'cell'."""
+    return cell * board.sudoku_length + digit
+
+
+def _at_most_one(lits: list[int], clauses: list[list[int]]):
+    for i, a in enumerate(lits):
+        for b in lits[i + 1:]:
+            clauses.append([-a, -b])
+
+
+def encode(puzzle: list[int], *, reduce: bool = True) -> tuple[int, list[list[int]]]:
+    """
+    Encode a puzzle as CNF.
+
+    Args:
+        puzzle (list[int]): The grid, 0 for empty cells (N⁴ cells for an N²×N² board).
+        reduce (bool, optional): Apply the givens to the encoding instead of
+            adding them as unit clauses. Defaults to True.
+    Returns:
+        tuple[int, list[list[int]]]: The number of variables and the clauses,
+        as lists of DIMACS literals.
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+        PuzzleFormatError: If the puzzle length is not N⁴ for a box length N in 2–5.
+    """
+    board = board_of(puzzle)
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    length = board.sudoku_length
+    digits = range(1, length + 1)
+    if reduce:
+        taken = [0] * len(puzzle)
+        for cell, val in enumerate(puzzle):
+            if val:
+                for n in board.neighbors[cell]:
+                    taken[n] |= 1 << (val - 1)
+        allowed = [() if val else tuple(d for d in digits if not taken[cell] >> (d - 1) & 1)
+                   for cell, val in enumerate(puzzle)]
+    else:
+        allowed = [digits] * len(puzzle)
+    clauses = []
+    for cell, cell_digits in enumerate(allowed):
+        if not puzzle[cell] or not reduce:
+            lits = [variable(cell, d, board) for d in cell_digits]
+            clauses.append(lits)
+            _at_most_one(lits, clauses)
+        if puzzle[cell] and not reduce:
+            clauses.append([variable(cell, puzzle[cell], board)])
+    for unit in board.units:
+        placed = {puzzle[cell] for cell in unit} if reduce else ()
+        for d in digits:
+            if d in placed:
+                continue
+            lits = [variable(cell, d, board) for cell in unit if d in allowed[cell]]
+            clauses.append(lits)
+            _at_most_one(lits, clauses)
+    return board.sudoku_size * length, clauses
+
+
+def dimacs(puzzle: list[int], *, reduce: bool = True) -> str:
+    """
+    Return the CNF of a puzzle in DIMACS format, for external SAT solvers.
+
+    The models they print are read back with `parse_model` and `decode`.
+    """
+    from src import puzzle_io
+
+    num_vars, clauses = encode(puzzle, reduce=reduce)
+    lines = [f"c sudoku {puzzle_io.format_puzzle(puzzle) if len(puzzle) == 81 else len(puzzle)}",
+             "c variable cell*N^2+digit is true when digit is in cell",
+             f"p cnf {num_vars} {len(clauses)}"]
+    lines += [" ".join(map(str, clause)) + " 0" for clause in clauses]
+    return "\n".join(lines) + "\n"
+
+
+def parse_model(text: str) -> set[int]:
+    """Return the true variables of a model printed by a SAT solver ("v" lines, or bare literals)."""
+    true = set()
+    for line in text.splitlines():
+        if line.startswith("v "):
+            line = line[2:]
+        elif line[:1] not in "-0123456789" or not line:
+            continue
+        true.update(lit for lit in map(int, line.split()) if lit > 0)
+    return true
+
+
+def decode(puzzle: list[int], true: set[int]) -> list[int]:
+    """
+    Return the solution of 'puzzle' given by the true variables of a model.
+
+    Variables a reduced encoding leaves out are ignored, whatever value the
+    solver gave them.
+
+    Raises:
+        ValueError: If the model puts no digit in an empty cell.
+    """
+    board = board_of(puzzle)
+    grid = list(puzzle)
+    for cell, val in enumerate(puzzle):
+        if val:
+            continue
+        peers = {puzzle[n] for n in board.neighbors[cell]}
+        for d in range(1, board.sudoku_length + 1):
+            if d not in peers and variable(cell, d, board) in true:
+                grid[cell] = d
+                break
+        else:
+            raise ValueError(f"The model puts no digit in cell {cell}")
+    return grid
+
+
+def _luby(i: int) -> int:
+    """Return the i-th term (from 0) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i %= size
+    return 1 << seq
+
+
+class CDCL:
+    """
+    Conflict-driven clause-learning SAT solver.
+
+    Literals are DIMACS integers at the interface. Internally literal 'x' is
+    `2 * abs(x) + (x < 0)`, so negation is `lit ^ 1` and the variable is `lit >> 1`.
+
+    Attributes:
+        num_vars (int): Number of variables.
+        conflicts, decisions, propagations (int): Search counters, over all calls to `solve`.
+    """
+
+    RESTART_BASE = 100  # conflicts of the first restart interval
+    DECAY = 0.95        # VSIDS activity decay per conflict
+
+    def __init__(self, num_vars: int, clauses=()):
+        self.num_vars = num_vars
+        size = 2 * num_vars + 2
+        self._value = [0] * size            # per literal: 1 true, -1 false, 0 unassigned
+        self._level = [0] * (num_vars + 1)
+        self._reason = [-1] * (num_vars + 1)  # clause index, -1 for decisions and units
+        self._phase = [0] * (num_vars + 1)    # saved polarity: 0 positive, 1 negative
+        self._seen = [False] * (num_vars + 1)
+        self._trail = []
+        self._limits = []                    # trail length at each decision
+        self._qhead = 0
+        self._clauses = []                   # literal lists, None once deleted
+        self._watches = [[] for _ in range(size)]   # long clauses watching a literal
+        self._binary = [[] for _ in range(size)]    # (other literal, clause) implied when a literal is false
+        self._learnt = {}                    # index of each long learned clause -> LBD
+        self._activity = [0.0] * (num_vars + 1)
+        self._increment = 1.0
+        self._used = [False] * (num_vars + 1)
+        self._heap = []                      # (-activity, variable), with stale entries
+        self._queued = [False] * (num_vars + 1)   # the heap holds an up-to-date entry
+        self._ok = True
+        self._max_learnt = 0
+        self.conflicts = self.decisions = self.propagations = 0
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause) -> bool:
+        """
+        Add a clause of DIMACS literals, backtracking to the root first.
+
+        Returns:
+            bool: False if the formula is now known to be unsatisfiable.
+        """
+        self._backtrack(0)
+        if not self._ok:
+            return False
+        value = self._value
+        lits = []
+        for x in clause:
+            lit = 2 * abs(x) + (x < 0)
+            if value[lit] == 1 or lit ^ 1 in lits:
+                return True
+            if value[lit] == 0 and lit not in lits:
+                lits.append(lit)
+        for lit in lits:
+            var = lit >> 1
+            if not self._used[var]:
+                self._used[var] = self._queued[var] = True
+                heapq.heappush(self._heap, (-self._activity[var], var))
+        if not lits:
+            self._ok = False
+        elif len(lits) == 1:
+            self._assign(lits[0], -1)
+            self._ok = self._propagate() == -1
+        else:
+            self._attach(lits)
+        return self._ok
+
+    def _attach(self, lits: list[int]) -> int:
+        index = len(self._clauses)
+        self._clauses.append(lits)
+        if len(lits) == 2:
+            a, b = lits
+            self._binary[a].append((b, index))
+            self._binary[b].append((a, index))
+        else:
+            self._watches[lits[0]].append(index)
+            self._watches[lits[1]].append(index)
+        return index
+
+    def _assign(self, lit: int, reason: int):
+        self._value[lit] = 1
+        self._value[lit ^ 1] = -1
+        var = lit >> 1
+        self._level[var] = len(self._limits)
+        self._reason[var] = reason
+        self._trail.append(lit)
+
+    def _propagate(self) -> int:
+        """Propagate the trail. Return the index of a conflicting clause, or -1."""
+        value, trail, clauses = self._value, self._trail, self._clauses
+        watches, binary = self._watches, self._binary
+        level, reason = self._level, self._reason
+        depth = len(self._limits)
+        qhead = self._qhead
+        while qhead < len(trail):
+            false = trail[qhead] ^ 1
+            qhead += 1
+            for other, index in binary[false]:
+                v = value[other]
+                if v == -1:
+                    self.propagations += qhead - self._qhead
+                    self._qhead = len(trail)
+                    return index
+                if v == 0:
+                    value[other] = 1
+                    value[other ^ 1] = -1
+                    level[other >> 1] = depth
+                    reason[other >> 1] = index
+                    trail.append(other)
+            ws = watches[false]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                index = ws[i]
+                i += 1
+                c = clauses[index]
+                if c is None:
+                    continue
+                if c[0] == false:
+                    c[0], c[1] = c[1], false
+                first = c[0]
+                if value[first] == 1:
+                    ws[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    if value[c[k]] != -1:
+                        c[1], c[k] = c[k], false
+                        watches[c[1]].append(index)
+                        break
+                else:
+                    ws[j] = index
+                    j += 1
+                    if value[first] == -1:
+                        ws[j:] = ws[i:end]
+                        del ws[j + end - i:]
+                        self.propagations += qhead - self._qhead
+                        self._qhead = len(trail)
+                        return index
+                    value[first] = 1
+                    value[first ^ 1] = -1
+                    level[first >> 1] = depth
+                    reason[first >> 1] = index
+                    trail.append(first)
+            del ws[j:]
+        self.propagations += qhead - self._qhead
+        self._qhead = qhead
+        return -1
+
+    def _bump(self, var: int):
+        activity = self._activity
+        activity[var] += self._increment
+        if activity[var] > 1e100:
+            for v in range(1, self.num_vars + 1):
+                activity[v] *= 1e-100
+            self._increment *= 1e-100
+            self._heap = [(-activity[v], v) for v in range(1, self.num_vars + 1) if self._used[v]]
+            heapq.heapify(self._heap)
+            self._queued = list(self._used)
+        else:
+            heapq.heappush(self._heap, (-activity[var], var))
+            self._queued[var] = True
+
+    def _analyze(self, index: int) -> tuple[list[int], int]:
+        """
+        Derive the first-UIP clause of a conflict.
+
+        Returns:
+            tuple[list[int], int]: The learned clause, asserting literal first,
+            and the level to backtrack to.
+        """
+        clauses, trail, level, reason, seen = self._clauses, self._trail, self._level, self._reason, self._seen
+        depth = len(self._limits)
+        learnt = [0]
+        pending = 0
+        var = -1
+        pos = len(trail) - 1
+        while True:
+            for q in clauses[index]:
+                v = q >> 1
+                if v == var or seen[v] or not level[v]:
+                    continue
+                seen[v] = True
+                self._bump(v)
+                if level[v] == depth:
+                    pending += 1
+                else:
+                    learnt.append(q)
+            while not seen[trail[pos] >> 1]:
+                pos -= 1
+            lit = trail[pos]
+            pos -= 1
+            var = lit >> 1
+            seen[var] = False
+            pending -= 1
+            if not pending:
+                break
+            index = reason[var]
+        learnt[0] = lit ^ 1
+        # drop literals implied by the others (their reason only holds seen or root literals)
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            r = reason[q >> 1]
+            if r == -1 or any(not seen[p >> 1] and level[p >> 1] for p in clauses[r] if p >> 1 != q >> 1):
+                kept.append(q)
+        for q in learnt[1:]:
+            seen[q >> 1] = False
+        back = 0
+        if len(kept) > 1:
+            best = max(range(1, len(kept)), key=lambda k: level[kept[k] >> 1])
+            kept[1], kept[best] = kept[best], kept[1]
+            back = level[kept[1] >> 1]
+        return kept, back
+
+    def _backtrack(self, depth: int):
+        if len(self._limits) <= depth:
+            return
+        value, trail, phase, activity, heap = self._value, self._trail, self._phase, self._activity, self._heap
+        queued = self._queued
+        start = self._limits[depth]
+        for lit in trail[start:]:
+            value[lit] = value[lit ^ 1] = 0
+            var = lit >> 1
+            phase[var] = lit & 1
+            if not queued[var]:
+                queued[var] = True
+                heapq.heappush(heap, (-activity[var], var))
+        del trail[start:]
+        del self._limits[depth:]
+        self._qhead = start
+
+    def _decide(self) -> int:
+        """Return the unassigned variable of highest activity, 0 if all are assigned."""
+        heap, value, activity, queued = self._heap, self._value, self._activity, self._queued
+        while heap:
+            act, var = heapq.heappop(heap)
+            if -act != activity[var]:
+                continue
+            # assigned variables are queued again when unassigned
+            queued[var] = False
+            if not value[2 * var]:
+                return var
+        return 0
+
+    def _reduce(self):
+        """At the root, delete the worse half of the learned clauses with an LBD above 2."""
+        learnt = self._learnt
+        candidates = sorted((lbd, index) for index, lbd in learnt.items() if lbd > 2)
+        for _, index in candidates[len(candidates) // 2:]:
+            self._clauses[index] = None
+            del learnt[index]
+        self._max_learnt = int(self._max_learnt * 1.1)
+
+    def solve(self) -> bool:
+        """
+        Search for a model of the clauses.
+
+        Returns:
+            bool: True if one was found (read it with `model`), False if the
+            clauses are unsatisfiable.
+        """
+        if not self._ok:
+            return False
+        if not self._max_learnt:
+            self._max_learnt = max(len(self._clauses) // 3, 1000)
+        level, trail, depth_conflicts = self._level, self._trail, 0
+        restarts = 0
+        budget = self.RESTART_BASE * _luby(restarts)
+        while True:
+            index = self._propagate()
+            if index != -1:
+                self.conflicts += 1
+                if not self._limits:
+                    self._ok = False
+                    return False
+                learnt, back = self._analyze(index)
+                self._backtrack(back)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], -1)
+                else:
+                    index = self._attach(learnt)
+                    if len(learnt) > 2:
+                        self._learnt[index] = len({level[lit >> 1] for lit in learnt})
+                    self._assign(learnt[0], index)
+                self._increment /= self.DECAY
+                depth_conflicts += 1
+                if depth_conflicts >= budget:
+                    self._backtrack(0)
+                    restarts += 1
+                    depth_conflicts = 0
+                    budget = self.RESTART_BASE * _luby(restarts)
+                    if len(self._learnt) > self._max_learnt:
+                        self._reduce()
+                continue
+            var = self._decide()
+            if not var:
+                return True
+            self.decisions += 1
+            self._limits.append(len(trail))
+            self._assign(2 * var + self._phase[var], -1)
+
+    def model(self) -> set[int]:
+        """Return the true variables of the model found by the last successful `solve`."""
+        value = self._value
+        return {var for var in range(1, self.num_vars + 1) if value[2 * var] == 1}
+
+
+def solve(puzzle: list[int], limit: int = 2) -> list[list[int]]:
+    """
+    Solve a Sudoku puzzle with the CDCL solver.
+
+    Args:
+        puzzle (list[int]): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5). Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find, None for all. Defaults to 2.
+    Returns:
+        list[list[int]]: Up to 'limit' distinct solutions. After each one a
+        blocking clause excluding it is added and the search resumes, keeping
+        what it has learned.
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+    """
+    board = board_of(puzzle)
+    num_vars, clauses = encode(puzzle)
+    solver = CDCL(num_vars, clauses)
+    empty = [cell for cell, val in enumerate(puzzle) if not val]
+    solutions = []
+    while (limit is None or len(solutions) < limit) and solver.solve():
+        grid = decode(puzzle, solver.model())
+        solutions.append(grid)
+        solver.add_clause([-variable(cell, grid[cell], board) for cell in empty])
+    return solutions
+
+
+def main(argv: list[str] = None) -> int:
+    # only the command line needs these, so importing the solver stays cheap
+    import argparse
+    from src import puzzle_io
+
+    parser = argparse.ArgumentParser(description="Write the CNF of a puzzle in DIMACS format.")
+    parser.add_argument("input", help="Puzzle file, in any format read by src.puzzle_io.")
+    parser.add_argument("--index", type=int, default=0, help="Index of the puzzle in the file (default 0).")
+    parser.add_argument("--full", action="store_true", help="Keep every variable and add the givens as unit clauses.")
+    parser.add_argument("--output", default="-", help="Output file (default: standard output).")
+    args = parser.parse_args(argv)
+    for i, puzzle in enumerate(puzzle_io.read_puzzles(args.input)):
+        if i == args.index:
+            break
+    else:
+        parser.error(f"{args.input} has no puzzle at index {args.index}")
+    try:
+        text = dimacs(puzzle, reduce=not args.full)
+    except InvalidSudokuError:
+        parser.error(f"puzzle {args.index} has conflicting givens")
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w", encoding="ascii") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,474 @@
+"""
+Asyncio solving service with a local HTTP/JSON endpoint.
+
+Endpoints (HTTP/1.1 with keep-alive):
+    POST /solve    {"puzzle": P} or {"puzzles": [P, ...]}, with optional "limit",
+                   "timeout" (seconds per puzzle) and "max_nodes". P is an
+                   81-character string or a list of N⁴ integers. A single puzzle is
+                   answered with {"solutions": [...], "status": ...}, a batch with
+                   {"results": [...]} holding one such object per puzzle, plus
+                   "error" for a puzzle that could not be solved.
+    GET /health    {"status": "ok", ...}, or 503 with "status": "restarting"
+                   while a dead worker process is being replaced.
+    GET /metrics   Request, batch and queue counters as JSON.
+
+The event loop only parses, queues and answers requests; every solve runs in
+a process pool. Puzzles of concurrent requests are grouped into micro-batches
+of up to `max_batch` puzzles, each sent to a worker as one task. Pending
+puzzles wait in a bounded queue and at most two batches per worker are in
+flight; a request that does not fit in the queue is refused with 503, so a
+burst never grows memory without bound. A worker process that dies breaks
+the whole pool: the puzzles it was running are answered with 503 and the pool
+is replaced before the next batch.
+
+Usage:
+    python -m src.server [--host 127.0.0.1] [--port 8080] [--workers N] [--max-batch 32]
+                         [--max-delay 0.002] [--max-queue 4096] [--timeout 10]
+                         [--engine {bitboard,constraint,core}] [--no-propagate] [--strong]
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+
+from src import sudoku_solver
+from src import puzzle_io
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+from src.solverCore import SolverCore
+from src.errors import *
+
+ENGINES = {"bitboard": BitboardMap, "constraint": ConstraintMap, "core": SolverCore}
+
+# Request latencies kept for the percentiles of /metrics.
+LATENCY_WINDOW = 1024
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _solve_batch(jobs: list[tuple], options: dict) -> list[tuple]:
+    """
+    Solve a micro-batch inside a worker.
+
+    Args:
+        jobs (list[tuple]): (puzzle, limit, timeout, max_nodes) of each puzzle.
+        options (dict): Keyword arguments for `sudoku_solver.bounded_solver`.
+    Returns:
+        list[tuple]: (solutions, status, error message or None) of each puzzle.
+    """
+    results = []
+    for puzzle, limit, timeout, max_nodes in jobs:
+        try:
+            result = sudoku_solver.bounded_solver(puzzle, limit, timeout=timeout, max_nodes=max_nodes, **options)
+        except InvalidSudokuError:
+            results.append(([], None, "The givens conflict"))
+        except Exception as error:
+            results.append(([], None, f"{type(error).__name__}: {error}"))
+        else:
+            results.append((result.solutions, result.status, None))
+    return results
+
+
+class _HttpError(Exception):
+    """An HTTP error answer, raised while handling a request."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SolverServer:
+    """
+    HTTP/JSON solving service running on the current event loop.
+
+    Attributes:
+        host (str): Address the server listens on.
+        port (int): Port the server listens on (the actual port once started with port 0).
+        workers (int): Number of worker processes.
+        max_batch (int): Largest number of puzzles sent to a worker at once.
+        max_delay (float): Seconds a micro-batch waits for more puzzles before being sent.
+        max_queue (int): Largest number of puzzles waiting for a worker.
+        max_body (int): Largest request body in bytes.
+        timeout (float | None): Time budget of each puzzle; requests may only lower it.
+        max_nodes (int | None): Node budget of each puzzle; requests may only lower it.
+        max_limit (int): Largest number of solutions a request may ask for.
+        options (dict): Keyword arguments passed on to `sudoku_solver.bounded_solver`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, *, workers: int = None, max_batch: int = 32,
+                 max_delay: float = 0.002, max_queue: int = 4096, max_body: int = 1 << 24,
+                 timeout: float = 10.0, max_nodes: int = None, max_limit: int = 100, **options):
+        self.host = host
+        self.port = port
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.max_body = max_body
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.max_limit = max_limit
+        self.options = options
+        self._executor = None
+        self._server = None
+        self._batcher = None
+        self._queue = None
+        self._slots = None
+        self._tasks = set()
+        self._started = None
+        self._counters = collections.Counter()
+        self._responses = collections.Counter()
+        self._statuses = collections.Counter()
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self):
+        """Start the worker processes and listen for connections."""
+        self._executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(2 * self.workers)
+        self._batcher = asyncio.create_task(self._dispatch())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening, cancel pending work and shut the worker processes down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(self._batcher, *self._tasks, return_exceptions=True)
+            self._batcher = None
+            while not self._queue.empty():
+                self._queue.get_nowait()[-1].cancel()
+        if self._executor is not None:
+            # waiting for running solves must not block the loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, functools.partial(self._executor.shutdown, cancel_futures=True))
+            self._executor = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def metrics(self) -> dict:
+        """
+        Return the service counters.
+
+        Returns:
+            dict: Requests and responses by HTTP status, puzzles by search status,
+            batches and their mean size, rejected requests, the current queue depth
+            and batches in flight, and request latency percentiles in seconds.
+        """
+        counters = self._counters
+        latencies = sorted(self._latencies)
+        percentiles = {}
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            percentiles = {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+        elif latencies:
+            percentiles = {"p50": latencies[0], "p95": latencies[0], "p99": latencies[0]}
+        return {
+            "uptime": time.monotonic() - self._started if self._started else 0.0,
+            "workers": self.workers,
+            "requests": counters["requests"],
+            "responses": {str(code): n for code, n in sorted(self._responses.items())},
+            "puzzles": counters["puzzles"],
+            "statuses": dict(self._statuses),
+            "errors": counters["errors"],
+            "rejected": counters["rejected"],
+            "batches": counters["batches"],
+            "mean_batch_size": counters["batched"] / counters["batches"] if counters["batches"] else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue": self.max_queue,
+            "in_flight_batches": len(self._tasks),
+            "pool_restarts": counters["pool_restarts"],
+            "latency": percentiles,
+        }
+
+    async def _dispatch(self):
+        """Group queued puzzles into micro-batches and hand them to the workers."""
+        queue = self._queue
+        while True:
+            # while every worker is busy, puzzles pile up and make fuller batches
+            await self._slots.acquire()
+            batch = [await queue.get()]
+            if self.max_delay and queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            # puzzles of cancelled requests are dropped
+            batch = [job for job in batch if not job[-1].done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _renew_pool(self, executor: concurrent.futures.ProcessPoolExecutor):
+        """Replace a process pool that raised BrokenProcessPool, unless that was already done."""
+        if executor is self._executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+            self._counters["pool_restarts"] += 1
+
+    def _submit(self, fn, *args) -> tuple[concurrent.futures.Future, concurrent.futures.ProcessPoolExecutor]:
+        """Submit a task, replacing the pool first if a worker died since the last task."""
+        try:
+            return self._executor.submit(fn, *args), self._executor
+        except concurrent.futures.BrokenExecutor:
+            self._renew_pool(self._executor)
+            return self._executor.submit(fn, *args), self._executor
+
+    async def _run_batch(self, batch: list[tuple]):
+        try:
+            self._counters["batches"] += 1
+            self._counters["batched"] += len(batch)
+            jobs = [job[:-1] for job in batch]
+            executor = self._executor
+            try:
+                future, executor = self._submit(_solve_batch, jobs, self.options)
+                results = await asyncio.wrap_future(future)
+            except Exception as error:
+                if isinstance(error, concurrent.futures.BrokenExecutor):
+                    self._renew_pool(executor)
+                    error = _HttpError(503, "A worker process died, retry later")
+                else:
+                    error = _HttpError(500, f"{type(error).__name__}: {error}")
+                for job in batch:
+                    if not job[-1].done():
+                        job[-1].set_exception(error)
+                return
+            for job, result in zip(batch, results):
+                if not job[-1].done():
+                    job[-1].set_result(result)
+        finally:
+            # only left pending when the server is closing
+            for job in batch:
+                job[-1].cancel()
+            self._slots.release()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve the requests of one connection."""
+        try:
+            while True:
+                request = None
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    self._counters["requests"] += 1
+                    start = time.perf_counter()
+                    status, payload = await self._route(method, path, body)
+                    self._latencies.append(time.perf_counter() - start)
+                except _HttpError as error:
+                    status, payload = error.status, {"error": str(error)}
+                # after a request that could not be read, the stream position is unknown
+                keep_alive = request is not None and request[2].get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """
+        Read one request.
+
+        Returns:
+            tuple | None: (method, path, headers, body), or None at the end of the connection.
+        Raises:
+            _HttpError: If the request is malformed or its body too large.
+        """
+        try:
+            line = await reader.readline()
+            if not line:
+                return None
+            parts = line.decode("latin-1").split()
+            if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+                raise _HttpError(400, "Malformed request line")
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n"):
+                    break
+                if not line:
+                    raise asyncio.IncompleteReadError(b"", None)
+                name, sep, value = line.decode("latin-1").partition(":")
+                if not sep or len(headers) >= 100:
+                    raise _HttpError(400, "Malformed headers")
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise _HttpError(400, "Request line or header too long") from None
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HttpError(400, "Invalid Content-Length") from None
+        if length < 0:
+            raise _HttpError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            raise _HttpError(413, f"Request body is larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1], headers, body
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool):
+        self._responses[status] += 1
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        head = [f"HTTP/1.1 {status} {_REASONS[status]}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(body)}",
+                "Connection: " + ("keep-alive" if keep_alive else "close")]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        path = path.split("?", 1)[0]
+        if path == "/solve":
+            if method != "POST":
+                raise _HttpError(405, "Use POST for /solve")
+            return 200, await self._solve(body)
+        if path == "/health":
+            if method != "GET":
+                raise _HttpError(405, "Use GET for /health")
+            health = {"status": "ok", "workers": self.workers, "queue_depth": self._queue.qsize(),
+                      "pool_restarts": self._counters["pool_restarts"]}
+            try:
+                # a no-op task: submitting fails once a worker process has died
+                self._executor.submit(int)
+            except concurrent.futures.BrokenExecutor:
+                self._renew_pool(self._executor)
+                return 503, dict(health, status="restarting")
+            return 200, health
+        if path == "/metrics":
+            if method != "GET":
+                raise _HttpError(405, "Use GET for /metrics")
+            return 200, self.metrics()
+        raise _HttpError(404, f"No endpoint {path}")
+
+    async def _solve(self, body: bytes) -> dict:
+        """Queue the puzzles of a /solve request and wait for their results."""
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise _HttpError(400, f"Malformed JSON: {error}") from None
+        if not isinstance(request, dict) or ("puzzle" in request) == ("puzzles" in request):
+            raise _HttpError(400, 'Expected an object with a "puzzle" or a "puzzles" member')
+        single = "puzzle" in request
+        items = [request["puzzle"]] if single else request["puzzles"]
+        if not isinstance(items, list):
+            raise _HttpError(400, '"puzzles" must be an array')
+        limit = self._option(request, "limit", 2, self.max_limit, int)
+        if limit < 1:
+            raise _HttpError(400, '"limit" must be at least 1')
+        timeout = self._option(request, "timeout", self.timeout, self.timeout, (int, float))
+        max_nodes = self._option(request, "max_nodes", self.max_nodes, self.max_nodes, int)
+        try:
+            puzzles = [puzzle_io.parse_item(item) for item in items]
+        except PuzzleFormatError as error:
+            self._counters["errors"] += 1
+            raise _HttpError(400, str(error)) from None
+        if self._queue.qsize() + len(puzzles) > self.max_queue:
+            self._counters["rejected"] += 1
+            raise _HttpError(503, "Too many puzzles waiting, retry later")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for puzzle in puzzles:
+            future = loop.create_future()
+            self._queue.put_nowait((puzzle, limit, timeout, max_nodes, future))
+            futures.append(future)
+        self._counters["puzzles"] += len(puzzles)
+        try:
+            results = await asyncio.gather(*futures)
+        except (asyncio.CancelledError, _HttpError):
+            for future in futures:
+                future.cancel()
+            raise
+        answers = []
+        for item, (solutions, status, error) in zip(items, results):
+            if isinstance(item, str):
+                solutions = [puzzle_io.format_puzzle(solution) for solution in solutions]
+            answer = {"solutions": solutions, "status": status}
+            if error is not None:
+                answer["error"] = error
+                self._counters["errors"] += 1
+            else:
+                self._statuses[status] += 1
+            answers.append(answer)
+        return answers[0] if single else {"results": answers}
+
+    @staticmethod
+    def _option(request: dict, name: str, default, cap, types):
+        """Read a non-negative numeric request option, capped by the server's own limit."""
+        value = request.get(name, default)
+        if value is None:
+            return cap
+        if isinstance(value, bool) or not isinstance(value, types) or value < 0:
+            raise _HttpError(400, f'"{name}" must be a non-negative number')
+        return value if cap is None else min(value, cap)
+
+
+async def _serve(server: SolverServer):
+    async with server:
+        print(f"Serving on http://{server.host}:{server.port} with {server.workers} workers", flush=True)
+        await server.serve_forever()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default 8080).")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: number of CPUs).")
+    parser.add_argument("--max-batch", type=int, default=32, help="Puzzles per micro-batch (default 32).")
+    parser.add_argument("--max-delay", type=float, default=0.002,
+                        help="Seconds a micro-batch waits for more puzzles (default 0.002).")
+    parser.add_argument("--max-queue", type=int, default=4096,
+                        help="Puzzles allowed to wait for a worker before requests get 503 (default 4096).")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Time budget per puzzle in seconds (default 10).")
+    parser.add_argument("--max-nodes", type=int, help="Node budget per puzzle (default: none).")
+    parser.add_argument("--engine", choices=ENGINES, default="bitboard", help="Constraint engine (default bitboard).")
+    parser.add_argument("--no-propagate", dest="propagate", action="store_false",
+                        help="Do not apply naked and hidden singles.")
+    parser.add_argument("--strong", action="store_true", help="Also apply locked candidates and naked pairs.")
+    args = parser.parse_args(argv)
+    if args.engine == "core" and (not args.propagate or args.strong):
+        parser.error("--no-propagate and --strong cannot be used with --engine core")
+    server = SolverServer(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                          max_delay=args.max_delay, max_queue=args.max_queue, timeout=args.timeout,
+                          max_nodes=args.max_nodes, engine=ENGINES[args.engine], propagate=args.propagate,
+                          strong=args.strong)
+    try:
+        asyncio.run(_serve(server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
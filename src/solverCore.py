@@ -0,0 +1,317 @@
+"""
+A reusable, allocation-free search core.
+
+`SolverCore` owns every buffer a search needs, sized once for its board:
+the grid, the row, column and box digit masks, the set of empty cells, a
+trail of the cells placed and the stack of branch points. `reset(puzzle)`
+loads a new puzzle into those buffers, so a worker solving many puzzles
+builds one core and allocates nothing per puzzle besides the solutions it
+returns.
+
+The search holds candidates as digit masks rather than digit iterators:
+each branch point keeps the mask of the digits still to try, and undoing a
+branch pops the trail back to the length recorded when it was entered.
+The search loop raises no exceptions and can be resumed after every
+solution.
+"""
+
+import sys
+
+from src.board import get_board
+from src.budget import Budget
+from src.constants import *
+from src.errors import *
+
+
+class SolverCore:
+    """
+    Depth-first search with naked and hidden singles over preallocated state.
+
+    Attributes:
+        box_length (int): N for the N²×N² puzzles the core solves.
+        grid (list[int]): The grid being searched. It holds a solution after
+            `search` returns True, until the next call.
+        nodes (int): Digits tried at branch points since the last `reset`.
+    """
+
+    def __init__(self, box_length: int = BOX_LENGTH):
+        """
+        Args:
+            box_length (int, optional): N for the N²×N² puzzles this core solves. Defaults to 3.
+
+        Raises:
+            ValueError: If the box length is not supported.
+        """
+        board = get_board(box_length)
+        size, length = board.sudoku_size, board.sudoku_length
+        self._board = board
+        self.box_length = box_length
+        self.grid = [0] * size
+        self._rows = [0] * length
+        self._cols = [0] * length
+        self._boxes = [0] * length
+        units = board.units
+        self._unit_groups = ((self._rows, units[:length]), (self._cols, units[length:2 * length]),
+                             (self._boxes, units[2 * length:]))
+        # empty cells are _empty[:_count]; _pos[cell] is the slot of a cell.
+        # Cells are refilled in the reverse order they were placed, so a cell
+        # placed from slot k is found in slot k again when it is emptied.
+        self._empty = list(range(size))
+        self._pos = list(range(size))
+        self._count = 0
+        self._trail = [0] * size
+        self._trail_len = 0
+        # branch points: the cell, the digits left to try and the trail length on entry
+        self._frame_cell = [0] * size
+        self._frame_mask = [0] * size
+        self._frame_trail = [0] * size
+        self._depth = -1
+        self._started = False
+        self.nodes = 0
+
+    def reset(self, puzzle: list[int]):
+        """
+        Load a puzzle, discarding the state of the previous search.
+
+        Args:
+            puzzle (list[int]): Flat list of the N⁴ cells, 0 for empty cells. It is not modified.
+
+        Raises:
+            PuzzleFormatError: If the puzzle does not fit the core's board or holds an out-of-range value.
+            InvalidSudokuError: If the givens conflict.
+        """
+        board = self._board
+        if len(puzzle) != board.sudoku_size:
+            raise PuzzleFormatError(f"Expected {board.sudoku_size} cells, got {len(puzzle)}")
+        grid, rows, cols, boxes = self.grid, self._rows, self._cols, self._boxes
+        row_of, col_of, box_of = board.row_of, board.col_of, board.box_of
+        empty, pos = self._empty, self._pos
+        length = board.sudoku_length
+        for u in range(length):
+            rows[u] = cols[u] = boxes[u] = 0
+        count = 0
+        for cell, digit in enumerate(puzzle):
+            grid[cell] = digit
+            if not digit:
+                empty[count] = cell
+                pos[cell] = count
+                count += 1
+                continue
+            if not 0 < digit <= length:
+                raise PuzzleFormatError(f"Cell {cell} holds {digit}, expected 0 to {length}")
+            bit = 1 << (digit - 1)
+            r, c, b = row_of[cell], col_of[cell], box_of[cell]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                raise InvalidSudokuError(f"Digit {digit} at cell {cell} conflicts with another given")
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+        # filled cells take the slots past the empty ones, so every cell has one
+        slot = count
+        for cell in range(board.sudoku_size):
+            if grid[cell]:
+                empty[slot] = cell
+                pos[cell] = slot
+                slot += 1
+        self._count = count
+        self._trail_len = 0
+        self._depth = -1
+        self._started = False
+        self.nodes = 0
+
+    def _place(self, cell: int, bit: int):
+        board = self._board
+        self.grid[cell] = bit.bit_length()
+        self._rows[board.row_of[cell]] |= bit
+        self._cols[board.col_of[cell]] |= bit
+        self._boxes[board.box_of[cell]] |= bit
+        # swap the cell with the last empty one and shrink the empty set
+        empty, pos = self._empty, self._pos
+        last = self._count - 1
+        slot = pos[cell]
+        other = empty[last]
+        empty[slot] = other
+        pos[other] = slot
+        empty[last] = cell
+        pos[cell] = last
+        self._count = last
+        self._trail[self._trail_len] = cell
+        self._trail_len += 1
+
+    def _undo(self, length: int):
+        """Empty the cells placed since the trail had 'length' entries, last first."""
+        board = self._board
+        grid, rows, cols, boxes, trail = self.grid, self._rows, self._cols, self._boxes, self._trail
+        row_of, col_of, box_of = board.row_of, board.col_of, board.box_of
+        for i in range(self._trail_len - 1, length - 1, -1):
+            cell = trail[i]
+            clear = ~(1 << (grid[cell] - 1))
+            grid[cell] = 0
+            rows[row_of[cell]] &= clear
+            cols[col_of[cell]] &= clear
+            boxes[box_of[cell]] &= clear
+        self._count += self._trail_len - length
+        self._trail_len = length
+
+    def _settle(self) -> int:
+        """
+        Place singles until none is left, then pick the next cell to branch on.
+
+        Returns:
+            int: The empty cell with the fewest candidates (at least two), -1 if
+            the grid is full, or -2 on a contradiction.
+        """
+        board = self._board
+        rows, cols, boxes, empty = self._rows, self._cols, self._boxes, self._empty
+        row_of, col_of, box_of = board.row_of, board.col_of, board.box_of
+        full = board.digits_mask
+        while True:
+            best, best_count = -1, 0
+            placed = False
+            # scan downwards: placing a cell only moves already scanned cells
+            i = self._count - 1
+            while i >= 0:
+                cell = empty[i]
+                cand = ~(rows[row_of[cell]] | cols[col_of[cell]] | boxes[box_of[cell]]) & full
+                if not cand:
+                    return -2
+                if not cand & (cand - 1):
+                    self._place(cell, cand)
+                    placed = True
+                elif not placed:
+                    n = cand.bit_count()
+                    if best == -1 or n < best_count:
+                        best, best_count = cell, n
+                i -= 1
+            if placed:
+                continue
+            if best == -1:
+                return -1
+            found = self._hidden_singles()
+            if found == -2:
+                return -2
+            if not found:
+                return best
+
+    def _hidden_singles(self) -> int:
+        """
+        Place the digits that fit a single cell of a unit.
+
+        Returns:
+            int: The number of digits placed, or -2 if a unit has a digit left without a cell.
+        """
+        board = self._board
+        grid, rows, cols, boxes = self.grid, self._rows, self._cols, self._boxes
+        row_of, col_of, box_of = board.row_of, board.col_of, board.box_of
+        full = board.digits_mask
+        placed = 0
+        for masks, units in self._unit_groups:
+            for number in range(len(units)):
+                used = masks[number]
+                if used == full:
+                    continue
+                unit = units[number]
+                once = twice = 0
+                for cell in unit:
+                    if not grid[cell]:
+                        cand = ~(rows[row_of[cell]] | cols[col_of[cell]] | boxes[box_of[cell]]) & full
+                        twice |= once & cand
+                        once |= cand
+                if (once | used) != full:
+                    return -2
+                single = once & ~twice
+                while single:
+                    bit = single & -single
+                    single ^= bit
+                    for cell in unit:
+                        if not grid[cell]:
+                            cand = ~(rows[row_of[cell]] | cols[col_of[cell]] | boxes[box_of[cell]]) & full
+                            if cand & bit:
+                                self._place(cell, bit)
+                                placed += 1
+                                break
+                    else:
+                        # an earlier placement in this unit took the digit's last cell
+                        return -2
+        return placed
+
+    def search(self, budget: Budget = None) -> bool:
+        """
+        Run the search until the next solution.
+
+        Args:
+            budget (Budget, optional): Limits of the search (see `src.budget`),
+                checked every few nodes. `budget.nodes` is kept up to date.
+
+        Returns:
+            bool: True if `grid` holds a new solution, False once the search is
+            exhausted or a limit of the budget is hit (then `budget.status`
+            tells which). Calling again after True resumes the search.
+        """
+        if not self._started:
+            self._started = True
+            cell = self._settle()
+            if cell == -1:
+                return True
+            if cell == -2:
+                return False
+            self._push(cell)
+        frame_cell, frame_mask, frame_trail = self._frame_cell, self._frame_mask, self._frame_trail
+        depth = self._depth
+        check_at = sys.maxsize if budget is None else budget.next_check(self.nodes)
+        while depth >= 0:
+            if self.nodes >= check_at:
+                if budget.exceeded(self.nodes):
+                    self._depth = depth
+                    budget.nodes = self.nodes
+                    return False
+                check_at = budget.next_check(self.nodes)
+            self._undo(frame_trail[depth])
+            mask = frame_mask[depth]
+            if not mask:
+                depth -= 1
+                continue
+            bit = mask & -mask
+            frame_mask[depth] = mask ^ bit
+            self.nodes += 1
+            self._place(frame_cell[depth], bit)
+            cell = self._settle()
+            if cell == -1:
+                self._depth = depth
+                if budget is not None:
+                    budget.nodes = self.nodes
+                return True
+            if cell >= 0:
+                self._depth = depth
+                self._push(cell)
+                depth = self._depth
+        self._depth = -1
+        if budget is not None:
+            budget.nodes = self.nodes
+        return False
+
+    def _push(self, cell: int):
+        board = self._board
+        depth = self._depth = self._depth + 1
+        self._frame_cell[depth] = cell
+        self._frame_mask[depth] = ~(self._rows[board.row_of[cell]] | self._cols[board.col_of[cell]]
+                                    | self._boxes[board.box_of[cell]]) & board.digits_mask
+        self._frame_trail[depth] = self._trail_len
+
+    def count(self, limit: int = None, budget: Budget = None) -> int:
+        """
+        Count the solutions of the loaded puzzle, up to 'limit' (None for all).
+        """
+        found = 0
+        while found != limit and self.search(budget):
+            found += 1
+        return found
+
+    def solve(self, limit: int = 2, budget: Budget = None) -> list[list[int]]:
+        """
+        Return up to 'limit' solutions of the loaded puzzle, each a new list.
+        """
+        solutions = []
+        while len(solutions) != limit and self.search(budget):
+            solutions.append(self.grid[:])
+        return solutions
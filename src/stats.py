@@ -0,0 +1,156 @@
+"""
+Opt-in instrumentation of the backtracking search.
+
+The counters are collected by wrappers around the constraint engine and the
+digit source of a search, so the search loop itself is unchanged and a solver
+called without a `SearchStats` object runs exactly as before.
+"""
+
+
+class SearchStats:
+    """
+    Counters of one or more searches.
+
+    A solver fills in the object passed as its `stats` argument rather than
+    returning one, so its return value is the same with and without stats.
+    Two objects compare equal when all their counters are equal.
+
+    Attributes:
+        nodes (int): Digits tried at branch points.
+        backtracks (int): Branch points whose digits were all tried without
+            ending the search.
+        max_depth (int): Largest number of nested branch points.
+        neighbor_updates (int): Calls to the engine's `update_neighbors`, including
+            those made by propagation.
+        mrv_scans (int): Calls to `pop_most_constrained_cell`.
+        branch_candidates (dict[int, int]): Number of branch points by number of candidate digits.
+        nogood_probes (int): Lookups of the nogood memo (see `src.nogood`), one per branch point reached.
+        nogood_hits (int): Branch points skipped because the memo knew them as dead ends.
+        nogood_stores (int): Dead ends added to the memo.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.neighbor_updates = 0
+        self.mrv_scans = 0
+        self.branch_candidates = {}
+        self.nogood_probes = 0
+        self.nogood_hits = 0
+        self.nogood_stores = 0
+        self._depth = 0
+
+    _FIELDS = ("nodes", "backtracks", "max_depth", "neighbor_updates", "mrv_scans", "branch_candidates",
+               "nogood_probes", "nogood_hits", "nogood_stores")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SearchStats):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"SearchStats(nodes={self.nodes}, backtracks={self.backtracks}, max_depth={self.max_depth}, "
+                f"neighbor_updates={self.neighbor_updates}, mrv_scans={self.mrv_scans}, "
+                f"branch_candidates={self.branch_candidates}, nogood_probes={self.nogood_probes}, "
+                f"nogood_hits={self.nogood_hits}, nogood_stores={self.nogood_stores})")
+
+    @property
+    def branching_factor(self) -> float:
+        """Average number of candidates at a branch point (0 if there was none)."""
+        branches = sum(self.branch_candidates.values())
+        if not branches:
+            return 0.0
+        return sum(k * n for k, n in self.branch_candidates.items()) / branches
+
+    @property
+    def nogood_hit_rate(self) -> float:
+        """Fraction of the nogood memo lookups that were hits (0 without lookups)."""
+        return self.nogood_hits / self.nogood_probes if self.nogood_probes else 0.0
+
+    def merge(self, other: "SearchStats"):
+        """Add the counters of another search to these ones."""
+        self.nodes += other.nodes
+        self.backtracks += other.backtracks
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.neighbor_updates += other.neighbor_updates
+        self.mrv_scans += other.mrv_scans
+        for k, n in other.branch_candidates.items():
+            self.branch_candidates[k] = self.branch_candidates.get(k, 0) + n
+        self.nogood_probes += other.nogood_probes
+        self.nogood_hits += other.nogood_hits
+        self.nogood_stores += other.nogood_stores
+
+
+class CountingEngine:
+    """
+    Wraps a constraint engine to count `update_neighbors` calls and MRV scans.
+    Every other attribute is delegated to the wrapped engine.
+    """
+
+    def __init__(self, cm, stats: SearchStats):
+        self._cm = cm
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._cm, name)
+
+    def update_neighbors(self, idx: int, val: int, remove: bool = False):
+        self._stats.neighbor_updates += 1
+        self._cm.update_neighbors(idx, val, remove)
+
+    def pop_most_constrained_cell(self) -> int:
+        self._stats.mrv_scans += 1
+        return self._cm.pop_most_constrained_cell()
+
+
+class CountingDigits:
+    """
+    Wraps the digit source of a search (an engine or a `Propagator`) to count
+    branch points, the digits tried at them and exhausted branch points.
+    """
+
+    def __init__(self, source, stats: SearchStats):
+        self._source = source
+        self._stats = stats
+        stats._depth = 0
+
+    def candidates(self, index: int) -> int:
+        return self._source.candidates(index)
+
+    def gen_digits(self, index: int):
+        stats = self._stats
+        branches = stats.branch_candidates
+        k = self._source.candidates(index).bit_count()
+        branches[k] = branches.get(k, 0) + 1
+        stats._depth += 1
+        if stats._depth > stats.max_depth:
+            stats.max_depth = stats._depth
+        for digit in self._source.gen_digits(index):
+            stats.nodes += 1
+            yield digit
+        stats.backtracks += 1
+        stats._depth -= 1
+
+
+class CountingNogoods:
+    """
+    Wraps a `NogoodTable` to count its lookups, hits and stores.
+    """
+
+    def __init__(self, nogoods, stats: SearchStats):
+        self._nogoods = nogoods
+        self._stats = stats
+
+    def __contains__(self, key: int) -> bool:
+        self._stats.nogood_probes += 1
+        if key in self._nogoods:
+            self._stats.nogood_hits += 1
+            return True
+        return False
+
+    def add(self, key: int):
+        self._stats.nogood_stores += 1
+        self._nogoods.add(key)
@@ -1,91 +1,518 @@
-from src.constraintMap import ConstraintMap
-from src import utils
-from src.errors import *
-
-
-def backtrack_recursive_solver(puzzle: list, limit: int = 2) -> list[list]:
-    """
-    Solve a Sudoku puzzle using recursive backtracking guided by constraints.
-
-    Args:
-        puzzle (list): Flat list of 81 integers representing the Sudoku grid.
-                       Empty cells should be 0.
-        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
-
-    Returns:
-        list[list]: A list of solutions (each solution is a list of 81 integers).
-                    Stops when the number of solutions reaches 'limit'.
-    """
-    if not utils.is_valid_sudoku(puzzle):
-        raise InvalidSudokuError
-    solutions = []
-    cm = ConstraintMap(puzzle)
-    def _solve(puzzle, idx):
-        if len(solutions) == limit:
-            return
-        if idx == -1:
-            solutions.append(list(puzzle))
-            return
-        digits = utils.gen_digits(cm[idx])
-        for digit in digits:
-            puzzle[idx] = digit
-            cm.update_neighbors(idx, digit)
-            _solve(puzzle, cm.pop_most_constrained_cell())
-            cm.update_neighbors(idx, digit, remove= True)
-        puzzle[idx] = 0
-        cm.update_empty_cells(idx, add= True)
-    _solve(puzzle, cm.pop_most_constrained_cell())
-    return solutions
-
-def backtrack_iterative_solver(puzzle: list, limit: int = 2) -> list[list]:
-    """
-    Solve a Sudoku puzzle using an iterative backtracking algorithm guided by constraints.
-
-    Args:
-        puzzle (list): Flat list of 81 integers representing the Sudoku grid.
-                       Empty cells should be 0.
-        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
-
-    Returns:
-        list[list]: A list of solutions (each solution is a list of 81 integers).
-                    Stops when the number of solutions reaches 'limit'.
-    """
-    if not utils.is_valid_sudoku(puzzle):
-        raise InvalidSudokuError
-    solutions = []
-    cm = ConstraintMap(puzzle)
-    idx = cm.pop_most_constrained_cell()
-    indices = [None]*81
-    iters = [None]*81
-    indices[0] = idx
-    iters[0] = utils.gen_digits(cm[idx])
-    count = 0
-    filled_cell_index = 0
-    while filled_cell_index > -1:
-        try:
-            idx = indices[filled_cell_index]
-            if puzzle[idx]:
-                cm.update_neighbors(idx, puzzle[idx], remove=True)
-            digit = next(iters[filled_cell_index])
-            puzzle[idx] = digit
-            cm.update_neighbors(idx, digit)
-            next_idx = cm.pop_most_constrained_cell()
-            if next_idx == -1:
-                solutions.append(puzzle.copy())
-                count += 1
-                if count == limit:
-                    return solutions
-            else:
-                filled_cell_index += 1
-                digit_iter = utils.gen_digits(cm[next_idx])
-                indices[filled_cell_index] = next_idx
-                iters[filled_cell_index] = digit_iter
-        except StopIteration:
-            indices[filled_cell_index] = None
-            iters[filled_cell_index] = None
-            filled_cell_index -= 1
-            puzzle[idx] = 0
-            cm.update_empty_cells(idx, add=True)
-    return solutions
-
-
+import itertools
+import random
+import sys
+import threading
+import time
+
+from src.constraintMap import ConstraintMap
+from src.propagation import Propagator
+from src.dlx import DancingLinks
+from src.solverCore import SolverCore
+from src.board import board_of
+from src.stats import SearchStats, CountingEngine, CountingDigits, CountingNogoods
+from src.budget import Budget, CancelToken, SolveResult, COMPLETE
+from src.heuristics import Heuristic
+from src.nogood import NogoodTable, ZobristEngine
+from src import utils
+from src.errors import *
+
+# The SolverCore reused by bounded_solver in each thread.
+_cores = threading.local()
+
+
+def backtrack_recursive_solver(puzzle: list, limit: int = 2, *, engine: type = ConstraintMap,
+                               propagate: bool = False, strong: bool = False,
+                               stats: SearchStats = None, heuristic: Heuristic = None) -> list[list]:
+    """
+    Solve a Sudoku puzzle using recursive backtracking guided by constraints.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+                       Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
+        engine (type, optional): Constraint engine class, either `ConstraintMap`
+                       or `BitboardMap`. Defaults to `ConstraintMap`.
+        propagate (bool, optional): Apply naked and hidden singles after each
+                       placement. Defaults to False.
+        strong (bool, optional): Also apply locked candidates and naked pairs.
+                       Implies `propagate`. Defaults to False.
+        stats (SearchStats, optional): If given, search counters are added to it.
+                       The search is not instrumented otherwise.
+        heuristic (Heuristic, optional): Branching cell and digit order (see
+                       `src.heuristics`). Defaults to None (MRV, ascending digits).
+
+    Returns:
+        list[list]: A list of solutions (each solution is a list of 81 integers).
+                    Stops when the number of solutions reaches 'limit'.
+    """
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    solutions = []
+    cm, prop, digit_source, _ = _setup(puzzle, engine, propagate, strong, stats, heuristic)
+    def _solve(puzzle, idx):
+        if idx == -1:
+            solutions.append(list(puzzle))
+            return
+        digits = digit_source.gen_digits(idx)
+        for digit in digits:
+            puzzle[idx] = digit
+            cm.update_neighbors(idx, digit)
+            if prop is None:
+                _solve(puzzle, cm.pop_most_constrained_cell())
+            else:
+                mark = prop.mark()
+                if prop.propagate(idx):
+                    _solve(puzzle, cm.pop_most_constrained_cell())
+                prop.undo(mark)
+            cm.update_neighbors(idx, digit, remove= True)
+            if len(solutions) == limit:
+                break
+        puzzle[idx] = 0
+        cm.update_empty_cells(idx, add= True)
+    if prop is None or prop.propagate():
+        _solve(puzzle, cm.pop_most_constrained_cell())
+    if prop is not None:
+        prop.undo(0)
+    return solutions
+
+def backtrack_iterative_solver(puzzle: list, limit: int = 2, *, engine: type = ConstraintMap,
+                               propagate: bool = False, strong: bool = False,
+                               stats: SearchStats = None, heuristic: Heuristic = None,
+                               nogoods: NogoodTable = None) -> list[list]:
+    """
+    Solve a Sudoku puzzle using an iterative backtracking algorithm guided by constraints.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+                       Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
+        engine (type, optional): Constraint engine class, either `ConstraintMap`
+                       or `BitboardMap`. Defaults to `ConstraintMap`.
+        propagate (bool, optional): Apply naked and hidden singles after each
+                       placement. Defaults to False.
+        strong (bool, optional): Also apply locked candidates and naked pairs.
+                       Implies `propagate`. Defaults to False.
+        stats (SearchStats, optional): If given, search counters are added to it.
+                       The search is not instrumented otherwise.
+        heuristic (Heuristic, optional): Branching cell and digit order (see
+                       `src.heuristics`). Defaults to None (MRV, ascending digits).
+        nogoods (NogoodTable, optional): Memo of dead ends (see `src.nogood`). Branch
+                       points reaching a grid it holds are skipped, and branch points
+                       exhausted without a solution are added to it. Share one memo
+                       between searches of related puzzles.
+
+    Returns:
+        list[list]: A list of solutions (each solution is a list of 81 integers).
+                    Stops when the number of solutions reaches 'limit'.
+    """
+    solutions = []
+    for solution in _search(puzzle, engine, propagate, strong, stats, heuristic=heuristic, nogoods=nogoods):
+        solutions.append(solution.copy())
+        if len(solutions) == limit:
+            break
+    return solutions
+
+def bounded_solver(puzzle: list, limit: int = 2, *, timeout: float = None, max_nodes: int = None,
+                   cancel: CancelToken = None, engine: type = ConstraintMap, propagate: bool = None,
+                   strong: bool = False, stats: SearchStats = None, heuristic: Heuristic = None,
+                   nogoods: NogoodTable = None, count_only: bool = False) -> SolveResult:
+    """
+    Solve a Sudoku puzzle like `backtrack_iterative_solver`, within time and node limits.
+
+    The limits are checked every few nodes of the search. When one is hit the
+    search stops and the solutions found so far are returned with a status
+    telling which limit stopped it. The puzzle is not modified.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
+        timeout (float, optional): Seconds after which the search stops. Defaults to None (no limit).
+        max_nodes (int, optional): Number of digits tried at branch points after
+                       which the search stops. Defaults to None (no limit).
+        cancel (CancelToken, optional): Token stopping the search once cancelled,
+                       e.g. from another thread.
+        engine, propagate, strong, stats, heuristic, nogoods: As for `backtrack_iterative_solver`.
+                       With `engine=SolverCore` the search runs on a `SolverCore`
+                       kept by the calling thread and reused for every puzzle of
+                       the same size; it always applies naked and hidden singles
+                       (None, the default for 'propagate', means True there and
+                       False for the other engines) and only counts nodes into
+                       'stats'; 'propagate=False', 'strong', 'heuristic' and
+                       'nogoods' cannot be used.
+        count_only (bool, optional): Only count the solutions, like `count_solutions`:
+                       none is copied and the result has an empty 'solutions'
+                       list. Defaults to False.
+
+    Returns:
+        SolveResult: The solutions found, the status (`COMPLETE`, `TIMEOUT`,
+        `NODE_LIMIT` or `CANCELLED` from `src.budget`), the number of nodes,
+        the elapsed time and the number of solutions.
+
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+        ValueError: If 'timeout' or 'max_nodes' is negative, or an option `SolverCore` does not
+                    support is given with it.
+    """
+    start = time.perf_counter()
+    budget = Budget(timeout, max_nodes, cancel)
+    if engine is SolverCore:
+        if heuristic is not None or nogoods is not None:
+            raise ValueError("SolverCore has its own branching rule and takes no heuristic or nogoods")
+        if propagate is False or strong:
+            raise ValueError("SolverCore always applies naked and hidden singles, and only those")
+        core = _core_for(puzzle)
+        core.reset(puzzle)
+        solutions = [] if count_only else core.solve(limit, budget)
+        count = core.count(limit, budget) if count_only else len(solutions)
+        if stats is not None:
+            stats.nodes += core.nodes
+        return SolveResult(solutions, budget.status, budget.nodes, time.perf_counter() - start, count)
+    solutions = []
+    count = 0
+    for solution in _search(list(puzzle), engine, propagate, strong, stats, budget, heuristic, nogoods):
+        count += 1
+        if not count_only:
+            solutions.append(solution.copy())
+        if count == limit:
+            break
+    return SolveResult(solutions, budget.status, budget.nodes, time.perf_counter() - start, count)
+
+def restart_solver(puzzle: list, limit: int = 1, *, seed: int = None, nodes: int = 100, growth: float = 2.0,
+                   cell: str = "mrv", budget: Budget = None, **options) -> list[list]:
+    """
+    Search with random digit orders, restarting with a new order whenever a node budget runs out.
+
+    Each run is a `bounded_solver` search with the "random" value rule of
+    `src.heuristics`, stopped after 'nodes' nodes. The budget is multiplied by
+    'growth' at every restart, so the search always ends. Restarts escape the
+    unlucky early choices that make a few puzzles take far longer than the rest.
+    Given a `NogoodTable` as 'nogoods', the runs share it, so each restart
+    skips the dead ends already proven by the previous ones. A 'budget' limits
+    all the runs together.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+        limit (int, optional): Maximum number of solutions to find, None for all (the
+                       restarts then go on until one run exhausts the search). Defaults to 1.
+        seed (int, optional): Seed of the digit orders. Defaults to None (unseeded).
+        nodes (int, optional): Node budget of the first run. Defaults to 100.
+        growth (float, optional): Factor applied to the budget at each restart. Defaults to 2.0.
+        cell (str, optional): Cell rule of the searches (see `src.heuristics`). Defaults to "mrv".
+        budget (Budget, optional): Limits of all the runs together (see `src.budget`). When
+                       one is hit the restarts end and `budget.status` tells which.
+        **options: engine, propagate, strong, stats and nogoods, as for `backtrack_iterative_solver`.
+
+    Returns:
+        list[list]: Up to 'limit' distinct solutions, those found so far if the budget ran out.
+
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+        ValueError: If 'nodes' is not positive or 'growth' is not above 1.
+    """
+    if nodes < 1 or growth <= 1:
+        raise ValueError(f"Expected nodes >= 1 and growth > 1, got {nodes} and {growth}")
+    rng = random.Random(seed)
+    found = {}
+    while budget is None or not budget.exceeded(budget.nodes):
+        run_nodes, timeout, cancel = int(nodes), None, None
+        if budget is not None:
+            if budget.max_nodes is not None:
+                run_nodes = min(run_nodes, budget.max_nodes - budget.nodes)
+            if budget.deadline is not None:
+                timeout = max(0.0, budget.deadline - time.perf_counter())
+            cancel = budget.cancel
+        heuristic = Heuristic(cell, "random", seed=rng.getrandbits(32))
+        result = bounded_solver(puzzle, limit, timeout=timeout, max_nodes=run_nodes, cancel=cancel,
+                                heuristic=heuristic, **options)
+        if budget is not None:
+            budget.nodes += result.nodes
+        for solution in result.solutions:
+            found.setdefault(tuple(solution), solution)
+        if result.status == COMPLETE or limit is not None and len(found) >= limit:
+            break
+        nodes *= growth
+    return list(found.values())[:limit]
+
+def iter_solutions(puzzle: list, *, engine: type = ConstraintMap, propagate: bool = False,
+                   strong: bool = False, stats: SearchStats = None, budget: Budget = None,
+                   heuristic: Heuristic = None, nogoods: NogoodTable = None):
+    """
+    Lazily generate the solutions of a Sudoku puzzle.
+
+    Runs the search of `backtrack_iterative_solver` on a copy of the puzzle and
+    yields each solution as soon as it is found. The search is suspended between
+    solutions, so a consumer can stop at any time without the rest being computed.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+        engine, propagate, strong, stats, heuristic, nogoods: As for `backtrack_iterative_solver`.
+        budget (Budget, optional): Limits of the search (see `src.budget`). When one
+                       is hit the iteration ends and `budget.status` tells which.
+
+    Returns:
+        Iterator[list]: Yields each solution as a new list of 81 integers.
+
+    Raises:
+        InvalidSudokuError: If the givens conflict (raised by this call, not on iteration).
+    """
+    return (solution.copy() for solution in _search(list(puzzle), engine, propagate, strong, stats, budget,
+                                                    heuristic, nogoods))
+
+def count_solutions(puzzle: list, limit: int = None, *, engine: type = ConstraintMap,
+                    propagate: bool = False, strong: bool = False, stats: SearchStats = None,
+                    heuristic: Heuristic = None, nogoods: NogoodTable = None) -> int:
+    """
+    Count the solutions of a Sudoku puzzle without storing them.
+
+    Walks the same search as `backtrack_iterative_solver` on a copy of the
+    puzzle, so no grid is allocated per solution.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+        limit (int, optional): Stop counting once 'limit' solutions are found.
+                       Defaults to None (count them all).
+        engine, propagate, strong, stats, heuristic, nogoods: As for `backtrack_iterative_solver`.
+
+    Returns:
+        int: The number of solutions, at most 'limit'.
+
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+    """
+    return sum(1 for _ in itertools.islice(_search(list(puzzle), engine, propagate, strong, stats,
+                                                   heuristic=heuristic, nogoods=nogoods), limit))
+
+def is_unique(puzzle: list, **options) -> bool:
+    """
+    Return whether a Sudoku puzzle has exactly one solution.
+
+    The search stops as soon as a second solution is found. Keyword
+    arguments are passed on to `count_solutions`.
+    """
+    return count_solutions(puzzle, 2, **options) == 1
+
+def has_solution(puzzle: list, cm, prop: Propagator = None, nogoods: NogoodTable = None) -> bool:
+    """
+    Return whether a puzzle held by an existing constraint engine has a solution.
+
+    No engine is built: the search runs on 'cm', and on 'prop' (a `Propagator`
+    over the same puzzle and engine) if given, which the caller can keep across
+    many searches of slightly different puzzles, e.g. while removing clues. The
+    puzzle, the engine and the propagator are left as they were found. The
+    givens are not checked for conflicts.
+
+    Args:
+        puzzle (list): The grid held by 'cm'.
+        cm: Constraint engine (`ConstraintMap` or `BitboardMap`) of the puzzle.
+        prop (Propagator, optional): Propagator applied during the search.
+        nogoods (NogoodTable, optional): Memo of dead ends, read and extended by
+                       the search. 'cm' must then be a `ZobristEngine` (and 'prop'
+                       built on it), kept for all the searches sharing the memo.
+
+    Returns:
+        bool: True as soon as one solution is found.
+    """
+    search = _iterate(puzzle, cm, prop, prop or cm, nogoods)
+    try:
+        return next(search, None) is not None
+    finally:
+        search.close()
+
+def _core_for(puzzle: list) -> SolverCore:
+    """Return the calling thread's `SolverCore`, rebuilt when the size of 'puzzle' changes."""
+    box_length = board_of(puzzle).box_length
+    core = getattr(_cores, "core", None)
+    if core is None or core.box_length != box_length:
+        core = _cores.core = SolverCore(box_length)
+    return core
+
+def _setup(puzzle: list, engine: type, propagate: bool, strong: bool, stats: SearchStats,
+           heuristic: Heuristic = None, nogoods: NogoodTable = None) -> tuple:
+    """
+    Build the constraint engine, the optional propagator, the digit source and
+    the optional nogood memo of a search. The engine keeps a Zobrist hash when
+    a memo is given; the engine and digit source are wrapped by the heuristic
+    when one is given, and everything in counters when 'stats' is given.
+    """
+    cm = engine(puzzle)
+    if nogoods is not None:
+        cm = ZobristEngine(cm, puzzle)
+    if stats is not None:
+        cm = CountingEngine(cm, stats)
+        if nogoods is not None:
+            nogoods = CountingNogoods(nogoods, stats)
+    prop = Propagator(puzzle, cm, strong=strong) if propagate or strong else None
+    digit_source = prop or cm
+    if heuristic is not None:
+        cm = digit_source = heuristic.bind(puzzle, cm, digit_source)
+    if stats is not None:
+        digit_source = CountingDigits(digit_source, stats)
+    return cm, prop, digit_source, nogoods
+
+def _search(puzzle: list, engine: type, propagate: bool, strong: bool,
+            stats: SearchStats = None, budget: Budget = None, heuristic: Heuristic = None,
+            nogoods: NogoodTable = None):
+    """
+    Check the puzzle and start the iterative search on it.
+
+    Returns:
+        Iterator[list]: Yields 'puzzle' itself each time it holds a solution;
+        its content is only valid until the iterator is resumed.
+
+    Raises:
+        InvalidSudokuError: If the givens conflict.
+    """
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    return _iterate(puzzle, *_setup(puzzle, engine, propagate, strong, stats, heuristic, nogoods), budget)
+
+def _iterate(puzzle: list, cm, prop, digit_source, nogoods: NogoodTable = None, budget: Budget = None):
+    """
+    Depth-first search with explicit stacks of cells and digit iterators.
+
+    With a 'budget', its limits are checked every few nodes; when one is hit
+    the search stops and its status is left in `budget.status`. `budget.nodes`
+    is updated at every solution and when the search ends.
+
+    However the search ends (exhausted, stopped by the budget, or the iterator
+    closed by the consumer), 'puzzle', 'cm' and 'prop' are left as they were
+    found, so callers may run many searches on one engine.
+
+    With 'nogoods', 'cm' is a `ZobristEngine`: the grid entering each branch
+    point is looked up in the memo, and recorded there once all its digits
+    are tried without a solution being found below it.
+    """
+    # work the caller recorded on the propagator before the search is kept
+    base = 0 if prop is None else prop.mark()
+    if prop is not None and not prop.propagate():
+        prop.undo(base)
+        return
+    idx = cm.pop_most_constrained_cell()
+    if idx == -1:
+        try:
+            yield puzzle
+        finally:
+            if prop is not None:
+                prop.undo(base)
+        return
+    if nogoods is not None and cm.key in nogoods:
+        cm.update_empty_cells(idx, add=True)
+        if prop is not None:
+            prop.undo(base)
+        return
+    cells = len(puzzle)
+    indices = [None]*cells
+    iters = [None]*cells
+    marks = [0]*cells
+    if nogoods is not None:
+        # hash of the grid entering each branch point, and the solutions found before it
+        keys = [0]*cells
+        found = [0]*cells
+        keys[0] = cm.key
+    solutions = 0
+    indices[0] = idx
+    iters[0] = digit_source.gen_digits(idx)
+    filled_cell_index = 0
+    nodes = 0
+    check_at = sys.maxsize if budget is None else budget.next_check(0)
+    try:
+        while filled_cell_index > -1:
+            if nodes == check_at:
+                if budget.exceeded(nodes):
+                    break
+                check_at = budget.next_check(nodes)
+            try:
+                idx = indices[filled_cell_index]
+                if puzzle[idx]:
+                    if prop is not None:
+                        prop.undo(marks[filled_cell_index])
+                    cm.update_neighbors(idx, puzzle[idx], remove=True)
+                digit = next(iters[filled_cell_index])
+                nodes += 1
+                puzzle[idx] = digit
+                cm.update_neighbors(idx, digit)
+                if prop is not None:
+                    marks[filled_cell_index] = prop.mark()
+                    if not prop.propagate(idx):
+                        continue
+                next_idx = cm.pop_most_constrained_cell()
+                if next_idx == -1:
+                    solutions += 1
+                    if budget is not None:
+                        budget.nodes = nodes
+                    yield puzzle
+                elif nogoods is not None and cm.key in nogoods:
+                    cm.update_empty_cells(next_idx, add=True)
+                else:
+                    filled_cell_index += 1
+                    if nogoods is not None:
+                        keys[filled_cell_index] = cm.key
+                        found[filled_cell_index] = solutions
+                    digit_iter = digit_source.gen_digits(next_idx)
+                    indices[filled_cell_index] = next_idx
+                    iters[filled_cell_index] = digit_iter
+            except StopIteration:
+                if nogoods is not None and found[filled_cell_index] == solutions:
+                    nogoods.add(keys[filled_cell_index])
+                indices[filled_cell_index] = None
+                iters[filled_cell_index] = None
+                filled_cell_index -= 1
+                puzzle[idx] = 0
+                cm.update_empty_cells(idx, add=True)
+    finally:
+        # stopped early: unwind the cells still held by the search, deepest first
+        for i in range(filled_cell_index, -1, -1):
+            idx = indices[i]
+            if puzzle[idx]:
+                if prop is not None:
+                    prop.undo(marks[i])
+                cm.update_neighbors(idx, puzzle[idx], remove=True)
+                puzzle[idx] = 0
+            cm.update_empty_cells(idx, add=True)
+        if prop is not None:
+            prop.undo(base)
+        if budget is not None:
+            budget.nodes = nodes
+
+def dlx_solver(puzzle: list, limit: int = 2) -> list[list]:
+    """
+    Solve a Sudoku puzzle as an exact-cover problem with Dancing Links.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+                       Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
+
+    Returns:
+        list[list]: A list of solutions (each solution is a list of 81 integers).
+                    Stops when the number of solutions reaches 'limit'.
+    """
+    if not utils.is_valid_sudoku(puzzle):
+        raise InvalidSudokuError
+    return DancingLinks(puzzle).solve(limit)
+
+def sat_solver(puzzle: list, limit: int = 2) -> list[list]:
+    """
+    Solve a Sudoku puzzle with the CDCL SAT solver of `src.sat`.
+
+    Args:
+        puzzle (list): Flat list of 81 integers representing the Sudoku grid
+                       (N⁴ for an N²×N² board, box length N in 2–5).
+                       Empty cells should be 0.
+        limit (int, optional): Maximum number of solutions to find. Defaults to 2.
+
+    Returns:
+        list[list]: A list of solutions (each solution is a list of 81 integers).
+                    Stops when the number of solutions reaches 'limit'.
+    """
+    # imported here: most callers never need the SAT solver, and workers start faster without it
+    from src import sat
+
+    return sat.solve(puzzle, limit)
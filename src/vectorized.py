@@ -0,0 +1,255 @@
+"""
+Vectorized batch solving with NumPy.
+
+Many puzzles are advanced in lockstep: the grids are held as an (N, 81)
+uint8 array and the digits placed in every row, column and box as an
+(N, 27) array of 9-bit masks. Naked and hidden singles are applied to all
+puzzles at once with array operations, and only the puzzles that
+propagation cannot finish are handed to `backtrack_iterative_solver`.
+`validate_batch` checks puzzles or solutions in bulk the same way.
+
+Requires NumPy.
+"""
+
+import itertools
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+from src.constants import *
+from src.errors import *
+from src.batch import BatchResult
+from src import sudoku_solver
+
+# Cells of each unit, and the row, column and box unit of each cell.
+UNIT_CELLS = np.array(UNITS, dtype=np.intp)
+CELL_ROW = np.array(ROW_OF, dtype=np.intp)
+CELL_COL = np.array(COL_OF, dtype=np.intp) + SUDOKU_LENGTH
+CELL_BOX = np.array(BOX_OF, dtype=np.intp) + 2 * SUDOKU_LENGTH
+
+# Digit bit of each cell value (0 for empty cells).
+_BITS = np.array([0] + [1 << d for d in range(SUDOKU_LENGTH)], dtype=np.uint16)
+# Number of digits in each mask, and the digit of each single-digit mask.
+_POPCOUNT = np.array([m.bit_count() for m in range(DIGITS_MASK + 1)], dtype=np.uint8)
+_DIGIT_OF = np.array([m.bit_length() if m.bit_count() == 1 else 0 for m in range(DIGITS_MASK + 1)],
+                     dtype=np.uint8)
+
+# Status of each puzzle after propagation.
+STUCK, SOLVED, UNSOLVABLE, INVALID = range(4)
+
+# Number of puzzles propagated together by solve_batch.
+BATCH_SIZE = 4096
+
+# Reason a grid fails validate_batch, checked in this order.
+VALID, BAD_VALUE, DUPLICATE, EMPTY_CELL, MISMATCH = range(5)
+REASONS = ("valid", "value out of range", "duplicate digit", "empty cell", "given changed")
+_UNIT_KINDS = ("row", "column", "box")
+
+
+def _unit_masks(bits: np.ndarray) -> np.ndarray:
+    """Return the (N, 27) masks of the digit bits of every unit."""
+    return np.bitwise_or.reduce(bits[:, UNIT_CELLS], axis=2)
+
+
+def _has_duplicates(bits: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """Return which puzzles place a digit twice in a unit, given their unit masks."""
+    return (bits[:, UNIT_CELLS].sum(axis=2, dtype=np.uint16) != masks).any(axis=1)
+
+
+class Validation(NamedTuple):
+    """
+    Outcome of `validate_batch`.
+
+    Attributes:
+        valid (np.ndarray): (N,) bool array, True for the grids that pass.
+        reason (np.ndarray): (N,) uint8 array of VALID, BAD_VALUE, DUPLICATE,
+            EMPTY_CELL or MISMATCH: the first check each grid fails.
+        where (np.ndarray): (N,) int16 array locating the failure: the first
+            offending cell, or the unit (rows 0-8, columns 9-17, boxes 18-26)
+            for DUPLICATE. -1 for valid grids.
+    """
+    valid: np.ndarray
+    reason: np.ndarray
+    where: np.ndarray
+
+    def failures(self) -> dict[int, str]:
+        """Return a description of the failure of every invalid grid, by index."""
+        messages = {}
+        for i in np.flatnonzero(~self.valid).tolist():
+            reason, where = int(self.reason[i]), int(self.where[i])
+            if reason == DUPLICATE:
+                kind, number = divmod(where, SUDOKU_LENGTH)
+                messages[i] = f"{REASONS[reason]} in {_UNIT_KINDS[kind]} {number}"
+            else:
+                messages[i] = f"{REASONS[reason]} at cell {where}"
+        return messages
+
+
+def validate_batch(grids, *, solved: bool = False, givens=None) -> Validation:
+    """
+    Check a whole batch of grids for out-of-range values and repeated digits.
+
+    All checks are array operations over the batch; no Python code runs per
+    grid unless `Validation.failures` is asked for the messages.
+
+    Args:
+        grids: Grids as flat lists of 81 integers, or an (N, 81) integer array.
+        solved (bool, optional): Also require every cell to be filled, i.e.
+            check complete solutions. Defaults to False.
+        givens (optional): Puzzles the grids were solved from, same shape as
+            'grids'. Each grid must keep their nonzero cells. Defaults to None.
+
+    Returns:
+        Validation: The validity mask, the reason of each failure and where it was found.
+
+    Raises:
+        PuzzleFormatError: If the grids (or the givens) are not an (N, 81) batch.
+    """
+    grids = np.asarray(grids)
+    if grids.ndim != 2 or grids.shape[1] != SUDOKU_SIZE:
+        raise PuzzleFormatError(f"Expected an (N, {SUDOKU_SIZE}) batch, got shape {grids.shape}")
+    reason = np.zeros(len(grids), dtype=np.uint8)
+    where = np.full(len(grids), -1, dtype=np.int16)
+
+    def fail(code, found):
+        # record 'code' for the grids failing only this check so far, at their first hit
+        hit = found.any(axis=1) & (reason == VALID)
+        reason[hit] = code
+        where[hit] = found[hit].argmax(axis=1)
+
+    bad = (grids < 0) | (grids > SUDOKU_LENGTH)
+    fail(BAD_VALUE, bad)
+    cells = np.where(bad, 0, grids).astype(np.uint8) if reason.any() else grids.astype(np.uint8, copy=False)
+    bits = _BITS[cells][:, UNIT_CELLS]
+    # distinct digits have distinct bits, so a unit's sum exceeds its union exactly when a digit repeats
+    fail(DUPLICATE, bits.sum(axis=2, dtype=np.uint16) != np.bitwise_or.reduce(bits, axis=2))
+    if solved:
+        fail(EMPTY_CELL, cells == 0)
+    if givens is not None:
+        givens = np.asarray(givens)
+        if givens.shape != grids.shape:
+            raise PuzzleFormatError(f"Expected givens of shape {grids.shape}, got {givens.shape}")
+        fail(MISMATCH, (givens != 0) & (givens != grids))
+    return Validation(reason == VALID, reason, where)
+
+
+class VectorizedBatch:
+    """
+    A batch of puzzles propagated together.
+
+    Attributes:
+        grids (np.ndarray): (N, 81) uint8 array of the grids, updated in place.
+        units (np.ndarray): (N, 27) uint16 array of the digits placed in each
+            row (0-8), column (9-17) and box (18-26) as 9-bit masks.
+        status (np.ndarray): (N,) uint8 array of STUCK, SOLVED, UNSOLVABLE or INVALID.
+    """
+
+    def __init__(self, puzzles):
+        """
+        Args:
+            puzzles: Puzzles as flat lists of 81 integers, or an (N, 81) array.
+
+        Raises:
+            PuzzleFormatError: If the puzzles do not have 81 cells each.
+        """
+        grids = np.array(puzzles, dtype=np.int64)
+        if grids.ndim != 2 or grids.shape[1] != SUDOKU_SIZE:
+            raise PuzzleFormatError(f"Expected an (N, {SUDOKU_SIZE}) batch, got shape {grids.shape}")
+        out_of_range = ((grids < 0) | (grids > SUDOKU_LENGTH)).any(axis=1)
+        grids[out_of_range] = 0
+        self.grids = grids.astype(np.uint8)
+        bits = _BITS[self.grids]
+        self.units = _unit_masks(bits)
+        self.status = np.full(len(self.grids), STUCK, dtype=np.uint8)
+        self.status[out_of_range | _has_duplicates(bits, self.units)] = INVALID
+        self.status[(self.status == STUCK) & (self.grids != 0).all(axis=1)] = SOLVED
+
+    def __len__(self) -> int:
+        return len(self.grids)
+
+    def candidates(self, rows=slice(None)) -> np.ndarray:
+        """
+        Return the (n, 81) uint16 candidate masks of the given puzzles, 0 for filled cells.
+        """
+        units = self.units[rows]
+        free = ~(units[:, CELL_ROW] | units[:, CELL_COL] | units[:, CELL_BOX]) & DIGITS_MASK
+        return np.where(self.grids[rows] == 0, free, 0).astype(np.uint16)
+
+    def propagate(self) -> np.ndarray:
+        """
+        Apply naked and hidden singles to every stuck puzzle until none of them changes.
+
+        All singles found in a round are placed at once. Puzzles that reach a
+        contradiction (a cell or a unit digit without candidates, or two
+        singles clashing) are marked UNSOLVABLE, completed ones SOLVED.
+
+        Returns:
+            np.ndarray: The status of every puzzle.
+        """
+        active = np.flatnonzero(self.status == STUCK)
+        while active.size:
+            grids = self.grids[active]
+            units = self.units[active]
+            cand = self.candidates(active)
+            dead = ((grids == 0) & (cand == 0)).any(axis=1)
+            # digits seen once and at least twice among the candidates of each unit
+            unit_cand = cand[:, UNIT_CELLS]
+            once = np.zeros_like(units)
+            twice = np.zeros_like(units)
+            for k in range(SUDOKU_LENGTH):
+                twice |= once & unit_cand[:, :, k]
+                once |= unit_cand[:, :, k]
+            dead |= ((once | units) != DIGITS_MASK).any(axis=1)
+            hidden = once & ~twice
+            place = np.where(_POPCOUNT[cand] == 1, cand, 0)
+            place |= cand & (hidden[:, CELL_ROW] | hidden[:, CELL_COL] | hidden[:, CELL_BOX])
+            # a cell forced to two digits, or a digit forced twice in a unit
+            dead |= (_POPCOUNT[place] > 1).any(axis=1)
+            placed = _unit_masks(place)
+            dead |= _has_duplicates(place, placed)
+            self.status[active[dead]] = UNSOLVABLE
+            progress = ~dead & (place != 0).any(axis=1)
+            rows = active[progress]
+            self.grids[rows] = grids[progress] + _DIGIT_OF[place[progress]]
+            self.units[rows] = units[progress] | placed[progress]
+            done = (self.grids[rows] != 0).all(axis=1)
+            self.status[rows[done]] = SOLVED
+            active = rows[~done]
+        return self.status
+
+
+def solve_batch(puzzles: Iterable[list[int]], limit: int = 2, *, batch_size: int = BATCH_SIZE,
+                **options) -> Iterator[BatchResult]:
+    """
+    Solve many puzzles, propagating singles on all of them at once.
+
+    Puzzles are read in batches of 'batch_size'. Puzzles finished by
+    propagation alone have a unique solution; the rest are solved from their
+    propagated state with backtrack_iterative_solver.
+
+    Args:
+        puzzles (Iterable[list[int]]): Puzzles as flat lists of 81 integers.
+        limit (int, optional): Maximum number of solutions per puzzle. Defaults to 2.
+        batch_size (int, optional): Number of puzzles propagated together. Defaults to BATCH_SIZE.
+        **options: Keyword arguments passed on to backtrack_iterative_solver
+            (engine, propagate, strong).
+
+    Yields:
+        BatchResult: One result per puzzle, in input order. Puzzles with
+        conflicting givens have `solutions` set to None and an InvalidSudokuError in `error`.
+    """
+    puzzles = iter(puzzles)
+    offset = 0
+    while chunk := [list(p) for p in itertools.islice(puzzles, batch_size)]:
+        batch = VectorizedBatch(chunk)
+        status = batch.propagate()
+        for i, grid in enumerate(batch.grids.tolist()):
+            if status[i] == SOLVED:
+                yield BatchResult(offset + i, [grid], None)
+            elif status[i] == UNSOLVABLE:
+                yield BatchResult(offset + i, [], None)
+            elif status[i] == INVALID:
+                yield BatchResult(offset + i, None, InvalidSudokuError(f"Puzzle {offset + i} is not valid"), None)
+            else:
+                yield BatchResult(offset + i, sudoku_solver.backtrack_iterative_solver(grid, limit, **options), None)
+        offset += len(chunk)
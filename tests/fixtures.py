@@ -0,0 +1,18 @@
+"""Puzzles shared by the test modules."""
+
+# A 9×9 puzzle with a single solution, and that solution.
+VALID_PUZZLE = [0, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1, 0,
+                0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7, 4, 0,
+                4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
+SOLUTION = [4, 3, 5, 2, 6, 9, 7, 8, 1, 6, 8, 2, 5, 7, 1, 4, 9, 3, 1, 9, 7, 8, 3, 4, 5, 6, 2, 8, 2, 6, 1, 9, 5,
+            3, 4, 7, 3, 7, 4, 6, 8, 2, 9, 1, 5, 9, 5, 1, 7, 4, 3, 6, 2, 8, 5, 1, 9, 3, 2, 6, 8, 7, 4, 2, 4, 8,
+            9, 5, 7, 1, 3, 6, 7, 6, 3, 4, 1, 8, 2, 5, 9]
+
+# VALID_PUZZLE with a 2 given twice in the first row.
+INVALID_PUZZLE = [2] + VALID_PUZZLE[1:]
+
+# VALID_PUZZLE with its first two rows emptied: many solutions.
+MULTI_PUZZLE = [0] * 18 + VALID_PUZZLE[18:]
+
+# A 17-clue puzzle that takes a plain backtracking search many nodes.
+HARD_PUZZLE = [int(c) for c in "000000010400000000020000000000050407008000300001090000300400200050100000000806000"]
@@ -0,0 +1,92 @@
+import concurrent.futures
+import os
+import signal
+import unittest
+
+from src.errors import *
+from src import batch
+from src.bitboardMap import BitboardMap
+from fixtures import VALID_PUZZLE, SOLUTION, INVALID_PUZZLE
+
+
+class DyingEngine(BitboardMap):
+    """Engine killing the worker process it runs in when given an empty grid."""
+
+    def __init__(self, puzzle):
+        if not any(puzzle):
+            os.kill(os.getpid(), signal.SIGKILL)
+        super().__init__(puzzle)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = list(SOLUTION)
+        self.invalid_puzzle = list(INVALID_PUZZLE)
+
+    @classmethod
+    def tearDownClass(cls):
+        batch.close_pool()
+
+    def test_solve_many(self):
+        puzzles = [self.valid_puzzle, self.invalid_puzzle, self.valid_puzzle]
+        results = list(batch.solve_many(puzzles, workers=2, engine=BitboardMap, propagate=True))
+        self.assertListEqual([r.index for r in results], [0, 1, 2])
+        self.assertListEqual(results[0].solutions, [self.solution])
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].solutions)
+        self.assertIsInstance(results[1].error, InvalidSudokuError)
+        self.assertListEqual(results[2].solutions, [self.solution])
+        self.assertListEqual([r.status for r in results], ["complete", None, "complete"])
+
+    def test_node_budget(self):
+        puzzles = [[0] * 81, self.valid_puzzle]
+        results = list(batch.solve_many(puzzles, limit=None, workers=2, max_nodes=100, engine=BitboardMap))
+        self.assertEqual(results[0].status, "node_limit")
+        self.assertGreater(len(results[0].solutions), 0)
+        self.assertEqual(results[1].status, "complete")
+        self.assertListEqual(results[1].solutions, [self.solution])
+
+    def test_count_only(self):
+        puzzles = [[0] * 81, self.valid_puzzle, self.invalid_puzzle]
+        results = list(batch.solve_many(puzzles, limit=None, workers=2, max_nodes=100, count_only=True))
+        self.assertEqual((results[0].solutions, results[0].status), ([], "node_limit"))
+        self.assertGreater(results[0].count, 0)
+        self.assertEqual((results[1].solutions, results[1].count), ([], 1))
+        self.assertIsNone(results[2].count)
+
+    def test_unordered_and_pool_reuse(self):
+        pool = batch.get_pool(2)
+        puzzles = (self.valid_puzzle for _ in range(5))
+        results = list(batch.solve_many(puzzles, workers=2, chunksize=2, ordered=False, engine=BitboardMap))
+        self.assertListEqual(sorted(r.index for r in results), [0, 1, 2, 3, 4])
+        self.assertTrue(all(r.solutions == [self.solution] for r in results))
+        self.assertIs(batch.get_pool(2), pool)
+
+    def test_bounded_in_flight(self):
+        pulled = []
+        def puzzles():
+            for i in range(50):
+                pulled.append(i)
+                yield self.valid_puzzle
+        for ordered in (True, False):
+            pulled.clear()
+            results = batch.solve_many(puzzles(), workers=2, max_in_flight=4, ordered=ordered, engine=BitboardMap)
+            next(results)
+            self.assertLessEqual(len(pulled), 5)
+            self.assertEqual(sum(1 for _ in results), 49)
+
+    def test_dead_worker(self):
+        puzzles = [self.valid_puzzle, [0] * 81, self.valid_puzzle, self.valid_puzzle]
+        for ordered in (True, False):
+            pool = batch.get_pool(1)
+            # one chunk at a time, so only the chunk of the killed worker is lost
+            results = sorted(batch.solve_many(puzzles, workers=1, max_in_flight=1, ordered=ordered,
+                                              engine=DyingEngine), key=lambda r: r.index)
+            self.assertListEqual([r.index for r in results], [0, 1, 2, 3])
+            self.assertIsInstance(results[1].error, concurrent.futures.process.BrokenProcessPool)
+            self.assertIsNone(results[1].solutions)
+            self.assertTrue(all(results[i].solutions == [self.solution] for i in (0, 2, 3)))
+            # the broken pool was replaced
+            self.assertIsNot(batch.get_pool(1), pool)
@@ -0,0 +1,65 @@
+import unittest
+
+from src.errors import *
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+
+
+class TestBitboardMap(unittest.TestCase):
+
+    def setUp(self):
+        self.bm = BitboardMap()
+
+    def tearDown(self):
+        pass
+
+    def test_update_neighbors(self):
+        self.bm.update_constraint_map([0]*81)
+        self.bm.update_neighbors(0, 9)
+        # same row, same column, same box and an unrelated cell
+        self.assertEqual(self.bm[1], 0b100000000)
+        self.assertEqual(self.bm[72], 0b100000000)
+        self.assertEqual(self.bm[20], 0b100000000)
+        self.assertEqual(self.bm[40], 0)
+        self.assertEqual(self.bm.candidates(1), 0b011111111)
+        self.bm.update_neighbors(0, 9, remove=True)
+        self.assertEqual(self.bm[1], 0)
+
+    def test_update_constraint_map(self):
+        puzzle = [0]*81
+        puzzle[0] = 1
+        puzzle[8] = 3
+        puzzle[50] = 3
+        self.bm.update_constraint_map(puzzle)
+        self.assertEqual(list(self.bm.gen_digits(5)), [2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(list(self.bm.gen_digits(40)), [1, 2, 4, 5, 6, 7, 8, 9])
+        empty_cells = set(i for i in range(81))
+        empty_cells.difference_update({0, 8, 50})
+        self.assertSetEqual(self.bm._empty_cells, empty_cells)
+        # a digit repeated within a unit is rejected
+        puzzle[1] = 1
+        with self.assertRaises(InvalidSudokuError):
+            self.bm.update_constraint_map(puzzle)
+
+    def test_matches_constraint_map(self):
+        puzzle = [0]*81
+        puzzle[0] = 1
+        puzzle[8] = 3
+        puzzle[50] = 3
+        puzzle[41] = 4
+        cm = ConstraintMap(puzzle)
+        self.bm.update_constraint_map(puzzle)
+        for i in range(81):
+            if not puzzle[i]:
+                self.assertEqual(self.bm.candidates(i), cm.candidates(i))
+                self.assertListEqual(list(self.bm.gen_digits(i)), list(cm.gen_digits(i)))
+
+    def test_pop_most_constrained_cell(self):
+        puzzle = [0]*81
+        puzzle[0] = 1
+        puzzle[8] = 3
+        puzzle[50] = 3
+        puzzle[41] = 4
+        self.bm.update_constraint_map(puzzle)
+        self.assertEqual(self.bm.pop_most_constrained_cell(), 5)
+        self.assertNotIn(5, self.bm._empty_cells)
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from src.errors import *
+from src.board import BOX_LENGTHS, get_board, board_of
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+from src import sudoku_solver
+from src import utils
+
+
+def pattern_grid(n: int, rng: random.Random) -> list[int]:
+    """A complete N²×N² grid with its digits relabeled at random."""
+    length = n * n
+    labels = [0] + rng.sample(range(1, length + 1), length)
+    return [labels[(r % n * n + r // n + c) % length + 1] for r in range(length) for c in range(length)]
+
+
+class TestBoard(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_tables(self):
+        for n in BOX_LENGTHS:
+            board = get_board(n)
+            length = n * n
+            self.assertIs(board_of([0] * length ** 2), board)
+            self.assertEqual(len(board.units), 3 * length)
+            neighbors = utils.gen_neighbor_cells(n)
+            for cell in range(board.sudoku_size):
+                self.assertEqual(len(board.neighbors[cell]), 2 * (length - 1) + (n - 1) ** 2)
+                self.assertSetEqual(set(board.neighbors[cell]), neighbors[cell])
+                row, col, box = utils.get_coord(cell, n)
+                self.assertEqual(board.units_of[cell], (row, length + col, 2 * length + box))
+                for unit in board.units_of[cell]:
+                    self.assertIn(cell, board.units[unit])
+            for mask in [0, board.digits_mask] + [self.rng.getrandbits(length) for _ in range(50)]:
+                digits = tuple(d for d in range(1, length + 1) if mask >> (d - 1) & 1)
+                self.assertEqual(tuple(board.mask_digits[mask]), digits)
+        self.assertIs(get_board(), get_board(3))
+        with self.assertRaises(ValueError):
+            get_board(6)
+        with self.assertRaises(PuzzleFormatError):
+            board_of([0] * 100)
+
+    def test_engines_agree(self):
+        for n in (2, 4, 5):
+            grid = pattern_grid(n, self.rng)
+            puzzle = [0 if self.rng.random() < 0.6 else v for v in grid]
+            cm, bb = ConstraintMap(puzzle), BitboardMap(puzzle)
+            for cell in range(len(puzzle)):
+                if not puzzle[cell]:
+                    self.assertEqual(cm.candidates(cell), bb.candidates(cell))
+                    self.assertTrue(bb.candidates(cell) >> (grid[cell] - 1) & 1)
+            self.assertTrue(utils.is_valid_sudoku(puzzle))
+            puzzle[1] = puzzle[0] = 1
+            self.assertFalse(utils.is_valid_sudoku(puzzle))
+
+    def test_solvers(self):
+        for n in (2, 4, 5):
+            grid = pattern_grid(n, self.rng)
+            puzzle = [0 if self.rng.random() < 0.4 else v for v in grid]
+            expected = sudoku_solver.count_solutions(puzzle, 2, engine=BitboardMap, propagate=True)
+            self.assertGreater(expected, 0)
+            for solve in (lambda p: sudoku_solver.backtrack_iterative_solver(p, propagate=True),
+                          lambda p: sudoku_solver.backtrack_iterative_solver(p, engine=BitboardMap, propagate=True),
+                          lambda p: sudoku_solver.backtrack_recursive_solver(p, engine=BitboardMap),
+                          sudoku_solver.dlx_solver, sudoku_solver.sat_solver):
+                solutions = solve(list(puzzle))
+                self.assertEqual(len(solutions), expected)
+                for solution in solutions:
+                    self.assertNotIn(0, solution)
+                    self.assertTrue(utils.is_valid_sudoku(solution))
+                    self.assertTrue(all(g in (0, s) for g, s in zip(puzzle, solution)))
+
+    def test_count_4x4(self):
+        # there are 288 complete 4×4 grids
+        for options in ({}, {"engine": BitboardMap}, {"propagate": True}, {"strong": True}):
+            self.assertEqual(sudoku_solver.count_solutions([0] * 16, **options), 288)
+        self.assertEqual(len(sudoku_solver.dlx_solver([0] * 16, limit=None)), 288)
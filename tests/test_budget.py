@@ -0,0 +1,113 @@
+import threading
+import unittest
+
+from src.errors import *
+from src import budget
+from src import sudoku_solver
+from src.bitboardMap import BitboardMap
+from src.budget import CancelToken
+from src.solverCore import SolverCore
+from src.stats import SearchStats
+from fixtures import VALID_PUZZLE, INVALID_PUZZLE, HARD_PUZZLE
+
+
+class TestBoundedSolver(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        # 17-clue puzzle that takes thousands of nodes without propagation
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    def test_complete(self):
+        stats = SearchStats()
+        result = sudoku_solver.bounded_solver(self.hard_puzzle, timeout=60, max_nodes=10**6,
+                                              engine=BitboardMap, stats=stats)
+        self.assertEqual(result.status, budget.COMPLETE)
+        self.assertListEqual(result.solutions,
+                             sudoku_solver.backtrack_iterative_solver(list(self.hard_puzzle), engine=BitboardMap))
+        self.assertEqual(result.nodes, stats.nodes)
+        self.assertGreaterEqual(result.elapsed, 0)
+        # without limits the result is the same
+        result = sudoku_solver.bounded_solver(self.valid_puzzle)
+        self.assertEqual(result.status, budget.COMPLETE)
+        self.assertEqual(len(result.solutions), 1)
+
+    def test_node_limit(self):
+        for max_nodes in (0, 5, 100):
+            puzzle = list(self.hard_puzzle)
+            stats = SearchStats()
+            result = sudoku_solver.bounded_solver(puzzle, max_nodes=max_nodes, engine=BitboardMap, stats=stats)
+            self.assertEqual(result.status, budget.NODE_LIMIT)
+            self.assertEqual(result.nodes, max_nodes)
+            self.assertEqual(stats.nodes, max_nodes)
+            self.assertListEqual(result.solutions, [])
+            self.assertListEqual(puzzle, self.hard_puzzle)
+        # solutions found before the limit are kept
+        puzzle = list(self.valid_puzzle)
+        puzzle[:27] = [0] * 27
+        result = sudoku_solver.bounded_solver(puzzle, limit=None, max_nodes=500, engine=BitboardMap)
+        self.assertEqual(result.status, budget.NODE_LIMIT)
+        self.assertGreater(len(result.solutions), 0)
+        self.assertTrue(all(0 not in s and sudoku_solver.utils.is_valid_sudoku(s) for s in result.solutions))
+        self.assertEqual(result.count, len(result.solutions))
+
+    def test_count_only(self):
+        puzzle = list(self.valid_puzzle)
+        puzzle[:27] = [0] * 27
+        count = sudoku_solver.count_solutions(puzzle)
+        for engine, propagate in ((BitboardMap, False), (SolverCore, None)):
+            result = sudoku_solver.bounded_solver(puzzle, limit=None, engine=engine, propagate=propagate,
+                                                  count_only=True)
+            self.assertEqual((result.solutions, result.status, result.count), ([], budget.COMPLETE, count))
+            result = sudoku_solver.bounded_solver(puzzle, limit=3, engine=engine, propagate=propagate,
+                                                  count_only=True)
+            self.assertEqual(result.count, 3)
+            # a budget stops the count with the solutions counted so far
+            result = sudoku_solver.bounded_solver([0] * 81, limit=None, max_nodes=100, engine=engine,
+                                                  propagate=propagate, count_only=True)
+            self.assertEqual((result.solutions, result.status), ([], budget.NODE_LIMIT))
+            self.assertGreater(result.count, 0)
+
+    def test_search_restores_puzzle(self):
+        given = list(self.valid_puzzle)
+        given[:27] = [0] * 27
+        for propagate in (False, True):
+            puzzle = list(given)
+            limits = budget.Budget(max_nodes=50)
+            for _ in sudoku_solver._search(puzzle, BitboardMap, propagate, False, budget=limits):
+                pass
+            self.assertEqual(limits.status, budget.NODE_LIMIT)
+            self.assertListEqual(puzzle, given)
+
+    def test_timeout(self):
+        result = sudoku_solver.bounded_solver(self.hard_puzzle, timeout=0)
+        self.assertEqual(result.status, budget.TIMEOUT)
+        self.assertEqual(result.nodes, budget.CHECK_INTERVAL)
+        # enumerating every grid would never end
+        result = sudoku_solver.bounded_solver([0] * 81, limit=None, timeout=0.05, engine=BitboardMap)
+        self.assertEqual(result.status, budget.TIMEOUT)
+        self.assertGreater(len(result.solutions), 0)
+        self.assertLess(result.elapsed, 1)
+
+    def test_cancel(self):
+        token = CancelToken()
+        token.cancel()
+        result = sudoku_solver.bounded_solver(self.hard_puzzle, cancel=token)
+        self.assertEqual(result.status, budget.CANCELLED)
+        self.assertListEqual(result.solutions, [])
+        # cancelled from another thread while searching
+        token = CancelToken()
+        timer = threading.Timer(0.05, token.cancel)
+        timer.start()
+        result = sudoku_solver.bounded_solver([0] * 81, limit=None, cancel=token, engine=BitboardMap)
+        timer.join()
+        self.assertEqual(result.status, budget.CANCELLED)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, timeout=-1)
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, max_nodes=-1)
+        invalid = list(INVALID_PUZZLE)
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.bounded_solver(invalid)
@@ -0,0 +1,91 @@
+import os
+import pathlib
+import random
+import tempfile
+import unittest
+
+from src.errors import *
+from src import cache
+from src import puzzle_io
+from src import sudoku_solver
+from src import utils
+from src.bitboardMap import BitboardMap
+
+PUZZLE_FILE_17 = pathlib.Path(__file__).parent.parent / "data" / "17_clue_puzzles.json"
+OPTIONS = {"engine": BitboardMap, "propagate": True}
+
+
+def transformed(puzzle: list[int], rng: random.Random) -> list[int]:
+    """Apply a random symmetry (transposition, band/row/stack/column permutations, relabeling)."""
+    grid = [puzzle[r * 9:(r + 1) * 9] for r in range(9)]
+    if rng.random() < 0.5:
+        grid = [list(column) for column in zip(*grid)]
+    rows = [b * 3 + r for b in rng.sample(range(3), 3) for r in rng.sample(range(3), 3)]
+    cols = [s * 3 + c for s in rng.sample(range(3), 3) for c in rng.sample(range(3), 3)]
+    labels = [0] + rng.sample(range(1, 10), 9)
+    return [labels[grid[r][c]] for r in rows for c in cols]
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.puzzles = list(puzzle_io.read_puzzles(PUZZLE_FILE_17))[:20]
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_canonical_form(self):
+        for puzzle in self.puzzles:
+            canonical, transform = cache.canonical_form(puzzle)
+            self.assertEqual("".join(map(str, transform.apply(puzzle))), canonical)
+            self.assertListEqual(transform.invert(transform.apply(puzzle)), puzzle)
+            for _ in range(3):
+                self.assertEqual(cache.canonical_form(transformed(puzzle, self.rng))[0], canonical)
+        self.assertEqual(cache.canonical_form([0] * 81)[0], "0" * 81)
+        self.assertNotEqual(cache.canonical_form(self.puzzles[0])[0], cache.canonical_form(self.puzzles[1])[0])
+        with self.assertRaises(InvalidSudokuError):
+            cache.canonical_form([1, 1] + [0] * 79)
+
+    def test_solve_maps_back(self):
+        solutions = cache.SolutionCache(**OPTIONS)
+        for puzzle in self.puzzles[:5]:
+            expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), **OPTIONS)
+            self.assertListEqual(solutions.solve(puzzle), expected)
+            variant = transformed(puzzle, self.rng)
+            self.assertListEqual(solutions.solve(variant), sudoku_solver.backtrack_iterative_solver(list(variant), **OPTIONS))
+        self.assertEqual(solutions.cache_info(), cache.CacheInfo(hits=5, misses=5, evictions=0, disk_hits=0, size=5))
+
+    def test_limit(self):
+        puzzle = self.puzzles[0][:]
+        for cell in range(81):
+            if puzzle[cell]:
+                puzzle[cell] = 0
+                break
+        solutions = cache.SolutionCache(**OPTIONS)
+        self.assertEqual(len(solutions.solve(puzzle, 1)), 1)
+        found = solutions.solve(puzzle, 3)
+        self.assertEqual(solutions.cache_info().misses, 2)
+        self.assertEqual(len(solutions.solve(puzzle, 2)), 2)
+        self.assertEqual(solutions.cache_info().hits, 1)
+        for solution in found:
+            self.assertTrue(utils.is_valid_sudoku(solution))
+            self.assertTrue(all(g in (0, s) for g, s in zip(puzzle, solution)))
+
+    def test_eviction(self):
+        solutions = cache.SolutionCache(maxsize=2, **OPTIONS)
+        for puzzle in self.puzzles[:3]:
+            solutions.solve(puzzle)
+        solutions.solve(self.puzzles[2])
+        solutions.solve(self.puzzles[0])
+        self.assertEqual(solutions.cache_info(), cache.CacheInfo(hits=1, misses=4, evictions=2, disk_hits=0, size=2))
+
+    def test_persistence(self):
+        path = os.path.join(self.tmp.name, "solutions.sqlite")
+        with cache.SolutionCache(path=path, **OPTIONS) as solutions:
+            solutions.solve(self.puzzles[0])
+        with cache.SolutionCache(path=path, **OPTIONS) as solutions:
+            variant = transformed(self.puzzles[0], self.rng)
+            self.assertListEqual(solutions.solve(variant), sudoku_solver.backtrack_iterative_solver(list(variant), **OPTIONS))
+            self.assertEqual(solutions.cache_info(), cache.CacheInfo(hits=1, misses=0, evictions=0, disk_hits=1, size=1))
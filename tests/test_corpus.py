@@ -0,0 +1,112 @@
+import io
+import os
+import pathlib
+import pickle
+import tempfile
+import unittest
+
+from src.errors import *
+from src import corpus
+from src import puzzle_io
+from src import sudoku_solver
+
+PUZZLE_FILE_17 = pathlib.Path(__file__).parent.parent / "data" / "17_clue_puzzles.json"
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.puzzles = list(puzzle_io.read_puzzles(PUZZLE_FILE_17))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def test_pack_grid(self):
+        for grid in ([0] * 81, list(range(10)) * 8 + [9], self.puzzles[0]):
+            record = corpus.pack_grid(grid)
+            self.assertEqual(len(record), corpus.RECORD_SIZE)
+            self.assertListEqual(corpus.unpack_grid(record), grid)
+        with self.assertRaises(PuzzleFormatError):
+            corpus.pack_grid([10] * 81)
+
+    def test_convert_and_index(self):
+        count = corpus.convert(PUZZLE_FILE_17, self.path("17.sdkc"), metadata={"source": "17-clue"})
+        self.assertEqual(count, 1000)
+        self.assertEqual(os.path.getsize(self.path("17.sdkc")),
+                         corpus.HEADER_SIZE + 1000 * corpus.RECORD_SIZE + len(b'{"source": "17-clue"}'))
+        with corpus.Corpus(self.path("17.sdkc")) as c:
+            self.assertEqual(len(c), 1000)
+            self.assertEqual(c.metadata, {"source": "17-clue"})
+            self.assertFalse(c.has_solutions)
+            self.assertListEqual(c[0], self.puzzles[0])
+            self.assertListEqual(c[-1], self.puzzles[-1])
+            self.assertListEqual(list(c[10:20]), self.puzzles[10:20])
+            self.assertListEqual(list(c[::100][1:3]), [self.puzzles[100], self.puzzles[200]])
+            subset = c.take([999, 5, 42])
+            self.assertListEqual(list(subset), [self.puzzles[999], self.puzzles[5], self.puzzles[42]])
+            self.assertEqual(bytes(c.record(3)), corpus.pack_grid(self.puzzles[3]))
+            # views survive pickling, as when sent to worker processes
+            self.assertListEqual(list(pickle.loads(pickle.dumps(subset))), list(subset))
+            self.assertEqual(len(pickle.loads(pickle.dumps(c))), 1000)
+            with self.assertRaises(LookupError):
+                c.solution(0)
+
+    def test_close(self):
+        corpus.convert(PUZZLE_FILE_17, self.path("17.sdkc"))
+        c = corpus.Corpus(self.path("17.sdkc"))
+        subset = c[10:20]
+        mapping = c._shared.data
+        # the mapping outlives the view it was opened with while another view uses it
+        c.close()
+        c.close()
+        self.assertFalse(mapping.closed)
+        self.assertListEqual(subset[0], self.puzzles[10])
+        subset.close()
+        self.assertTrue(mapping.closed)
+
+    def test_solutions_column(self):
+        puzzle_io.write_puzzles(self.path("small.txt"), self.puzzles[:5])
+        corpus.convert(self.path("small.txt"), self.path("small.sdkc"), solver=sudoku_solver.dlx_solver)
+        c = corpus.Corpus(self.path("small.sdkc"))
+        self.assertTrue(c.has_solutions)
+        for i in range(5):
+            self.assertListEqual(c[i], self.puzzles[i])
+            self.assertListEqual(c.solution(i), sudoku_solver.dlx_solver(self.puzzles[i])[0])
+        self.assertListEqual(c[1:].solution(0), c.solution(1))
+        c.close()
+        # puzzles with conflicting givens or without a solution are left out and reported
+        invalid = [2, 2] + [0] * 79
+        unsolvable = list(range(1, 9)) + [0] * 72 + [9]
+        puzzle_io.write_puzzles(self.path("mixed.txt"), [self.puzzles[0], invalid, unsolvable, self.puzzles[1]])
+        skipped = []
+        count = corpus.convert(self.path("mixed.txt"), self.path("mixed.sdkc"), solver=sudoku_solver.dlx_solver,
+                               skipped=skipped)
+        self.assertEqual(count, 2)
+        self.assertListEqual(skipped, [1, 2])
+        with corpus.Corpus(self.path("mixed.sdkc")) as c:
+            self.assertListEqual(list(c), self.puzzles[:2])
+            self.assertListEqual(c.solution(1), sudoku_solver.dlx_solver(self.puzzles[1])[0])
+
+    def test_bad_file(self):
+        with open(self.path("bad.sdkc"), "wb") as f:
+            f.write(b"not a corpus" * 4)
+        with self.assertRaises(PuzzleFormatError):
+            corpus.Corpus(self.path("bad.sdkc"))
+        for data in (b"", corpus.MAGIC):
+            with open(self.path("short.sdkc"), "wb") as f:
+                f.write(data)
+            with self.assertRaises(PuzzleFormatError):
+                corpus.Corpus(self.path("short.sdkc"))
+        with self.assertRaises(ValueError):
+            with corpus.CorpusWriter(self.path("x.sdkc"), with_solutions=True) as writer:
+                writer.write(self.puzzles[0])
+        # a writer stopped by an exception leaves no corpus behind
+        self.assertFalse(os.path.exists(self.path("x.sdkc")))
+        with self.assertRaises(PuzzleFormatError):
+            corpus.convert(io.StringIO(puzzle_io.format_puzzle(self.puzzles[0]) + "\nnot a puzzle\n"),
+                           self.path("y.sdkc"), "lines")
+        self.assertFalse(os.path.exists(self.path("y.sdkc")))
@@ -0,0 +1,42 @@
+import unittest
+
+from src.errors import *
+from src.dlx import DancingLinks
+from src import sudoku_solver
+from fixtures import VALID_PUZZLE, SOLUTION, INVALID_PUZZLE
+
+
+class TestDancingLinks(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = list(SOLUTION)
+
+    def test_dlx_solver(self):
+        tested_solution = sudoku_solver.dlx_solver(self.valid_puzzle)
+        self.assertEqual(len(tested_solution), 1)
+        self.assertListEqual(tested_solution[0], self.solution)
+        # the puzzle itself is left untouched
+        self.assertEqual(self.valid_puzzle.count(0), 45)
+
+        invalid_puzzle = list(INVALID_PUZZLE)
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.dlx_solver(invalid_puzzle)
+        with self.assertRaises(InvalidSudokuError):
+            DancingLinks(invalid_puzzle)
+
+    def test_multiple_solutions(self):
+        puzzle = list(self.valid_puzzle)
+        puzzle[:27] = [0] * 27
+        expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), limit=10**4)
+        tested = sudoku_solver.dlx_solver(puzzle, limit=10**4)
+        self.assertEqual(len(tested), len(expected))
+        self.assertSetEqual({tuple(s) for s in tested}, {tuple(s) for s in expected})
+        self.assertEqual(len(sudoku_solver.dlx_solver(puzzle)), 2)
+
+    def test_solve_is_repeatable(self):
+        dlx = DancingLinks(self.valid_puzzle)
+        self.assertListEqual(dlx.solve(), [self.solution])
+        self.assertListEqual(dlx.solve(), [self.solution])
+        # a complete grid is its own solution
+        self.assertListEqual(DancingLinks(self.solution).solve(), [self.solution])
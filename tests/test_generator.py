@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from src.errors import *
+from src import generator
+from src import sudoku_solver
+from src import utils
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+
+OPTIONS = {"engine": BitboardMap, "propagate": True}
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def test_random_grid(self):
+        for n in (2, 3, 4):
+            grids = {tuple(generator.random_grid(self.rng, n)) for _ in range(5)}
+            self.assertGreater(len(grids), 1)
+            for grid in grids:
+                self.assertEqual(len(grid), n ** 4)
+                self.assertNotIn(0, grid)
+                self.assertTrue(utils.is_valid_sudoku(list(grid)))
+
+    def test_orbits(self):
+        for symmetry, sizes in (("none", {1}), ("rotational", {1, 2}), ("mirror", {1, 2}),
+                                ("diagonal", {1, 2}), ("dihedral", {1, 4, 8})):
+            groups = generator.orbits(symmetry)
+            self.assertListEqual(sorted(c for group in groups for c in group), list(range(81)))
+            self.assertSetEqual({len(group) for group in groups}, sizes)
+        self.assertIn((0, 80), generator.orbits("rotational"))
+        with self.assertRaises(ValueError):
+            generator.orbits("spiral")
+
+    def test_reduce_grid(self):
+        for engine, propagate in ((BitboardMap, True), (ConstraintMap, False)):
+            grid = generator.random_grid(self.rng)
+            puzzle = generator.reduce_grid(grid, self.rng, engine=engine, propagate=propagate)
+            self.assertTrue(all(v in (0, g) for v, g in zip(puzzle, grid)))
+            self.assertListEqual(sudoku_solver.backtrack_iterative_solver(list(puzzle), **OPTIONS), [grid])
+            # minimal: every clue is needed
+            for cell in range(81):
+                if puzzle[cell]:
+                    fewer = list(puzzle)
+                    fewer[cell] = 0
+                    self.assertFalse(sudoku_solver.is_unique(fewer, **OPTIONS))
+
+    def test_generate(self):
+        for symmetry in generator.SYMMETRIES:
+            puzzle = generator.generate(symmetry=symmetry, rng=self.rng)
+            self.assertTrue(sudoku_solver.is_unique(puzzle, **OPTIONS))
+            for group in generator.orbits(symmetry):
+                self.assertEqual(len({bool(puzzle[c]) for c in group}), 1)
+        puzzle = generator.generate(40, rng=self.rng)
+        self.assertEqual(sum(1 for v in puzzle if v), 40)
+        self.assertTrue(sudoku_solver.is_unique(puzzle, **OPTIONS))
+        puzzle = generator.generate(box_length=2, rng=self.rng)
+        self.assertTrue(sudoku_solver.is_unique(puzzle, **OPTIONS))
+        with self.assertRaises(GenerationError):
+            generator.generate(10, rng=self.rng, attempts=2)
+        # a seed makes the output reproducible
+        self.assertListEqual(list(generator.generate_many(3, seed=7)), list(generator.generate_many(3, seed=7)))
@@ -0,0 +1,100 @@
+import unittest
+
+from src.errors import *
+from src import heuristics
+from src import sudoku_solver
+from src.bitboardMap import BitboardMap
+from src.budget import Budget, CancelToken, CANCELLED, COMPLETE, NODE_LIMIT
+from src.constraintMap import ConstraintMap
+from src.heuristics import Heuristic
+from src.solverCore import SolverCore
+from src.stats import SearchStats
+from fixtures import VALID_PUZZLE, INVALID_PUZZLE, MULTI_PUZZLE, HARD_PUZZLE
+
+
+class TestHeuristics(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.multi_puzzle = list(MULTI_PUZZLE)
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    def test_same_solutions(self):
+        expected = sorted(sudoku_solver.backtrack_iterative_solver(list(self.multi_puzzle), limit=None))
+        for cell in heuristics.CELL_RULES:
+            for value in heuristics.VALUE_RULES:
+                for engine, propagate in ((ConstraintMap, False), (BitboardMap, True)):
+                    heuristic = Heuristic(cell, value, seed=1)
+                    puzzle = list(self.multi_puzzle)
+                    found = sudoku_solver.backtrack_iterative_solver(puzzle, limit=None, engine=engine,
+                                                                     propagate=propagate, heuristic=heuristic)
+                    self.assertListEqual(sorted(found), expected, heuristic.name)
+                    self.assertListEqual(puzzle, self.multi_puzzle)
+                    self.assertListEqual(
+                        sudoku_solver.backtrack_recursive_solver(list(self.valid_puzzle), engine=engine,
+                                                                 propagate=propagate, heuristic=heuristic),
+                        sudoku_solver.dlx_solver(self.valid_puzzle), heuristic.name)
+
+    def test_value_order(self):
+        # the first solution found depends on the digit order; a seed makes it reproducible
+        first = {}
+        for value in heuristics.VALUE_RULES:
+            heuristic = Heuristic("mrv", value, seed=5)
+            first[value] = sudoku_solver.backtrack_iterative_solver([0] * 81, limit=1, heuristic=heuristic)
+            self.assertListEqual(sudoku_solver.backtrack_iterative_solver([0] * 81, limit=1, heuristic=heuristic),
+                                 first[value])
+        self.assertListEqual(first["ascending"], sudoku_solver.backtrack_iterative_solver([0] * 81, limit=1))
+        self.assertNotEqual(first["random"], first["ascending"])
+
+    def test_cell_rules_cut_nodes(self):
+        counts = {}
+        for cell in ("mrv", "places"):
+            stats = SearchStats()
+            result = sudoku_solver.bounded_solver(self.hard_puzzle, max_nodes=100_000, engine=BitboardMap,
+                                                  heuristic=Heuristic(cell), stats=stats)
+            self.assertListEqual(result.solutions, sudoku_solver.dlx_solver(self.hard_puzzle))
+            counts[cell] = stats.nodes
+        # without propagation, branching on a digit's only place prunes most of the tree
+        self.assertLess(counts["places"] * 10, counts["mrv"])
+
+    def test_restart_solver(self):
+        self.assertListEqual(sudoku_solver.restart_solver(self.hard_puzzle, seed=3, nodes=1, engine=BitboardMap),
+                             sudoku_solver.dlx_solver(self.hard_puzzle, 1))
+        solutions = sudoku_solver.restart_solver(self.multi_puzzle, limit=5, seed=3, propagate=True)
+        self.assertEqual(len({tuple(s) for s in solutions}), 5)
+        self.assertListEqual(sudoku_solver.restart_solver(self.valid_puzzle, limit=2, seed=3),
+                             sudoku_solver.dlx_solver(self.valid_puzzle))
+        # limit=None keeps restarting until a run finds every solution
+        self.assertEqual(len(sudoku_solver.restart_solver([0] * 16, None, seed=3, nodes=1)), 288)
+        with self.assertRaises(ValueError):
+            sudoku_solver.restart_solver(self.valid_puzzle, growth=1)
+
+    def test_restart_budget(self):
+        # the budget covers all the restarts, and its status tells when it ran out
+        budget = Budget(max_nodes=5)
+        solutions = sudoku_solver.restart_solver(self.hard_puzzle, seed=3, nodes=1, budget=budget,
+                                                 engine=BitboardMap)
+        self.assertListEqual(solutions, [])
+        self.assertEqual(budget.status, NODE_LIMIT)
+        self.assertEqual(budget.nodes, 5)
+        budget = Budget(max_nodes=1_000_000)
+        self.assertListEqual(sudoku_solver.restart_solver(self.hard_puzzle, seed=3, nodes=1, budget=budget,
+                                                          engine=BitboardMap),
+                             sudoku_solver.dlx_solver(self.hard_puzzle, 1))
+        self.assertEqual(budget.status, COMPLETE)
+        self.assertLess(budget.nodes, 1_000_000)
+        budget = Budget(cancel=CancelToken())
+        budget.cancel.cancel()
+        self.assertListEqual(sudoku_solver.restart_solver(self.hard_puzzle, budget=budget), [])
+        self.assertEqual(budget.status, CANCELLED)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            Heuristic("spiral")
+        with self.assertRaises(ValueError):
+            Heuristic("mrv", "descending")
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore, heuristic=Heuristic())
+        invalid = list(INVALID_PUZZLE)
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.restart_solver(invalid)
@@ -0,0 +1,93 @@
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src import __main__ as cli
+from src import batch
+from src import puzzle_io
+from src import sudoku_solver
+from fixtures import VALID_PUZZLE, INVALID_PUZZLE, MULTI_PUZZLE
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = sudoku_solver.dlx_solver(self.valid_puzzle)[0]
+        self.invalid_puzzle = list(INVALID_PUZZLE)
+        self.multi_puzzle = list(MULTI_PUZZLE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @classmethod
+    def tearDownClass(cls):
+        batch.close_pool()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def run_main(self, *argv: str) -> tuple[int, list[str], str]:
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            code = cli.main(["--workers", "2", *argv])
+        return code, out.getvalue().splitlines(), err.getvalue()
+
+    def test_lines(self):
+        puzzle_io.write_puzzles(self.path("in.txt"), [self.valid_puzzle, self.invalid_puzzle, self.multi_puzzle])
+        code, lines, err = self.run_main(self.path("in.txt"), "--chunksize", "1")
+        self.assertEqual(code, 1)
+        rows = [line.split("\t") for line in lines]
+        self.assertListEqual(rows[0], ["0", "complete", "1", puzzle_io.format_puzzle(self.solution)])
+        self.assertListEqual(rows[1], ["1", "invalid", "0"])
+        self.assertListEqual(rows[2][:3], ["2", "complete", "2"])
+        self.assertEqual(len(rows[2]), 5)
+        self.assertIn("puzzle 1: invalid", err)
+        self.assertIn("3 puzzles in", err)
+        self.assertIn("2 complete, 1 invalid", err)
+
+    def test_json_inputs_and_options(self):
+        puzzle_io.write_puzzles(self.path("a.json"), [self.multi_puzzle] * 3, key="puzzles")
+        puzzle_io.write_puzzles(self.path("b.txt.gz"), [self.valid_puzzle])
+        code, lines, err = self.run_main(self.path("a.json"), self.path("b.txt.gz"), "--output-format", "json",
+                                         "--limit", "0", "--count-only", "--unordered")
+        self.assertEqual(code, 0)
+        items = sorted((json.loads(line) for line in lines), key=lambda item: item["index"])
+        count = sudoku_solver.count_solutions(self.multi_puzzle, None)
+        self.assertListEqual([item["count"] for item in items], [count, count, count, 1])
+        self.assertTrue(all("solutions" not in item for item in items))
+        self.assertIn("4 complete", err)
+        code, lines, err = self.run_main(self.path("a.json"), "--limit", "0", "--count-only")
+        self.assertListEqual(lines, [f"{i}\tcomplete\t{count}" for i in range(3)])
+        # a node budget stops the empty grid early, with the solutions found so far
+        puzzle_io.write_puzzles(self.path("empty.json"), [[0] * 81], key="puzzles")
+        code, lines, err = self.run_main(self.path("empty.json"), "--max-nodes", "100", "--limit", "0",
+                                         "--output-format", "json")
+        item = json.loads(lines[0])
+        self.assertEqual(item["status"], "node_limit")
+        self.assertEqual(len(item["solutions"]), item["count"])
+
+    def test_closed_pipe(self):
+        puzzle_io.write_puzzles(self.path("in.txt"), [self.valid_puzzle] * 2000)
+        process = subprocess.Popen([sys.executable, "-m", "src", self.path("in.txt"), "--workers", "1"],
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        process.stdout.readline()
+        process.stdout.close()
+        self.assertEqual(process.wait(timeout=60), 0)
+
+    def test_malformed_input(self):
+        with open(self.path("bad.txt"), "w") as f:
+            f.write(puzzle_io.format_puzzle(self.valid_puzzle) + "\nnot a puzzle\n")
+        code, lines, err = self.run_main(self.path("bad.txt"))
+        self.assertEqual(code, 1)
+        self.assertIn("error", err)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(["--limit", "-1"])
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            cli.main(["--engine", "core", "--strong"])
@@ -0,0 +1,106 @@
+import unittest
+
+from src import sudoku_solver
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+from src.heuristics import Heuristic
+from src.nogood import NogoodTable, ZobristEngine, grid_key
+from src.propagation import Propagator
+from src.solverCore import SolverCore
+from src.stats import SearchStats
+from fixtures import VALID_PUZZLE, MULTI_PUZZLE, HARD_PUZZLE
+
+
+class TestNogood(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.multi_puzzle = list(MULTI_PUZZLE)
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    def test_grid_key(self):
+        puzzle = list(self.valid_puzzle)
+        cm = ZobristEngine(BitboardMap(puzzle), puzzle)
+        prop = Propagator(puzzle, cm)
+        self.assertEqual(cm.key, grid_key(puzzle))
+        mark = prop.mark()
+        self.assertTrue(prop.propagate())
+        # digits placed by the propagator go through the wrapper too
+        self.assertNotIn(0, puzzle)
+        self.assertEqual(cm.key, grid_key(puzzle))
+        prop.undo(mark)
+        self.assertListEqual(puzzle, self.valid_puzzle)
+        self.assertEqual(cm.key, grid_key(self.valid_puzzle))
+        self.assertNotEqual(grid_key(self.valid_puzzle), grid_key(self.multi_puzzle))
+        self.assertEqual(grid_key([0] * 81), 0)
+        self.assertEqual(len(cm._empty_cells), self.valid_puzzle.count(0))
+
+    def test_table(self):
+        table = NogoodTable(maxsize=2)
+        table.add(1)
+        table.add(2)
+        self.assertIn(1, table)
+        table.add(3)
+        # 2 was the least recently used
+        self.assertNotIn(2, table)
+        self.assertIn(1, table)
+        self.assertIn(3, table)
+        info = table.info()
+        self.assertEqual((info.probes, info.hits, info.stores, info.evictions, info.size), (4, 3, 3, 1, 2))
+        self.assertEqual(info.hit_rate, 0.75)
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.info().stores, 3)
+        with self.assertRaises(ValueError):
+            NogoodTable(0)
+
+    def test_same_solutions(self):
+        expected = sorted(sudoku_solver.backtrack_iterative_solver(list(self.multi_puzzle), limit=None))
+        for engine, propagate in ((ConstraintMap, False), (BitboardMap, False), (BitboardMap, True)):
+            nogoods = NogoodTable()
+            for _ in range(3):
+                puzzle = list(self.multi_puzzle)
+                found = sudoku_solver.backtrack_iterative_solver(puzzle, limit=None, engine=engine,
+                                                                 propagate=propagate, nogoods=nogoods)
+                self.assertListEqual(sorted(found), expected)
+                self.assertListEqual(puzzle, self.multi_puzzle)
+            self.assertEqual(sudoku_solver.count_solutions(self.multi_puzzle, engine=engine, propagate=propagate,
+                                                           nogoods=nogoods), len(expected))
+        self.assertListEqual(sudoku_solver.backtrack_iterative_solver(list(self.valid_puzzle), nogoods=nogoods,
+                                                                      heuristic=Heuristic("places")),
+                             sudoku_solver.dlx_solver(self.valid_puzzle))
+
+    def test_repeated_search_prunes(self):
+        nogoods = NogoodTable()
+        nodes = []
+        for _ in range(2):
+            stats = SearchStats()
+            result = sudoku_solver.bounded_solver(self.hard_puzzle, engine=BitboardMap, stats=stats, nogoods=nogoods)
+            self.assertListEqual(result.solutions, sudoku_solver.dlx_solver(self.hard_puzzle))
+            nodes.append(stats.nodes)
+        # the second search skips every dead end proven by the first
+        self.assertLess(nodes[1] * 10, nodes[0])
+        self.assertGreater(stats.nogood_hits, 0)
+        self.assertGreater(stats.nogood_hit_rate, 0)
+        self.assertLess(stats.nogood_probes, nogoods.info().probes)
+        self.assertIn("nogood_hits", repr(stats))
+
+    def test_restart_solver(self):
+        nogoods = NogoodTable()
+        self.assertListEqual(sudoku_solver.restart_solver(self.hard_puzzle, limit=2, seed=3, nodes=10,
+                                                          engine=BitboardMap, nogoods=nogoods),
+                             sudoku_solver.dlx_solver(self.hard_puzzle))
+        self.assertGreater(nogoods.info().stores, 0)
+        solutions = sudoku_solver.restart_solver(self.multi_puzzle, limit=5, seed=3, nogoods=NogoodTable())
+        self.assertEqual(len({tuple(s) for s in solutions}), 5)
+
+    def test_has_solution(self):
+        puzzle = list(self.hard_puzzle)
+        cm = ZobristEngine(BitboardMap(puzzle), puzzle)
+        prop = Propagator(puzzle, cm)
+        nogoods = NogoodTable()
+        self.assertTrue(sudoku_solver.has_solution(puzzle, cm, prop, nogoods))
+        self.assertEqual(cm.key, grid_key(self.hard_puzzle))
+        self.assertListEqual(puzzle, self.hard_puzzle)
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore, nogoods=nogoods)
@@ -0,0 +1,51 @@
+import unittest
+
+from src.errors import *
+from src import parallel
+from src import sudoku_solver
+from src import utils
+from src.bitboardMap import BitboardMap
+from src.stats import SearchStats
+from fixtures import VALID_PUZZLE, INVALID_PUZZLE, HARD_PUZZLE
+
+
+class TestParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    @classmethod
+    def tearDownClass(cls):
+        parallel.close_pool()
+
+    def test_split_search(self):
+        for options in ({}, {"engine": BitboardMap, "propagate": True}):
+            puzzle = [0] * 16
+            subproblems, solutions = parallel.split_search(puzzle, 10, **options)
+            self.assertListEqual(puzzle, [0] * 16)
+            self.assertGreaterEqual(len(subproblems), 10)
+            # the subproblems partition the search space
+            total = len(solutions) + sum(sudoku_solver.count_solutions(grid) for grid in subproblems)
+            self.assertEqual(total, 288)
+
+    def test_parallel_solver(self):
+        expected = sudoku_solver.backtrack_iterative_solver(list(self.hard_puzzle))
+        self.assertListEqual(parallel.parallel_solver(self.hard_puzzle, workers=2), expected)
+        stats = SearchStats()
+        solutions = parallel.parallel_solver([0] * 16, limit=None, workers=2, engine=BitboardMap, stats=stats)
+        self.assertEqual(len({tuple(s) for s in solutions}), 288)
+        self.assertTrue(all(utils.is_valid_sudoku(s) and 0 not in s for s in solutions))
+        self.assertGreater(stats.nodes, 0)
+        with self.assertRaises(InvalidSudokuError):
+            invalid = list(INVALID_PUZZLE)
+            parallel.parallel_solver(invalid, workers=2)
+
+    def test_global_limit(self):
+        # an empty grid has billions of solutions: only the shared limit ends the search
+        for limit in (1, 3, 50):
+            solutions = parallel.parallel_solver([0] * 81, limit=limit, workers=2, engine=BitboardMap)
+            self.assertEqual(len({tuple(s) for s in solutions}), limit)
+            self.assertTrue(all(utils.is_valid_sudoku(s) and 0 not in s for s in solutions))
+        # solutions reached while splitting count towards the limit
+        self.assertEqual(len(parallel.parallel_solver(self.valid_puzzle, limit=1, workers=2, propagate=True)), 1)
@@ -0,0 +1,98 @@
+import unittest
+
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+from src.propagation import Propagator
+from src import sudoku_solver
+from fixtures import VALID_PUZZLE, SOLUTION, HARD_PUZZLE
+
+
+class TestPropagator(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = list(SOLUTION)
+        # 17-clue puzzle that needs more than singles
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    def test_propagate_and_undo(self):
+        for engine in (ConstraintMap, BitboardMap):
+            puzzle = list(self.valid_puzzle)
+            cm = engine(puzzle)
+            prop = Propagator(puzzle, cm)
+            self.assertTrue(prop.propagate())
+            self.assertListEqual(puzzle, self.solution)
+            self.assertEqual(cm.pop_most_constrained_cell(), -1)
+            prop.undo(0)
+            self.assertListEqual(puzzle, self.valid_puzzle)
+            self.assertSetEqual(cm._empty_cells, {i for i in range(81) if not self.valid_puzzle[i]})
+
+    def test_incremental(self):
+        # placing solution digits one at a time reaches the same grid as a full sweep
+        solution = sudoku_solver.backtrack_iterative_solver(list(self.hard_puzzle), engine=BitboardMap)[0]
+        for engine in (ConstraintMap, BitboardMap):
+            puzzle = list(self.hard_puzzle)
+            cm = engine(puzzle)
+            prop = Propagator(puzzle, cm)
+            self.assertTrue(prop.propagate())
+            for cell in range(81):
+                if puzzle[cell]:
+                    continue
+                puzzle[cell] = solution[cell]
+                cm.update_empty_cells(cell)
+                cm.update_neighbors(cell, solution[cell])
+                self.assertTrue(prop.propagate(cell))
+                full = list(puzzle)
+                self.assertTrue(Propagator(full, engine(full)).propagate())
+                self.assertListEqual(puzzle, full)
+            self.assertListEqual(puzzle, solution)
+
+    def test_contradiction(self):
+        # cell 0 sees every digit
+        puzzle = [0, 1, 2, 3, 4, 5, 6, 7, 8] + [0]*72
+        puzzle[27] = 9
+        prop = Propagator(puzzle, BitboardMap(puzzle))
+        self.assertFalse(prop.propagate())
+
+    def test_strong_rules(self):
+        # digit 1 is confined to the first row of box 0 (pointing)
+        puzzle = [0]*81
+        puzzle[12] = 1
+        puzzle[18:21] = [2, 3, 4]
+        cm = BitboardMap(puzzle)
+        prop = Propagator(puzzle, cm, strong=True)
+        self.assertTrue(prop.candidates(8) & 1)
+        self.assertTrue(prop._locked_candidates())
+        for c in range(3, 9):
+            self.assertFalse(prop.candidates(c) & 1)
+        self.assertTrue(prop.candidates(0) & 1)
+        prop.undo(0)
+        self.assertTrue(prop.candidates(8) & 1)
+        # cells 0 and 1 share the pair {8, 9}
+        puzzle = [0, 0, 0, 0, 0, 0, 0, 0, 0,
+                  1, 2, 3, 0, 0, 0, 0, 0, 0,
+                  4, 5, 6, 0, 0, 0, 0, 0, 0,
+                  7] + [0]*53
+        puzzle[64] = 7
+        cm = BitboardMap(puzzle)
+        prop = Propagator(puzzle, cm, strong=True)
+        self.assertEqual(prop.candidates(0), 0b110000000)
+        self.assertEqual(prop.candidates(1), 0b110000000)
+        self.assertTrue(prop._naked_pairs())
+        self.assertEqual(prop.candidates(2), 0b001000000)
+        self.assertFalse(prop.candidates(5) & 0b110000000)
+
+    def test_solvers(self):
+        for solver in (sudoku_solver.backtrack_recursive_solver, sudoku_solver.backtrack_iterative_solver):
+            for options in ({"propagate": True}, {"strong": True}, {"engine": BitboardMap, "strong": True}):
+                puzzle = list(self.hard_puzzle)
+                expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), engine=BitboardMap)
+                self.assertListEqual(solver(puzzle, **options), expected)
+                # multiple solutions are all found
+                puzzle = list(self.valid_puzzle)
+                puzzle[:27] = [0] * 27
+                expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), limit=100, engine=BitboardMap)
+                found = solver(puzzle, limit=100, **options)
+                self.assertEqual(len(found), 100)
+                self.assertTrue(all(sudoku_solver.utils.is_valid_sudoku(s) and 0 not in s for s in found))
+                self.assertEqual(len({tuple(s) for s in found}), 100)
@@ -0,0 +1,76 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from src.errors import *
+from src import puzzle_io
+
+PUZZLE_FILE_17 = pathlib.Path(__file__).parent.parent / "data" / "17_clue_puzzles.json"
+FIRST_17 = "000000010400000000020000000000050407008000300001090000300400200050100000000806000"
+
+
+class TestPuzzleIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.puzzles = [puzzle_io.parse_puzzle(FIRST_17), [0] * 81, list(range(1, 10)) * 9]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def test_parse_puzzle(self):
+        self.assertListEqual(puzzle_io.parse_puzzle("." * 80 + "5"), [0] * 80 + [5])
+        self.assertEqual(puzzle_io.format_puzzle(puzzle_io.parse_puzzle(FIRST_17)), FIRST_17)
+        with self.assertRaises(PuzzleFormatError):
+            puzzle_io.parse_puzzle("0" * 80)
+        with self.assertRaises(PuzzleFormatError):
+            puzzle_io.parse_puzzle("x" * 81)
+        self.assertListEqual(puzzle_io.parse_item(FIRST_17), puzzle_io.parse_puzzle(FIRST_17))
+        self.assertListEqual(puzzle_io.parse_item([16] + [0] * 255), [16] + [0] * 255)
+        for item in ([10] + [0] * 80, [-1] * 81, ["a"] * 81, [0] * 80, 5):
+            with self.assertRaises(PuzzleFormatError):
+                puzzle_io.parse_item(item)
+
+    def test_read_json(self):
+        puzzles = puzzle_io.read_puzzles(PUZZLE_FILE_17)
+        self.assertListEqual(next(puzzles), puzzle_io.parse_puzzle(FIRST_17))
+        self.assertEqual(sum(1 for _ in puzzles), 999)
+
+    def test_read_json_small_chunks(self):
+        text = '{"meta": {"n": [1, 2, 123456]}, "puzzles": ["%s", %s]}' % (FIRST_17, [0] * 81)
+        with mock.patch.object(puzzle_io, "CHUNK_SIZE", 5):
+            puzzles = list(puzzle_io.read_puzzles(io.StringIO(text)))
+        self.assertListEqual(puzzles, self.puzzles[:2])
+        # a bare array, detected from its first character
+        puzzles = list(puzzle_io.read_puzzles(io.StringIO(' ["%s"]' % FIRST_17)))
+        self.assertListEqual(puzzles, self.puzzles[:1])
+        with self.assertRaises(PuzzleFormatError):
+            list(puzzle_io.read_puzzles(io.StringIO('{"puzzles": ["%s"' % FIRST_17), "json"))
+        # only the requested array is read, whatever else the object holds
+        text = '{"solutions": [%s], "puzzles": ["%s"], "more": [["%s"]]}' % ([0] * 81, FIRST_17, FIRST_17)
+        self.assertListEqual(list(puzzle_io.read_puzzles(io.StringIO(text))), self.puzzles[:1])
+        self.assertListEqual(list(puzzle_io.read_puzzles(io.StringIO(text), key="solutions")), [[0] * 81])
+
+    def test_read_lines(self):
+        text = "# comment\n%s\n\n%s\n" % (FIRST_17, "." * 81)
+        puzzles = list(puzzle_io.read_puzzles(io.StringIO(text)))
+        self.assertListEqual(puzzles, self.puzzles[:2])
+
+    def test_round_trip(self):
+        for name in ("out.json", "out.txt", "out.json.gz", "out.txt.xz"):
+            count = puzzle_io.write_puzzles(self.path(name), iter(self.puzzles))
+            self.assertEqual(count, 3)
+            self.assertListEqual(list(puzzle_io.read_puzzles(self.path(name), key="solutions")), self.puzzles)
+        with puzzle_io.PuzzleWriter(self.path("solutions.json"), key="puzzles") as writer:
+            writer.write_all(self.puzzles)
+        self.assertListEqual(list(puzzle_io.read_puzzles(self.path("solutions.json"))), self.puzzles)
+        # open files default to one grid per line
+        out = io.StringIO()
+        puzzle_io.write_puzzles(out, self.puzzles[:1])
+        self.assertEqual(out.getvalue(), FIRST_17 + "\n")
@@ -0,0 +1,80 @@
+import unittest
+
+from src.errors import *
+from src import sat
+from src import sudoku_solver
+from src.board import get_board
+from fixtures import VALID_PUZZLE, INVALID_PUZZLE, MULTI_PUZZLE, HARD_PUZZLE
+
+
+class TestSat(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.hard_puzzle = list(HARD_PUZZLE)
+
+    def test_solve(self):
+        self.assertListEqual(sat.solve(self.valid_puzzle), sudoku_solver.dlx_solver(self.valid_puzzle))
+        self.assertListEqual(sudoku_solver.sat_solver(self.hard_puzzle, 1), sudoku_solver.dlx_solver(self.hard_puzzle, 1))
+        self.assertEqual(self.valid_puzzle.count(0), 45)
+        solution = sat.solve(self.valid_puzzle)[0]
+        self.assertListEqual(sat.solve(solution), [solution])
+        invalid = list(INVALID_PUZZLE)
+        with self.assertRaises(InvalidSudokuError):
+            sat.solve(invalid)
+
+    def test_blocking_clauses(self):
+        puzzle = list(MULTI_PUZZLE)
+        expected = {tuple(s) for s in sudoku_solver.dlx_solver(puzzle, limit=10**4)}
+        found = sat.solve(puzzle, limit=10**4)
+        self.assertEqual(len(found), len(expected))
+        self.assertSetEqual({tuple(s) for s in found}, expected)
+        self.assertEqual(len(sat.solve(puzzle)), 2)
+        # every 4×4 grid
+        self.assertEqual(len(sat.solve([0] * 16, limit=1000)), 288)
+        # None means every solution, as for the other solvers
+        self.assertEqual(len({tuple(s) for s in sat.solve([0] * 16, limit=None)}), 288)
+        self.assertEqual(len(sudoku_solver.sat_solver(puzzle, None)), len(expected))
+
+    def test_larger_board(self):
+        puzzle = [0] * 256
+        puzzle[:16] = range(1, 17)
+        solution = sat.solve(puzzle, 1)[0]
+        self.assertListEqual(solution[:16], puzzle[:16])
+        self.assertNotIn(0, solution)
+        self.assertTrue(sudoku_solver.utils.is_valid_sudoku(solution))
+
+    def test_dimacs(self):
+        for reduce in (True, False):
+            text = sat.dimacs(self.valid_puzzle, reduce=reduce)
+            header = next(line for line in text.splitlines() if line.startswith("p "))
+            _, _, num_vars, num_clauses = header.split()
+            clauses = [line for line in text.splitlines() if line.endswith(" 0")]
+            self.assertEqual(int(num_vars), 729)
+            self.assertEqual(int(num_clauses), len(clauses))
+            # solving the exported clauses gives back the puzzle's solution
+            solver = sat.CDCL(int(num_vars), ([int(x) for x in line.split()[:-1]] for line in clauses))
+            self.assertTrue(solver.solve())
+            model = " ".join(str(v if v in solver.model() else -v) for v in range(1, 730))
+            self.assertListEqual(sat.decode(self.valid_puzzle, sat.parse_model("s SATISFIABLE\nv " + model + " 0\n")),
+                                 sudoku_solver.dlx_solver(self.valid_puzzle)[0])
+        self.assertLess(len(sat.encode(self.valid_puzzle)[1]), len(sat.encode(self.valid_puzzle, reduce=False)[1]))
+        self.assertEqual(sat.variable(80, 9, get_board(3)), 729)
+        with self.assertRaises(ValueError):
+            sat.decode(self.valid_puzzle, set())
+
+    def test_cdcl(self):
+        solver = sat.CDCL(3, [[1, 2], [-1, 2], [-2, 3], [-3, -1]])
+        self.assertTrue(solver.solve())
+        self.assertEqual(solver.model(), {2, 3})
+        self.assertFalse(solver.add_clause([-2]))
+        self.assertFalse(solver.solve())
+        self.assertFalse(sat.CDCL(1, [[1], [-1]]).solve())
+        self.assertTrue(sat.CDCL(2, [[1, -1]]).solve())
+        # pigeonhole: 4 pigeons in 3 holes needs conflicts to refute
+        var = lambda p, h: 3 * p + h + 1
+        clauses = [[var(p, h) for h in range(3)] for p in range(4)]
+        clauses += [[-var(p, h), -var(q, h)] for h in range(3) for p in range(4) for q in range(p + 1, 4)]
+        solver = sat.CDCL(12, clauses)
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.conflicts, 0)
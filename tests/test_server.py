@@ -0,0 +1,141 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import unittest
+
+from src.server import SolverServer
+from src.bitboardMap import BitboardMap
+
+
+async def send(port: int, method: str, path: str, payload=None, *, body: bytes = None) -> tuple[int, dict]:
+    """Send one request on a new connection and return the status and decoded body."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return await exchange(reader, writer, method, path, payload, body=body, close=True)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def exchange(reader, writer, method: str, path: str, payload=None, *, body: bytes = None,
+                   close: bool = False) -> tuple[int, dict]:
+    if body is None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+    if close:
+        head += "Connection: close\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+def kill_workers():
+    for process in multiprocessing.active_children():
+        os.kill(process.pid, signal.SIGKILL)
+
+
+class TestSolverServer(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.puzzle = "000260701680070090190004500820100040004602900050003028009300074040050036703018000"
+        self.solution = "435269781682571493197834562826195347374682915951743628519326874248957136763418259"
+
+    async def asyncSetUp(self):
+        self.server = SolverServer(port=0, workers=1, max_queue=64, max_body=1 << 16,
+                                   engine=BitboardMap, propagate=True)
+        await self.server.start()
+        self.port = self.server.port
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_solve(self):
+        status, answer = await send(self.port, "POST", "/solve", {"puzzle": self.puzzle})
+        self.assertEqual(status, 200)
+        self.assertDictEqual(answer, {"solutions": [self.solution], "status": "complete"})
+        invalid = "22" + self.puzzle[2:]
+        grid = [int(c) for c in self.puzzle]
+        status, answer = await send(self.port, "POST", "/solve", {"puzzles": [grid, invalid, [0] * 81],
+                                                                  "limit": 3})
+        self.assertEqual(status, 200)
+        first, second, third = answer["results"]
+        self.assertListEqual(first["solutions"], [[int(c) for c in self.solution]])
+        self.assertIn("error", second)
+        self.assertEqual(len(third["solutions"]), 3)
+        # budgets are applied per puzzle
+        status, answer = await send(self.port, "POST", "/solve", {"puzzle": [0] * 81, "limit": 50, "max_nodes": 10})
+        self.assertEqual(answer["status"], "node_limit")
+
+    async def test_keep_alive(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        for _ in range(3):
+            status, answer = await exchange(reader, writer, "POST", "/solve", {"puzzle": self.puzzle})
+            self.assertEqual(status, 200)
+            self.assertListEqual(answer["solutions"], [self.solution])
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_concurrent_requests_are_batched(self):
+        results = await asyncio.gather(*(send(self.port, "POST", "/solve", {"puzzle": self.puzzle})
+                                         for _ in range(40)))
+        self.assertTrue(all(status == 200 and answer["solutions"] == [self.solution] for status, answer in results))
+        status, metrics = await send(self.port, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["puzzles"], 40)
+        self.assertEqual(metrics["statuses"], {"complete": 40})
+        self.assertLess(metrics["batches"], 40)
+        self.assertGreater(metrics["mean_batch_size"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertIn("p95", metrics["latency"])
+
+    async def test_health_and_errors(self):
+        status, answer = await send(self.port, "GET", "/health")
+        self.assertEqual((status, answer["status"]), (200, "ok"))
+        self.assertEqual((await send(self.port, "GET", "/nowhere"))[0], 404)
+        self.assertEqual((await send(self.port, "GET", "/solve"))[0], 405)
+        self.assertEqual((await send(self.port, "POST", "/solve", body=b"{"))[0], 400)
+        self.assertEqual((await send(self.port, "POST", "/solve", {"puzzle": "123"}))[0], 400)
+        self.assertEqual((await send(self.port, "POST", "/solve", {"puzzle": self.puzzle, "limit": 0}))[0], 400)
+        self.assertEqual((await send(self.port, "POST", "/solve", {"puzzle": [99] * 81}))[0], 400)
+        self.assertEqual((await send(self.port, "POST", "/solve", body=b" " * (1 << 17)))[0], 413)
+
+    async def test_backpressure(self):
+        status, answer = await send(self.port, "POST", "/solve", {"puzzles": [self.puzzle] * 65})
+        self.assertEqual(status, 503)
+        status, metrics = await send(self.port, "GET", "/metrics")
+        self.assertEqual(metrics["rejected"], 1)
+        self.assertEqual((await send(self.port, "POST", "/solve", {"puzzles": [self.puzzle] * 64}))[0], 200)
+
+    async def test_dead_worker(self):
+        # a worker killed in the middle of a batch fails that batch with 503
+        request = asyncio.create_task(send(self.port, "POST", "/solve", {"puzzles": [[0] * 81] * 16, "limit": 100}))
+        # the worker is started when the batch is submitted
+        while not multiprocessing.active_children():
+            await asyncio.sleep(0.01)
+        kill_workers()
+        status, answer = await request
+        self.assertEqual(status, 503)
+        self.assertIn("error", answer)
+        # the pool is replaced and later requests are served again
+        status, answer = await send(self.port, "POST", "/solve", {"puzzle": self.puzzle})
+        self.assertEqual((status, answer["solutions"]), (200, [self.solution]))
+        status, metrics = await send(self.port, "GET", "/metrics")
+        self.assertEqual(metrics["pool_restarts"], 1)
+        # a worker dying while idle shows in /health, which starts the replacement
+        kill_workers()
+        status, answer = await send(self.port, "GET", "/health")
+        while status == 200:
+            await asyncio.sleep(0.01)
+            status, answer = await send(self.port, "GET", "/health")
+        self.assertEqual((status, answer["status"]), (503, "restarting"))
+        status, answer = await send(self.port, "GET", "/health")
+        self.assertEqual((status, answer["status"], answer["pool_restarts"]), (200, "ok", 2))
+        self.assertEqual((await send(self.port, "POST", "/solve", {"puzzle": self.puzzle}))[0], 200)
@@ -0,0 +1,91 @@
+import pathlib
+import unittest
+
+from src.errors import *
+from src import budget
+from src import puzzle_io
+from src import sudoku_solver
+from src.solverCore import SolverCore
+from src.stats import SearchStats
+from fixtures import VALID_PUZZLE, SOLUTION, INVALID_PUZZLE
+
+PUZZLE_FILE_17 = pathlib.Path(__file__).parent.parent / "data" / "17_clue_puzzles.json"
+
+
+class TestSolverCore(unittest.TestCase):
+
+    def setUp(self):
+        self.core = SolverCore()
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = list(SOLUTION)
+
+    def test_solve(self):
+        puzzle = list(self.valid_puzzle)
+        self.core.reset(puzzle)
+        self.assertListEqual(self.core.solve(), [self.solution])
+        self.assertListEqual(puzzle, self.valid_puzzle)
+        # a complete grid is its own solution
+        self.core.reset(self.solution)
+        self.assertListEqual(self.core.solve(), [self.solution])
+        # cell 8 has no candidate left
+        self.core.reset(list(range(1, 9)) + [0] * 72 + [9])
+        self.assertListEqual(self.core.solve(), [])
+
+    def test_reuse_matches_solver(self):
+        # one core for many puzzles, including ones left mid-search
+        for puzzle in list(puzzle_io.read_puzzles(PUZZLE_FILE_17))[:100]:
+            self.core.reset(puzzle)
+            self.assertListEqual(self.core.solve(limit=1), sudoku_solver.dlx_solver(puzzle, 1))
+            self.core.reset(puzzle)
+            self.assertEqual(self.core.count(), 1)
+
+    def test_resumable_search(self):
+        puzzle = list(self.valid_puzzle)
+        puzzle[:27] = [0] * 27
+        self.core.reset(puzzle)
+        expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), limit=None)
+        found = []
+        while self.core.search():
+            found.append(list(self.core.grid))
+        self.assertFalse(self.core.search())
+        self.assertListEqual(sorted(found), sorted(expected))
+        self.core.reset([0] * 81)
+        self.assertEqual(self.core.count(1000), 1000)
+        core = SolverCore(2)
+        core.reset([0] * 16)
+        self.assertEqual(core.count(), 288)
+
+    def test_budget(self):
+        self.core.reset([0] * 81)
+        limits = budget.Budget(max_nodes=100)
+        solutions = self.core.solve(None, limits)
+        self.assertEqual(limits.status, budget.NODE_LIMIT)
+        self.assertEqual(limits.nodes, 100)
+        self.assertGreater(len(solutions), 0)
+        # through bounded_solver, with stats
+        stats = SearchStats()
+        result = sudoku_solver.bounded_solver([0] * 81, limit=None, max_nodes=50, engine=SolverCore, stats=stats)
+        self.assertEqual((result.status, result.nodes, stats.nodes), (budget.NODE_LIMIT, 50, 50))
+        result = sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore)
+        self.assertEqual(result[:3], ([self.solution], budget.COMPLETE, 0))
+        result = sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore, propagate=True)
+        self.assertEqual(result[:3], ([self.solution], budget.COMPLETE, 0))
+        # options the core cannot honour are rejected, not ignored
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore, propagate=False)
+        with self.assertRaises(ValueError):
+            sudoku_solver.bounded_solver(self.valid_puzzle, engine=SolverCore, strong=True)
+
+    def test_invalid(self):
+        invalid = list(INVALID_PUZZLE)
+        with self.assertRaises(InvalidSudokuError):
+            self.core.reset(invalid)
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.bounded_solver(invalid, engine=SolverCore)
+        with self.assertRaises(PuzzleFormatError):
+            self.core.reset([0] * 80)
+        with self.assertRaises(PuzzleFormatError):
+            self.core.reset([10] + [0] * 80)
+        # the core is still usable
+        self.core.reset(self.valid_puzzle)
+        self.assertListEqual(self.core.solve(), [self.solution])
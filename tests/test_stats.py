@@ -0,0 +1,64 @@
+import unittest
+
+from src import sudoku_solver
+from src.stats import SearchStats
+from src.bitboardMap import BitboardMap
+from fixtures import VALID_PUZZLE
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.empty_cells = self.valid_puzzle.count(0)
+
+    def test_counts_without_propagation(self):
+        for solver in (sudoku_solver.backtrack_recursive_solver, sudoku_solver.backtrack_iterative_solver):
+            stats = SearchStats()
+            solver(list(self.valid_puzzle), stats=stats)
+            # every empty cell is a branch point on the path to the only solution
+            self.assertEqual(stats.max_depth, self.empty_cells)
+            self.assertGreaterEqual(stats.nodes, self.empty_cells)
+            self.assertEqual(stats.mrv_scans, sum(stats.branch_candidates.values()) + 1)
+            # one update per digit placed, and at most one more to take it back
+            self.assertGreaterEqual(stats.neighbor_updates, stats.nodes)
+            self.assertLessEqual(stats.neighbor_updates, 2 * stats.nodes)
+            self.assertGreater(stats.backtracks, 0)
+
+    def test_propagation_and_merge(self):
+        total = SearchStats()
+        for options in ({}, {"engine": BitboardMap, "propagate": True}):
+            stats = SearchStats()
+            self.assertEqual(sudoku_solver.count_solutions(self.valid_puzzle, stats=stats, **options), 1)
+            total.merge(stats)
+        with_propagation = stats
+        # the puzzle falls to singles, so propagation never branches; every single is placed and undone
+        self.assertEqual(with_propagation.nodes, 0)
+        self.assertEqual(with_propagation.max_depth, 0)
+        self.assertEqual(with_propagation.neighbor_updates, 2 * self.empty_cells)
+        self.assertEqual(with_propagation.branching_factor, 0.0)
+        self.assertEqual(total.max_depth, self.empty_cells)
+        self.assertGreater(total.nodes, 0)
+        self.assertGreater(total.neighbor_updates, with_propagation.neighbor_updates)
+
+    def test_equality(self):
+        first, second = SearchStats(), SearchStats()
+        self.assertEqual(first, second)
+        sudoku_solver.backtrack_iterative_solver(list(self.valid_puzzle), stats=first)
+        self.assertNotEqual(first, second)
+        sudoku_solver.backtrack_iterative_solver(list(self.valid_puzzle), stats=second)
+        self.assertEqual(first, second)
+        merged = SearchStats()
+        merged.merge(first)
+        self.assertEqual(merged, first)
+        second.branch_candidates[9] = 1
+        self.assertNotEqual(first, second)
+
+    def test_results_unchanged(self):
+        puzzle = list(self.valid_puzzle)
+        for cell in (3, 4, 8, 9, 10):
+            puzzle[cell] = 0
+        stats = SearchStats()
+        self.assertListEqual(sudoku_solver.backtrack_iterative_solver(list(puzzle), 10, stats=stats),
+                             sudoku_solver.backtrack_iterative_solver(list(puzzle), 10))
+        self.assertGreater(stats.branching_factor, 1.0)
@@ -1,35 +1,133 @@
-import unittest
-from src.errors import *
-from src import sudoku_solver
-
-class TestSudokuSolver(unittest.TestCase):
-    def setUp(self):
-        self.valid_puzzle = [0, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1, 0,
-                        0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7, 4, 0,
-                        4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
-        self.solution = [4, 3, 5, 2, 6, 9, 7, 8, 1, 6, 8, 2, 5, 7, 1, 4, 9, 3, 1, 9, 7, 8, 3, 4, 5, 6, 2, 8, 2, 6, 1, 9, 5,
-                    3, 4, 7, 3, 7, 4, 6, 8, 2, 9, 1, 5, 9, 5, 1, 7, 4, 3, 6, 2, 8, 5, 1, 9, 3, 2, 6, 8, 7, 4, 2, 4, 8,
-                    9, 5, 7, 1, 3, 6, 7, 6, 3, 4, 1, 8, 2, 5, 9]
-
-    def test_backtrack_recursive_solver(self):
-
-        tested_solution = sudoku_solver.backtrack_recursive_solver(self.valid_puzzle)
-        self.assertEqual( len(tested_solution), 1)
-        self.assertListEqual(tested_solution[0], self.solution)
-
-        invalid_puzzle = [2, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1,
-                          0, 0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7,
-                          4, 0, 4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
-        with self.assertRaises(InvalidSudokuError):
-            sudoku_solver.backtrack_recursive_solver(invalid_puzzle)
-
-    def test_backtrack_iterative_solver(self):
-        tested_solution = sudoku_solver.backtrack_iterative_solver(self.valid_puzzle)
-        self.assertEqual(len(tested_solution), 1)
-        self.assertListEqual(tested_solution[0], self.solution)
-
-        invalid_puzzle = [2, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1, 0,
-                        0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7, 4, 0,
-                        4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
-        with self.assertRaises(InvalidSudokuError):
-            sudoku_solver.backtrack_iterative_solver(invalid_puzzle)
\ No newline at end of file
+import itertools
+import unittest
+from src.errors import *
+from src import sudoku_solver
+from src.bitboardMap import BitboardMap
+from src.constraintMap import ConstraintMap
+from src.propagation import Propagator
+
+class TestSudokuSolver(unittest.TestCase):
+    def setUp(self):
+        self.valid_puzzle = [0, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1, 0,
+                        0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7, 4, 0,
+                        4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
+        self.solution = [4, 3, 5, 2, 6, 9, 7, 8, 1, 6, 8, 2, 5, 7, 1, 4, 9, 3, 1, 9, 7, 8, 3, 4, 5, 6, 2, 8, 2, 6, 1, 9, 5,
+                    3, 4, 7, 3, 7, 4, 6, 8, 2, 9, 1, 5, 9, 5, 1, 7, 4, 3, 6, 2, 8, 5, 1, 9, 3, 2, 6, 8, 7, 4, 2, 4, 8,
+                    9, 5, 7, 1, 3, 6, 7, 6, 3, 4, 1, 8, 2, 5, 9]
+
+    def test_backtrack_recursive_solver(self):
+
+        tested_solution = sudoku_solver.backtrack_recursive_solver(self.valid_puzzle)
+        self.assertEqual( len(tested_solution), 1)
+        self.assertListEqual(tested_solution[0], self.solution)
+
+        invalid_puzzle = [2, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1,
+                          0, 0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7,
+                          4, 0, 4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.backtrack_recursive_solver(invalid_puzzle)
+
+    def test_backtrack_iterative_solver(self):
+        tested_solution = sudoku_solver.backtrack_iterative_solver(self.valid_puzzle)
+        self.assertEqual(len(tested_solution), 1)
+        self.assertListEqual(tested_solution[0], self.solution)
+
+        invalid_puzzle = [2, 0, 0, 2, 6, 0, 7, 0, 1, 6, 8, 0, 0, 7, 0, 0, 9, 0, 1, 9, 0, 0, 0, 4, 5, 0, 0, 8, 2, 0, 1, 0,
+                        0, 0, 4, 0, 0, 0, 4, 6, 0, 2, 9, 0, 0, 0, 5, 0, 0, 0, 3, 0, 2, 8, 0, 0, 9, 3, 0, 0, 0, 7, 4, 0,
+                        4, 0, 0, 5, 0, 0, 3, 6, 7, 0, 3, 0, 1, 8, 0, 0, 0]
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.backtrack_iterative_solver(invalid_puzzle)
+
+    def test_bitboard_engine(self):
+        for solver in (sudoku_solver.backtrack_recursive_solver, sudoku_solver.backtrack_iterative_solver):
+            tested_solution = solver(list(self.valid_puzzle), engine=BitboardMap)
+            self.assertEqual(len(tested_solution), 1)
+            self.assertListEqual(tested_solution[0], self.solution)
+        # an under-constrained grid returns the same solutions in the same order
+        puzzle = list(self.valid_puzzle)
+        puzzle[:27] = [0] * 27
+        expected = sudoku_solver.backtrack_iterative_solver(list(puzzle), limit=10)
+        self.assertListEqual(sudoku_solver.backtrack_iterative_solver(list(puzzle), limit=10, engine=BitboardMap),
+                             expected)
+
+    def test_count_solutions(self):
+        self.assertEqual(sudoku_solver.count_solutions(self.valid_puzzle), 1)
+        self.assertTrue(sudoku_solver.is_unique(self.valid_puzzle))
+        # removing five givens leaves several solutions
+        puzzle = list(self.valid_puzzle)
+        for cell in (3, 4, 8, 9, 10):
+            puzzle[cell] = 0
+        expected = len(sudoku_solver.backtrack_iterative_solver(list(puzzle), 1000))
+        self.assertGreater(expected, 1)
+        for options in ({}, {"engine": BitboardMap, "propagate": True}):
+            self.assertEqual(sudoku_solver.count_solutions(puzzle, **options), expected)
+            self.assertEqual(sudoku_solver.count_solutions(puzzle, 2, **options), 2)
+            self.assertFalse(sudoku_solver.is_unique(puzzle, **options))
+        self.assertEqual(sudoku_solver.count_solutions(self.solution), 1)
+        self.assertEqual(sudoku_solver.count_solutions(list(range(1, 9)) + [0] * 72 + [9]), 0)
+        unchanged = list(puzzle)
+        sudoku_solver.count_solutions(puzzle)
+        self.assertListEqual(puzzle, unchanged)
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.is_unique([2, 2] + [0] * 79)
+
+    def test_propagation_only_leaves_grid(self):
+        # the valid puzzle falls to singles: the search finds its solution without a branch point,
+        # and the singles placed in the caller's grid must be taken back all the same
+        for engine in (ConstraintMap, BitboardMap):
+            for strong in (False, True):
+                puzzle = list(self.valid_puzzle)
+                solutions = sudoku_solver.backtrack_iterative_solver(puzzle, engine=engine, propagate=True,
+                                                                     strong=strong)
+                self.assertListEqual(solutions, [self.solution])
+                self.assertListEqual(puzzle, self.valid_puzzle)
+                # also when the consumer stops at the solution
+                search = sudoku_solver._search(puzzle, engine, True, strong, None)
+                self.assertListEqual(next(search), self.solution)
+                search.close()
+                self.assertListEqual(puzzle, self.valid_puzzle)
+
+    def test_iter_solutions(self):
+        solutions = sudoku_solver.iter_solutions(self.valid_puzzle)
+        self.assertListEqual(next(solutions), self.solution)
+        self.assertIsNone(next(solutions, None))
+        puzzle = list(self.valid_puzzle)
+        for cell in (3, 4, 8, 9, 10):
+            puzzle[cell] = 0
+        self.assertListEqual(list(sudoku_solver.iter_solutions(puzzle, engine=BitboardMap, propagate=True)),
+                             sudoku_solver.backtrack_iterative_solver(list(puzzle), 1000))
+        # the empty grid has far too many solutions to list, but the first ones come at once
+        first = list(itertools.islice(sudoku_solver.iter_solutions([0] * 81), 100))
+        self.assertEqual(len({tuple(s) for s in first}), 100)
+        self.assertListEqual(first[:2], sudoku_solver.backtrack_iterative_solver([0] * 81))
+        with self.assertRaises(InvalidSudokuError):
+            sudoku_solver.iter_solutions([2, 2] + [0] * 79)
+
+    def test_has_solution(self):
+        for engine in (ConstraintMap, BitboardMap):
+            for propagate in (False, True):
+                # several solutions: the search is abandoned at the first one
+                puzzle = list(self.valid_puzzle)
+                puzzle[:27] = [0] * 27
+                cm = engine(puzzle)
+                prop = Propagator(puzzle, cm) if propagate else None
+                empty = set(cm._empty_cells)
+                candidates = [cm.candidates(i) for i in range(81)]
+                self.assertTrue(sudoku_solver.has_solution(puzzle, cm, prop))
+                self.assertListEqual(puzzle[27:], self.valid_puzzle[27:])
+                self.assertListEqual(puzzle[:27], [0] * 27)
+                self.assertSetEqual(cm._empty_cells, empty)
+                self.assertListEqual([cm.candidates(i) for i in range(81)], candidates)
+                # another digit than the solution's in a unique puzzle leaves none
+                puzzle = list(self.valid_puzzle)
+                cm = engine(puzzle)
+                prop = Propagator(puzzle, cm) if propagate else None
+                digit = next(d for d in cm.gen_digits(0) if d != self.solution[0])
+                puzzle[0] = digit
+                cm.update_empty_cells(0)
+                cm.update_neighbors(0, digit)
+                self.assertFalse(sudoku_solver.has_solution(puzzle, cm, prop))
+                puzzle[0] = self.solution[0]
+                cm.update_neighbors(0, digit, remove=True)
+                cm.update_neighbors(0, puzzle[0])
+                self.assertTrue(sudoku_solver.has_solution(puzzle, cm, prop))
@@ -0,0 +1,79 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from benchmark import suite
+
+
+def report(**result) -> dict:
+    """Return a suite report holding one result of the 'hard' corpus with the 'iterative' backend."""
+    return {"meta": {}, "results": {"hard": {"iterative": result}}}
+
+
+class TestSuite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.baseline = report(mean=0.010, p50=0.008, p95=0.020, p99=0.030, puzzles_per_second=100.0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, data: dict) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(suite.percentile(values, 0), 1.0)
+        self.assertEqual(suite.percentile(values, 50), 3.0)
+        self.assertEqual(suite.percentile(values, 100), 5.0)
+        # between two ranks the value is interpolated linearly
+        self.assertAlmostEqual(suite.percentile(values, 95), 4.8)
+        self.assertAlmostEqual(suite.percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+        self.assertAlmostEqual(suite.percentile([10.0, 20.0], 99), 19.9)
+        self.assertEqual(suite.percentile([7.0], 99), 7.0)
+        self.assertEqual(suite.percentile([], 50), 0.0)
+
+    def test_compare_times(self):
+        # times regress when they grow beyond the threshold
+        self.assertListEqual(suite.compare(self.baseline, self.baseline), [])
+        slower = report(mean=0.0105, p50=0.008, p95=0.025, p99=0.030, puzzles_per_second=100.0)
+        regressions = suite.compare(self.baseline, slower, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("hard/iterative p95", regressions[0])
+        self.assertListEqual(suite.compare(self.baseline, slower, 0.3), [])
+        # faster is never a regression
+        faster = report(mean=0.001, p50=0.001, p95=0.001, p99=0.001, puzzles_per_second=1000.0)
+        self.assertListEqual(suite.compare(self.baseline, faster, 0.0), [])
+
+    def test_compare_throughput(self):
+        # throughput regresses when it drops beyond the threshold, not when it rises
+        slower = report(puzzles_per_second=80.0)
+        regressions = suite.compare(self.baseline, slower, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("throughput", regressions[0])
+        self.assertListEqual(suite.compare(self.baseline, report(puzzles_per_second=95.0), 0.1), [])
+        self.assertListEqual(suite.compare(self.baseline, report(puzzles_per_second=500.0), 0.1), [])
+        # only corpora and backends present in both are compared
+        other = {"meta": {}, "results": {"easy": {"iterative": {"puzzles_per_second": 1.0}}}}
+        self.assertListEqual(suite.compare(self.baseline, other), [])
+
+    def test_main_exit_code(self):
+        baseline = self.write("baseline.json", self.baseline)
+        slower = self.write("slower.json", report(mean=0.020, puzzles_per_second=50.0))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(suite.main(["--compare", baseline, "--current", baseline]), 0)
+            self.assertEqual(suite.main(["--compare", baseline, "--current", slower]), 1)
+            self.assertEqual(suite.main(["--compare", baseline, "--current", slower, "--threshold", "2"]), 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "No regression beyond 10%.")
+        self.assertListEqual([line.split(":")[0] for line in lines[1:3]],
+                             ["REGRESSION hard/iterative mean", "REGRESSION hard/iterative throughput"])
+        self.assertEqual(lines[3], "No regression beyond 200%.")
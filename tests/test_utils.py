@@ -1,56 +1,84 @@
-import unittest
-from src import utils
-
-
-class TestUtils(unittest.TestCase):
-
-    def setUp(self):
-        pass
-
-    def tearDown(self):
-        pass
-
-    def test_get_coord(self):
-        self.assertEqual(utils.get_coord(0), (0, 0, 0))
-        self.assertEqual(utils.get_coord(80), (8, 8, 8))
-        self.assertEqual(utils.get_coord(31), (3, 4, 4))
-        self.assertEqual(utils.get_coord(22), (2, 4, 1))
-
-    def test_gen_neighbor_cells(self):
-        neighbors = utils.gen_neighbor_cells()
-        neighbor_of_37 = {36, 38, 39, 40, 41, 42, 43, 44, 1, 10, 19, 28, 46, 55, 64, 73, 27, 29, 45, 47}
-        self.assertSetEqual(neighbors[37], neighbor_of_37)
-
-    def test_is_valid_sudoku(self):
-        valid_sudoku = [4,3,0,0,7,0,0,0,0,
-                        6,0,0,1,9,4,0,0,0,
-                        0,9,8,0,0,0,0,6,0,
-                        8,0,0,0,6,0,0,0,3,
-                        5,0,0,8,0,3,0,0,1,
-                        7,0,0,0,2,0,0,0,6,
-                        0,6,0,0,0,0,2,8,0,
-                        0,0,0,5,1,9,0,0,4,
-                        0,0,0,0,8,0,0,7,9]
-        invalid_sudoku =   [9,3,0,0,7,0,0,0,0,
-                            5,0,0,1,8,6,0,0,0,
-                            0,8,9,0,0,0,0,5,0,
-                            9,0,0,0,5,0,0,0,3,
-                            4,0,0,9,0,3,0,0,1,
-                            7,0,0,0,2,0,0,0,5,
-                            0,5,0,0,0,0,2,9,0,
-                            0,0,0,4,1,8,0,0,6,
-                            0,0,0,0,9,0,0,7,8]
-        self.assertTrue(utils.is_valid_sudoku(valid_sudoku))
-        self.assertFalse(utils.is_valid_sudoku(invalid_sudoku))
-
-    def test_gen_digits(self):
-        bitmask1 = 0b0 # all digits are available
-        bitmask2 = 0b1111111111111111111001 # no digits available
-        bitmask3 = 0b0011111111110011000101# 1, 3 and 9 are available
-
-        self.assertListEqual(list(utils.gen_digits(bitmask1)), [1, 2, 3, 4, 5, 6, 7, 8, 9])
-        self.assertListEqual(list(utils.gen_digits(bitmask2)), [])
-        self.assertListEqual(list(utils.gen_digits(bitmask3)), [1, 3, 9])
-
-        
-    
+import unittest
+from src import utils
+from src.constants import *
+
+
+class TestUtils(unittest.TestCase):
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_get_coord(self):
+        self.assertEqual(utils.get_coord(0), (0, 0, 0))
+        self.assertEqual(utils.get_coord(80), (8, 8, 8))
+        self.assertEqual(utils.get_coord(31), (3, 4, 4))
+        self.assertEqual(utils.get_coord(22), (2, 4, 1))
+
+    def test_gen_neighbor_cells(self):
+        neighbors = utils.gen_neighbor_cells()
+        neighbor_of_37 = {36, 38, 39, 40, 41, 42, 43, 44, 1, 10, 19, 28, 46, 55, 64, 73, 27, 29, 45, 47}
+        self.assertSetEqual(neighbors[37], neighbor_of_37)
+
+    def test_is_valid_sudoku(self):
+        valid_sudoku = [4,3,0,0,7,0,0,0,0,
+                        6,0,0,1,9,4,0,0,0,
+                        0,9,8,0,0,0,0,6,0,
+                        8,0,0,0,6,0,0,0,3,
+                        5,0,0,8,0,3,0,0,1,
+                        7,0,0,0,2,0,0,0,6,
+                        0,6,0,0,0,0,2,8,0,
+                        0,0,0,5,1,9,0,0,4,
+                        0,0,0,0,8,0,0,7,9]
+        invalid_sudoku =   [9,3,0,0,7,0,0,0,0,
+                            5,0,0,1,8,6,0,0,0,
+                            0,8,9,0,0,0,0,5,0,
+                            9,0,0,0,5,0,0,0,3,
+                            4,0,0,9,0,3,0,0,1,
+                            7,0,0,0,2,0,0,0,5,
+                            0,5,0,0,0,0,2,9,0,
+                            0,0,0,4,1,8,0,0,6,
+                            0,0,0,0,9,0,0,7,8]
+        self.assertTrue(utils.is_valid_sudoku(valid_sudoku))
+        self.assertFalse(utils.is_valid_sudoku(invalid_sudoku))
+        # values outside 0..9 make a puzzle invalid rather than raising
+        self.assertFalse(utils.is_valid_sudoku([10] + [0] * 80))
+        self.assertFalse(utils.is_valid_sudoku([-1] + [0] * 80))
+        self.assertFalse(utils.is_valid_sudoku([17] + [0] * 255))
+        self.assertTrue(utils.is_valid_sudoku([16] + [0] * 255))
+
+    def test_gen_digits(self):
+        bitmask1 = 0b0 # all digits are available
+        bitmask2 = 0b1111111111111111111001 # no digits available
+        bitmask3 = 0b0011111111110011000101# 1, 3 and 9 are available
+
+        self.assertListEqual(list(utils.gen_digits(bitmask1)), [1, 2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertListEqual(list(utils.gen_digits(bitmask2)), [])
+        self.assertListEqual(list(utils.gen_digits(bitmask3)), [1, 3, 9])
+
+    def test_gen_mask_digits(self):
+        self.assertListEqual(list(utils.gen_mask_digits(0b111111111)), [1, 2, 3, 4, 5, 6, 7, 8, 9])
+        self.assertListEqual(list(utils.gen_mask_digits(0)), [])
+        self.assertListEqual(list(utils.gen_mask_digits(0b100000101)), [1, 3, 9])
+        self.assertEqual(utils.mask_from_constraints(0b0011111111110011000101), 0b100000101)
+
+    def test_static_tables(self):
+        neighbors = utils.gen_neighbor_cells()
+        for cell in range(SUDOKU_SIZE):
+            self.assertSetEqual(set(NEIGHBORS[cell]), neighbors[cell])
+            self.assertEqual(list(NEIGHBORS[cell]), sorted(NEIGHBORS[cell]))
+            self.assertEqual(PEER_MASKS[cell], sum(1 << n for n in neighbors[cell]))
+            for unit in UNITS_OF[cell]:
+                self.assertIn(cell, UNITS[unit])
+        for mask in range(DIGITS_MASK + 1):
+            digits = [d for d in range(1, SUDOKU_LENGTH + 1) if mask >> (d - 1) & 1]
+            self.assertEqual(list(MASK_DIGITS[mask]), digits)
+            self.assertEqual(POPCOUNT[mask], len(digits))
+            self.assertEqual(LOWEST_DIGIT[mask], digits[0] if digits else 0)
+
+    def test_mask_from_constraints(self):
+        for fields in range(0, 1 << 18, 97):
+            expected = sum(1 << d for d in range(SUDOKU_LENGTH) if not fields >> (DIGIT_MASK * d) & 0b11)
+            self.assertEqual(utils.mask_from_constraints(fields << DIGIT_SHIFT | 5), expected)
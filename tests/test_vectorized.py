@@ -0,0 +1,99 @@
+import importlib.util
+import pathlib
+import unittest
+
+from src.errors import *
+from src import puzzle_io
+from src import sudoku_solver
+from src import utils
+from src.bitboardMap import BitboardMap
+from fixtures import VALID_PUZZLE, SOLUTION, INVALID_PUZZLE
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+    from src import vectorized
+
+PUZZLE_FILE_17 = pathlib.Path(__file__).parent.parent / "data" / "17_clue_puzzles.json"
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self):
+        self.valid_puzzle = list(VALID_PUZZLE)
+        self.solution = list(SOLUTION)
+        self.invalid_puzzle = list(INVALID_PUZZLE)
+        # cell 8 has no candidate left: its row holds 1-8 and its column a 9
+        self.unsolvable_puzzle = list(range(1, 9)) + [0] * 72 + [9]
+
+    def test_status(self):
+        batch = vectorized.VectorizedBatch([self.valid_puzzle, self.invalid_puzzle, self.unsolvable_puzzle,
+                                            self.solution, [0] * 81, [10] + [0] * 80])
+        self.assertEqual(batch.grids.shape, (6, 81))
+        self.assertEqual(batch.units.shape, (6, 27))
+        self.assertEqual(int(batch.units[0, 0]), 0b001100011)
+        status = batch.propagate().tolist()
+        self.assertListEqual(status, [vectorized.SOLVED, vectorized.INVALID, vectorized.UNSOLVABLE,
+                                      vectorized.SOLVED, vectorized.STUCK, vectorized.INVALID])
+        self.assertListEqual(batch.grids[0].tolist(), self.solution)
+        self.assertListEqual(batch.grids[4].tolist(), [0] * 81)
+        with self.assertRaises(PuzzleFormatError):
+            vectorized.VectorizedBatch([[0] * 80])
+
+    def test_candidates(self):
+        batch = vectorized.VectorizedBatch([self.valid_puzzle])
+        cand = batch.candidates()
+        for i in range(81):
+            expected = 0 if self.valid_puzzle[i] else BitboardMap(self.valid_puzzle).candidates(i)
+            self.assertEqual(int(cand[0, i]), expected)
+
+    def test_solve_batch(self):
+        puzzles = [self.valid_puzzle, self.invalid_puzzle, self.unsolvable_puzzle, [0] * 81]
+        results = list(vectorized.solve_batch(puzzles, batch_size=3))
+        self.assertListEqual([r.index for r in results], [0, 1, 2, 3])
+        self.assertListEqual(results[0].solutions, [self.solution])
+        self.assertIsInstance(results[1].error, InvalidSudokuError)
+        self.assertListEqual(results[2].solutions, [])
+        self.assertEqual(len(results[3].solutions), 2)
+
+    def test_matches_per_puzzle_solver(self):
+        puzzles = list(puzzle_io.read_puzzles(PUZZLE_FILE_17))[:200]
+        results = vectorized.solve_batch(puzzles, engine=BitboardMap, propagate=True)
+        for puzzle, result in zip(puzzles, results):
+            self.assertListEqual(result.solutions, sudoku_solver.dlx_solver(puzzle))
+
+    def test_validate_batch(self):
+        grids = [self.valid_puzzle, self.invalid_puzzle, [10] + [0] * 80, self.solution, [-1] * 81]
+        result = vectorized.validate_batch(grids)
+        self.assertListEqual(result.valid.tolist(), [True, False, False, True, False])
+        self.assertListEqual(result.reason.tolist(), [vectorized.VALID, vectorized.DUPLICATE,
+                                                      vectorized.BAD_VALUE, vectorized.VALID, vectorized.BAD_VALUE])
+        self.assertListEqual(result.where.tolist(), [-1, 0, 0, -1, 0])
+        self.assertDictEqual(result.failures(), {1: "duplicate digit in row 0", 2: "value out of range at cell 0",
+                                                 4: "value out of range at cell 0"})
+        # a repeat in a column and in a box only
+        column = [0] * 81
+        column[4] = column[76] = 5
+        box = [0] * 81
+        box[30] = box[50] = 7
+        self.assertDictEqual(vectorized.validate_batch([column, box]).failures(),
+                             {0: "duplicate digit in column 4", 1: "duplicate digit in box 4"})
+        # solutions must be complete and keep the givens
+        changed = list(self.solution)
+        changed[3], changed[4] = changed[4], changed[3]
+        solutions = np.array([self.solution, self.valid_puzzle, changed], dtype=np.uint8)
+        result = vectorized.validate_batch(solutions, solved=True, givens=[self.valid_puzzle] * 3)
+        self.assertListEqual(result.reason.tolist(), [vectorized.VALID, vectorized.EMPTY_CELL, vectorized.DUPLICATE])
+        self.assertEqual(result.where[1], 0)
+        result = vectorized.validate_batch([self.solution], givens=[[9] + [0] * 80])
+        self.assertDictEqual(result.failures(), {0: "given changed at cell 0"})
+        # agrees with the per-puzzle check
+        puzzles = list(puzzle_io.read_puzzles(PUZZLE_FILE_17))[:100]
+        broken = [p[:80] + [next(d for d in range(1, 10) if d in p[72:80] or d in p[8:80:9])] for p in puzzles]
+        result = vectorized.validate_batch(puzzles + broken)
+        self.assertListEqual(result.valid.tolist(), [utils.is_valid_sudoku(p) for p in puzzles + broken])
+        with self.assertRaises(PuzzleFormatError):
+            vectorized.validate_batch([[0] * 80])
+        with self.assertRaises(PuzzleFormatError):
+            vectorized.validate_batch([self.solution], givens=[self.valid_puzzle[:80]])